@@ -31,39 +31,69 @@ bl_info = {
 
 # Register
 
-import bpy, logging
+import logging
+from time import perf_counter
 
-from . import lang
-from .bl import operators, panels, menus, ui, handlers, preferences
+_t0 = perf_counter()
 
+try:
+    import bpy
+except ImportError:  # outside of Blender, eg. running the cli or the core
+    bpy = None
+
+if bpy:
+    from . import lang
+    from .bl import operators, panels, menus, ui, handlers, preferences
+
+    logging.basicConfig(level=logging.INFO)
 
-logging.basicConfig(level=logging.INFO)
 log = logging.getLogger(__name__)
 
+## Module import time in s, for the startup benchmark
+import_time = perf_counter() - _t0
+
+## Registration times in s by stage, for the startup benchmark
+startup_times = dict()
+
+
+def _timed_register(name, module):
+    """!
+    Register module and record its registration time.
+    @param name: the stage name.
+    @param module: the module to be registered.
+    """
+    t0 = perf_counter()
+    module.register()
+    startup_times[name] = perf_counter() - t0
+
 
 def register():
     log.debug("Registering")
+    startup_times.clear()
     # Preferences
-    preferences.register()
+    _timed_register("preferences", preferences)
     pref = bpy.context.preferences.addons[__package__].preferences
     # Set log level from preferences
     log.setLevel(pref.bf_loglevel)
     # Register Blender properties, ops, panels, ...
-    lang.register()
-    operators.register()
-    panels.register()
-    menus.register()
-    handlers.register()
+    _timed_register("lang", lang)
+    _timed_register("operators", operators)
+    if not bpy.app.background:  # no UI in background mode
+        _timed_register("panels", panels)
+    _timed_register("menus", menus)
+    _timed_register("handlers", handlers)
     # Simplify UI, if preferred
-    if pref.bf_pref_simplify_ui:
-        ui.register()
+    if pref.bf_pref_simplify_ui and not bpy.app.background:
+        _timed_register("ui", ui)
+    log.debug(f"Registered in {sum(startup_times.values()):.3f} s")
 
 
 def unregister():
     log.debug("Unregistering")
     # ui.unregister() # restart needed
     menus.unregister()
-    panels.unregister()
+    if not bpy.app.background:  # as in register()
+        panels.unregister()
     operators.unregister()
     lang.unregister()
     handlers.unregister()
@@ -0,0 +1,49 @@
+"""!
+BlenderFDS, cache of values derived for panel drawing.
+"""
+
+import logging
+
+log = logging.getLogger(__name__)
+
+# Panels are redrawn far more often than the data they show changes.
+# Derived values (eg. bounding boxes, cell infos, check results) are
+# cached by key, usually (element pointer, name, inputs), and the whole
+# cache is invalidated at each depsgraph update, undo, or file load,
+# counted by a change counter.
+
+_counter = 0  # change counter
+_cache = dict()  # key: value
+
+
+def tag_update():
+    """!
+    Increment the change counter and invalidate the cache.
+    """
+    global _counter
+    _counter += 1
+    _cache.clear()
+
+
+def get_counter():
+    """!
+    Get the change counter.
+    @return the change counter.
+    """
+    return _counter
+
+
+def get(key, func, *args, **kwargs):
+    """!
+    Get the cached value of func, computed at most once per change.
+    @param key: the hashable cache key, eg. (ob.as_pointer(), "bbox").
+    @param func: the function computing the value.
+    @param args: the positional arguments of func.
+    @param kwargs: the keyword arguments of func.
+    @return the cached or computed value.
+    """
+    try:
+        return _cache[key]
+    except KeyError:
+        value = _cache[key] = func(*args, **kwargs)
+        return value
@@ -3,11 +3,20 @@ BlenderFDS, handlers
 """
 
 import bpy, logging
-from bpy.app.handlers import persistent, load_post, save_pre, depsgraph_update_post
+from bpy.app.handlers import (
+    persistent,
+    load_post,
+    save_pre,
+    depsgraph_update_post,
+    undo_post,
+    redo_post,
+)
 from bpy.types import Object
 
 from .. import geometry
 from .. import config
+from ..types import BFNamelist
+from . import draw_cache
 
 log = logging.getLogger(__name__)
 
@@ -20,6 +29,9 @@ def _load_post(self):
     Run automatic setup after loading a Blender file.
     """
     # Beware: self is None
+    # Pooled namelists refer to the elements of the previous file
+    BFNamelist.clear_pool()
+    draw_cache.tag_update()
     # Check file format version
     bf_file_version = tuple(bpy.data.scenes[0].bf_file_version)
     log.debug(f"Load post, file version: <{bf_file_version}>")
@@ -145,19 +157,28 @@ def _save_pre(self):
 def _depsgraph_update_post(scene):
     """!
     Detect object change and erase cached geometry.
+    Tmp objects are ignored, and during a geometric transaction
+    invalidation is deferred to the end of the transaction.
+    Panel draw cache is invalidated too.
     """
+    draw_cache.tag_update()
     for update in bpy.context.view_layer.depsgraph.updates:
         ob = update.id.original
         if (
             isinstance(ob, Object)
+            and not ob.bf_is_tmp
             and ob.type in {"MESH", "CURVE", "SURFACE", "FONT", "META"}
             and (update.is_updated_geometry or update.is_updated_transform)
         ):
-            log.debug(f"Remove <{ob.name}> caches")
-            ob["ob_to_geom_cache"] = None  # TODO remove
-            ob["ob_to_xbs_cache"] = None
-            ob["ob_to_xyzs_cache"] = None  # TODO remove
-            ob["ob_to_pbs_cache"] = None  # TODO remove
+            geometry.utils.invalidate_geometric_cache(ob)
+
+
+@persistent
+def _undo_post(self):
+    """!
+    Invalidate the panel draw cache after undo and redo.
+    """
+    draw_cache.tag_update()
 
 
 # Register
@@ -171,6 +192,8 @@ def register():
     load_post.append(_load_post)
     save_pre.append(_save_pre)
     depsgraph_update_post.append(_depsgraph_update_post)
+    undo_post.append(_undo_post)
+    redo_post.append(_undo_post)
 
 
 def unregister():
@@ -181,3 +204,5 @@ def unregister():
     load_post.remove(_load_post)
     save_pre.remove(_save_pre)
     depsgraph_update_post.remove(_depsgraph_update_post)
+    undo_post.remove(_undo_post)
+    redo_post.remove(_undo_post)
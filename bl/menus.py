@@ -2,15 +2,19 @@
 BlenderFDS, import/export menu panel
 """
 
-import os
+import os, tempfile
+from time import time
+from concurrent.futures import ThreadPoolExecutor
 
 import bpy, logging
 from bpy.types import Operator
 from bpy.props import StringProperty, BoolProperty, FloatProperty
 from bpy_extras.io_utils import ImportHelper, ExportHelper
 
-from .. import utils
+from .. import utils, geometry
+from ..core import terrain
 from ..types import BFException, FDSCase
+from . import progress, profiler
 
 log = logging.getLogger(__name__)
 
@@ -30,6 +34,31 @@ def subscribe(cls):
     return cls
 
 
+# Window cursor
+
+
+class _NoWindow:
+    """!
+    Stand-in for the window when Blender runs in background mode.
+    """
+
+    def cursor_modal_set(self, cursor):
+        pass
+
+    def cursor_modal_restore(self):
+        pass
+
+
+def _get_window(context):
+    """!
+    Get the main window, or a stand-in in background mode.
+    @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+    @return the window.
+    """
+    windows = context.window_manager.windows
+    return windows[0] if windows else _NoWindow()
+
+
 # Import menus
 
 
@@ -46,6 +75,18 @@ class ImportFDS(Operator, ImportHelper):
     filename_ext = ".fds"
     filter_glob: StringProperty(default="*.fds", options={"HIDDEN"})
     new_scene: BoolProperty(name="Into New Scene", default=True)
+    merge: BoolProperty(
+        name="Merge OBST, HOLE, VENT",
+        description="Import OBST, HOLE, and VENT namelists with a single XB in bulk,\n"
+        "into one merged Object for each namelist and SURF_ID",
+        default=False,
+    )
+    proxy: BoolProperty(
+        name="Proxy OBST, HOLE, GEOM",
+        description="Import OBST, HOLE, and GEOM namelists as lightweight proxies,\n"
+        "their text is exported verbatim",
+        default=False,
+    )
 
     @classmethod
     def poll(cls, context):
@@ -68,12 +109,17 @@ class ImportFDS(Operator, ImportHelper):
         - "INTERFACE" handled but not executed (popup menus).
         """
         # Init
-        w = context.window_manager.windows[0]
+        w = _get_window(context)
         w.cursor_modal_set("WAIT")
-        # Read and parse
+        # Read and parse, long files by worker processes
+        prefs = context.preferences.addons[__package__.split(".")[0]].preferences
         fds_case = FDSCase()
         try:
-            fds_case.from_fds(utils.read_from_file(self.filepath))
+            fds_case.from_fds(
+                utils.read_from_file(self.filepath),
+                max_workers=prefs.parse_workers or None,
+                keep_f90=self.proxy,  # proxies keep the original namelists
+            )
         except Exception as err:
             w.cursor_modal_restore()
             self.report({"ERROR"}, f"Read or parse error: {str(err)}")
@@ -85,7 +131,9 @@ class ImportFDS(Operator, ImportHelper):
             sc = context.scene
         # Import
         try:
-            sc.from_fds(context, fds_case=fds_case)
+            sc.from_fds(
+                context, fds_case=fds_case, merge=self.merge, proxy=self.proxy
+            )
         except BFException as err:
             w.cursor_modal_restore()
             self.report({"ERROR"}, f"Import error: {str(err)}")
@@ -116,6 +164,124 @@ def menu_func_import_snippet_FDS(self, context):
     ).new_scene = False
 
 
+@subscribe
+class ImportTerrain(Operator, ImportHelper):
+    """!
+    Import a terrain raster to a GEOM Object with IS_TERRAIN.
+    """
+
+    bl_idname = "import_scene.fds_terrain"
+    bl_label = "Import Terrain"
+    bl_description = "Import an ESRI ASCII grid or raw binary raster as terrain GEOM"
+    bl_options = {"UNDO"}
+
+    filename_ext = ".asc"
+    filter_glob: StringProperty(
+        default="*.asc;*.bil;*.flt;*.raw", options={"HIDDEN"}
+    )
+    landuse_filepath: StringProperty(
+        name="Landuse Raster",
+        description="Optional landuse raster of the same shape,\n"
+        "each landuse code becomes a SURF_ID, no data cells are INERT",
+        subtype="FILE_PATH",
+        default="",
+    )
+    use_scene_origin: BoolProperty(
+        name="Relative to Scene Origin",
+        description="Subtract the Scene UTM easting and northing from coordinates",
+        default=True,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        """!
+        Test if the operator can be called or not
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        @return True if operator can be called, False otherwise.
+        """
+        return context.scene is not None
+
+    def execute(self, context):
+        """!
+        Execute the operator.
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        @return return
+        - "RUNNING_MODAL" keep the operator running with blender.
+        - "CANCELLED" when no action has been taken, operator exits.
+        - "FINISHED" when the operator is complete, operator exits.
+        - "PASS_THROUGH" do nothing and pass the event on.
+        - "INTERFACE" handled but not executed (popup menus).
+        """
+        # Init
+        w = _get_window(context)
+        w.cursor_modal_set("WAIT")
+        sc = context.scene
+        name = os.path.splitext(os.path.basename(self.filepath))[0]
+        # The grid is built into a temporary memory-mapped file,
+        # so that it is never fully in memory
+        with tempfile.TemporaryDirectory(prefix="blenderfds_") as tmp_dir:
+            # Read rasters
+            try:
+                values, geo = terrain.read_raster(self.filepath)
+                landuse, landuse_nodata = None, None
+                if self.landuse_filepath:
+                    landuse, landuse_geo = terrain.read_raster(
+                        bpy.path.abspath(self.landuse_filepath)
+                    )
+                    landuse_nodata = landuse_geo["nodata"]
+                grid, codes = terrain.raster_to_grid(
+                    values,
+                    geo,
+                    landuse,
+                    landuse_nodata,
+                    filepath=os.path.join(tmp_dir, f"{name}.npy"),
+                )
+                del values, landuse
+            except Exception as err:
+                w.cursor_modal_restore()
+                self.report({"ERROR"}, f"Read error: {str(err)}")
+                return {"CANCELLED"}
+            # Create the Mesh, one material for each landuse code
+            me = bpy.data.meshes.new(name)
+            for code in codes:
+                ma_name = code is None and "INERT" or f"Landuse_{code:g}"
+                me.materials.append(geometry.utils.get_material(context, ma_name))
+            origin = (0.0, 0.0, 0.0)
+            if self.use_scene_origin:
+                origin = (sc.bf_utm_easting, sc.bf_utm_northing, 0.0)
+            try:
+                geometry.from_fds.terrain_to_mesh(
+                    grid, context, me, sc.unit_settings.scale_length, origin
+                )
+            except Exception as err:
+                bpy.data.meshes.remove(me)
+                w.cursor_modal_restore()
+                self.report({"ERROR"}, f"Import error: {str(err)}")
+                return {"CANCELLED"}
+            finally:
+                del grid  # close the memory map, before removing the file
+        # Create the terrain GEOM Object
+        ob = bpy.data.objects.new(name, object_data=me)
+        sc.collection.objects.link(ob)
+        ob.bf_namelist_cls = "ON_GEOM"
+        ob.bf_geom_is_terrain = True
+        ob.set_default_appearance(context)
+        # Close
+        w.cursor_modal_restore()
+        self.report({"INFO"}, f"Terrain imported: {len(me.polygons)} faces")
+        return {"FINISHED"}
+
+
+def menu_func_import_terrain(self, context):
+    """!
+    Function to import a terrain raster into the current scene.
+    @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+    """
+    self.layout.operator(
+        ImportTerrain.bl_idname, text="Terrain (.asc, .bil) into Current Scene"
+    )
+
+
 # Export menu
 
 
@@ -147,41 +313,105 @@ class ExportFDS(Operator, ExportHelper):
     def poll(cls, context):
         return context.scene is not None  # at least one available scene
 
-    def _write_fds_file(self, context, sc, filepath):
-        w = context.window_manager.windows[0]
-        # Write .fds file
+    def _start_profile(self, context, sc):
+        """!
+        Start profiling the export of the scene, if requested.
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        @param sc: the Blender scene to export.
+        """
+        if sc.bf_config_profile:
+            geometry.utils.rm_geometric_caches()  # profile real computations
+            profiler.start(sc.name)
+
+    def _write_fds_file(self, context, sc, filepath, lines=None):
+        """!
+        Write the .fds file, the .ge1 file and the profiling report, if requested.
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        @param sc: the Blender scene to export.
+        @param filepath: the .fds file path.
+        @param lines: the already assembled FDS lines, if any.
+        @return "FINISHED" or "CANCELLED".
+        """
+        if lines is None:
+            self._start_profile(context, sc)
+        try:
+            res = self._write_files(context, sc, filepath, lines)
+        finally:
+            report = profiler.stop()
+        if report and res == {"FINISHED"}:
+            filepath = filepath[:-4] + "_profile.json"
+            try:
+                profiler.write_report(filepath, report)
+            except IOError:
+                self.report({"ERROR"}, f"Filepath not writable:\n<{filepath}>")
+                return {"CANCELLED"}
+            self.report(
+                {"INFO"}, f"FDS exporting ok, profiled in {report['time']:.3f} s"
+            )
+        return res
+
+    def _write_files(self, context, sc, filepath, lines=None):
+        """!
+        Write the .fds file and the .ge1 file, if requested.
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        @param sc: the Blender scene to export.
+        @param filepath: the .fds file path.
+        @param lines: the already assembled FDS lines, if any.
+        @return "FINISHED" or "CANCELLED".
+        """
+        w = _get_window(context)
+        # Assemble .fds file
         log.debug(f"Exporting Blender Scene <{sc.name}>")
         w.cursor_modal_set("WAIT")
         try:
-            utils.write_to_file(filepath, sc.to_fds(context=context, full=True))
+            if lines is None:
+                text = sc.to_fds(context=context, full=True)
+            else:
+                text = "\n".join(line for line in lines if line)  # remove empties
         except BFException as err:
+            w.cursor_modal_restore()
             self.report({"ERROR"}, f"Error assembling FDS file:\n<{str(err)}>")
             return {"CANCELLED"}
-        except IOError:
-            self.report({"ERROR"}, f"Filepath not writable:\n<{filepath}>")
-            return {"CANCELLED"}
         except Exception as err:
+            w.cursor_modal_restore()
             self.report({"ERROR"}, f"Unexpected error:\n<{str(err)}>")
             return {"CANCELLED"}
-        finally:
-            w.cursor_modal_restore()
+        # Assemble .ge1 geometry, reusing the export caches,
+        # then write the .ge1 file in a thread, while writing the .fds file
+        ge1_future = None
         if sc.bf_dump_render_file:
-            # Write .ge1 file
-            w.cursor_modal_set("WAIT")
             try:
-                filepath = filepath[:-4] + ".ge1"
-                utils.write_to_file(filepath, sc.to_ge1(context=context))
-            except BFException as err:
-                self.report({"ERROR"}, f"Error assembling GE1 file:\n<{str(err)}>")
-                return {"CANCELLED"}
-            except IOError:
-                self.report({"ERROR"}, f"Filepath not writable:\n<{filepath}>")
-                return {"CANCELLED"}
+                with profiler.stage("ge1"):
+                    ge1_data = geometry.to_ge1.get_ge1_data(context, sc)
             except Exception as err:
-                self.report({"ERROR"}, f"Unexpected error:\n<{str(err)}>")
-                return {"CANCELLED"}
-            finally:
                 w.cursor_modal_restore()
+                self.report({"ERROR"}, f"Error assembling GE1 file:\n<{str(err)}>")
+                return {"CANCELLED"}
+            ge1_filepath = filepath[:-4] + ".ge1"
+            executor = ThreadPoolExecutor(max_workers=1)
+            ge1_future = executor.submit(
+                geometry.to_ge1.write_ge1_file, ge1_filepath, *ge1_data
+            )
+            executor.shutdown(wait=False)
+        # Write .fds file
+        with profiler.stage("write"):
+            is_written = utils.write_to_file(filepath, text)
+        # Wait for the .ge1 file
+        try:
+            if ge1_future:
+                with profiler.stage("ge1"):
+                    ge1_future.result()
+        except IOError:
+            self.report({"ERROR"}, f"Filepath not writable:\n<{ge1_filepath}>")
+            return {"CANCELLED"}
+        except Exception as err:
+            self.report({"ERROR"}, f"Unexpected error:\n<{str(err)}>")
+            return {"CANCELLED"}
+        finally:
+            w.cursor_modal_restore()
+        if not is_written:
+            self.report({"ERROR"}, f"Filepath not writable:\n<{filepath}>")
+            return {"CANCELLED"}
         self.report({"INFO"}, f"FDS exporting ok")
         return {"FINISHED"}
 
@@ -194,22 +424,99 @@ class ExportFDS(Operator, ExportHelper):
         self.filepath = "/".join((directory, basename))
         return super().invoke(context, event)  # open dialog
 
+    def _get_jobs(self, context):
+        """!
+        Get the scenes to be exported and their file paths.
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        @return list of (scene, filepath).
+        """
+        if not self.all_scenes:
+            # Export current scene to chosen dir
+            return [(context.scene, self.filepath)]
+        # Export all scenes to configure dir or chosen dir
+        jobs = list()
+        for sc in bpy.data.scenes:
+            basename = f"{bpy.path.clean_name(sc.name)}.fds"
+            directory = bpy.path.abspath(sc.bf_config_directory or self.directory)
+            jobs.append((sc, "/".join((directory, basename))))
+        return jobs
+
     def execute(self, context):
-        if self.all_scenes:
-            # Export all scenes to configure dir or chosen dir
-            for sc in bpy.data.scenes:
-                basename = f"{bpy.path.clean_name(sc.name)}.fds"
-                directory = bpy.path.abspath(sc.bf_config_directory or self.directory)
-                filepath = "/".join((directory, basename))
+        jobs = self._get_jobs(context)
+        if bpy.app.background or not context.window_manager.windows:
+            # No UI, export synchronously, progress is printed with ETA
+            for sc, filepath in jobs:
                 res = self._write_fds_file(context=context, sc=sc, filepath=filepath)
                 if res != {"FINISHED"}:  # break if any goes wrong
                     break
             return res
-        else:
-            # Export current scene to chosen dir
-            return self._write_fds_file(
-                context=context, sc=context.scene, filepath=self.filepath
+        # Export one Object at a time in modal mode, ESC to cancel
+        self._jobs = jobs
+        self._next_job(context)
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.01, window=context.window)
+        wm.modal_handler_add(self)
+        return {"RUNNING_MODAL"}
+
+    def _next_job(self, context):
+        """!
+        Start assembling the next scene in the queue.
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        """
+        self._sc, self._filepath = self._jobs.pop(0)
+        self._lines = list()
+        self._start_profile(context, self._sc)
+        self._lines_iter = self._sc.iter_to_fds(context=context, full=True)
+
+    def _close(self, context):
+        """!
+        Remove the modal timer and close progress.
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        """
+        context.window_manager.event_timer_remove(self._timer)
+        self._lines_iter.close()  # close open transactions and tasks
+        progress.reset()
+        profiler.stop()
+        _get_window(context).cursor_modal_restore()
+
+    def modal(self, context, event):
+        """!
+        Assemble the FDS file during timer events, cancel on ESC.
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        @param event: the Blender event.
+        @return "RUNNING_MODAL", "CANCELLED" or "FINISHED".
+        """
+        if event.type == "ESC":
+            self._close(context)
+            geometry.utils.rm_tmp_objects()
+            self.report({"WARNING"}, "FDS exporting cancelled")
+            return {"CANCELLED"}
+        if event.type != "TIMER":
+            return {"RUNNING_MODAL"}  # block the UI while exporting
+        _get_window(context).cursor_modal_set("WAIT")
+        t0 = time()
+        try:
+            while time() - t0 < 0.1:  # s, keep the UI responsive
+                self._lines.append(next(self._lines_iter))
+        except StopIteration:
+            res = self._write_fds_file(
+                context=context, sc=self._sc, filepath=self._filepath, lines=self._lines
             )
+            if res != {"FINISHED"} or not self._jobs:
+                self._close(context)
+                return res
+            self._next_job(context)
+        except BFException as err:
+            self._close(context)
+            geometry.utils.rm_tmp_objects()
+            self.report({"ERROR"}, f"Error assembling FDS file:\n<{str(err)}>")
+            return {"CANCELLED"}
+        except Exception as err:
+            self._close(context)
+            geometry.utils.rm_tmp_objects()
+            self.report({"ERROR"}, f"Unexpected error:\n<{str(err)}>")
+            return {"CANCELLED"}
+        return {"RUNNING_MODAL"}
 
 
 def menu_func_export_to_fds(self, context):
@@ -232,6 +539,7 @@ def register():
         register_class(cls)
     bpy.types.TOPBAR_MT_file_import.append(menu_func_import_FDS)
     bpy.types.TOPBAR_MT_file_import.append(menu_func_import_snippet_FDS)
+    bpy.types.TOPBAR_MT_file_import.append(menu_func_import_terrain)
     bpy.types.TOPBAR_MT_file_export.append(menu_func_export_to_fds)
 
 
@@ -245,4 +553,5 @@ def unregister():
         unregister_class(cls)
     bpy.types.TOPBAR_MT_file_import.remove(menu_func_import_FDS)
     bpy.types.TOPBAR_MT_file_import.remove(menu_func_import_snippet_FDS)
+    bpy.types.TOPBAR_MT_file_import.remove(menu_func_import_terrain)
     bpy.types.TOPBAR_MT_file_export.remove(menu_func_export_to_fds)
@@ -18,9 +18,10 @@ BlenderFDS, <a href="https://docs.blender.org/api/current/bpy.types.Operator.htm
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-import os, sys, subprocess
+import os, sys, json, subprocess
 
 import bpy, logging
+from mathutils import Matrix
 from bpy.types import (
     bpy_struct,
     PropertyGroup,
@@ -752,33 +753,85 @@ class MATERIAL_OT_bf_assign_BC_to_sel_obs(Operator):
 # Choose IDs for MATL_ID, PROP_ID in free text and CATF files
 
 
+# Index of namelist IDs by source, re-parsed only when the source changes:
+# {source: (stamp, {label: [ID, ...]})}
+# The stamp of a Free Text is the hash of its content,
+# the stamp of a CATF file is its modification time and size.
+
+_namelist_ids_by_source = dict()
+
+# Enum items must be referenced from Python, otherwise Blender
+# may show garbage: {label: (sources and stamps, items)}
+
+_namelist_items_by_label = dict()
+
+
+def _get_namelist_ids(source, stamp, f90_namelists):
+    """!
+    Get the namelist IDs by label of a source, from index or by parsing.
+    @param source: the source, eg. ("text", "Text") or ("file", "/path/to/catf.fds").
+    @param stamp: the source stamp, the index is rebuilt when it changes.
+    @param f90_namelists: function returning the source content, if needed.
+    @return the dict {label: [ID, ...]}.
+    """
+    try:
+        old_stamp, ids = _namelist_ids_by_source[source]
+    except KeyError:
+        pass
+    else:
+        if old_stamp == stamp:
+            return ids
+    log.debug(f"Indexing namelist IDs from <{source[1]}>")
+    fds_case = FDSCase()
+    fds_case.from_fds(f90_namelists(), reset=False)
+    ids = dict()
+    for n in fds_case.fds_namelists:
+        fds_param = n.get_fds_param_by_label("ID")
+        if fds_param:
+            ids.setdefault(n.fds_label, list()).append(fds_param.values[0])
+    _namelist_ids_by_source[source] = stamp, ids
+    return ids
+
+
 def _get_namelist_items(self, context, label) -> "items":
     """!
     Get namelist IDs available in Free Text and CATF files.
     """
-    fds_case = FDSCase()
     sc = context.scene
+    sources = list()  # (source, stamp, f90_namelists)
     # Get namelists from Free Text
     if sc.bf_config_text:
-        f90_namelists = sc.bf_config_text.as_string()
-        fds_case.from_fds(f90_namelists, reset=False)
+        text = sc.bf_config_text.as_string()
+        sources.append((("text", sc.bf_config_text.name), hash(text), lambda: text))
     # Get namelists from available CATF files
     if sc.bf_catf_export:
         for filepath in tuple(item.name for item in sc.bf_catf_files if item.bf_export):
             try:
-                f90_namelists = utils.read_from_file(filepath)
-            except IOError:
-                pass
-            else:
-                fds_case.from_fds(f90_namelists, reset=False)
+                st = os.stat(filepath)
+            except OSError:
+                continue
+            sources.append(
+                (
+                    ("file", filepath),
+                    (st.st_mtime, st.st_size),
+                    lambda filepath=filepath: utils.read_from_file(filepath),
+                )
+            )
+    # Check the cached items
+    stamps = tuple((source, stamp) for source, stamp, _ in sources)
+    cached = _namelist_items_by_label.get(label)
+    if cached and cached[0] == stamps:
+        return cached[1]
     # Prepare list of IDs
     items = list()
-    for n in fds_case.get_fds_namelists_by_label(label):
-        fds_param = n.get_fds_param_by_label("ID")
-        if fds_param:
-            hid = fds_param.values[0]
-            items.append((hid, hid, ""))
+    for source, stamp, f90_namelists in sources:
+        try:
+            ids = _get_namelist_ids(source, stamp, f90_namelists)
+        except IOError:
+            continue
+        items.extend((hid, hid, "") for hid in ids.get(label, ()))
     items.sort(key=lambda k: k[0])
+    _namelist_items_by_label[label] = stamps, items
     return items
 
 
@@ -886,6 +939,13 @@ class MATERIAL_OT_bf_choose_devc_prop_id(Operator):  # FIXME isn't it OBJECT?
 # Choose DEVC QUANTITY
 
 
+def _get_devc_quantity_items(self, context):
+    """!
+    Get the DEVC quantity items, built on first request.
+    """
+    return config.get_quantity_items(qtype="D")  # cached, references kept alive
+
+
 @subscribe
 class OBJECT_OT_bf_choose_devc_quantity(Operator):
     bl_label = "Choose QUANTITY for DEVC"
@@ -895,7 +955,7 @@ class OBJECT_OT_bf_choose_devc_quantity(Operator):
     bf_quantity: EnumProperty(
         name="QUANTITY",
         description="QUANTITY parameter for DEVC namelist",
-        items=config.get_quantity_items(qtype="D"),
+        items=_get_devc_quantity_items,
     )
 
     def execute(self, context):
@@ -993,45 +1053,614 @@ class OBJECT_OT_bf_set_mesh_cell_size(Operator):
         return wm.invoke_props_dialog(self)
 
 
-# TODO  align meshes
+def _add_mesh_ob(context, ob, name, ijk, xbs):
+    """!
+    Add a new MESH Object, with the same properties and collections of ob.
+    @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+    @param ob: the original MESH Object.
+    @param name: the new Object name.
+    @param ijk: ijk of the new mesh.
+    @param xbs: xbs of the new mesh, in world coordinates.
+    @return the new Object.
+    """
+    scale_length = context.scene.unit_settings.scale_length
+    me = bpy.data.meshes.new(name)
+    geometry.from_fds.xbs_bbox_to_mesh((xbs,), context, me, scale_length)
+    ob_new = bpy.data.objects.new(name, me)
+    for co in ob.users_collection:
+        co.objects.link(ob_new)
+    _bf_props_copy(context, ob, (ob_new,))
+    ob_new.active_material = ob.active_material
+    ob_new.bf_xb, ob_new.bf_xb_export = "BBOX", True
+    ob_new.bf_mesh_ijk = ijk
+    ob_new.set_default_appearance(context)
+    ob_new.hide_render = ob.hide_render
+    return ob_new
+
+
+def _get_exported_obs(sc):
+    """!
+    Get the exported Objects of the Scene, in export order.
+    As in Collection.iter_to_fds, the Objects of each Collection are exported
+    in alphabetic order by name, then the children Collections.
+    @param sc: the Blender Scene.
+    @return the list of exported Objects.
+    """
+    obs, names = list(), set()
+
+    def _add_obs(co):
+        for ob in sorted(co.objects, key=lambda k: k.name):
+            if (
+                ob.name not in names
+                and ob.type == "MESH"
+                and not ob.hide_render
+                and not ob.bf_is_tmp
+            ):
+                names.add(ob.name)
+                obs.append(ob)
+        for child in co.children:
+            _add_obs(child)
+
+    _add_obs(sc.collection)
+    return obs
+
+
+@subscribe
+class OBJECT_OT_bf_split_mesh(Operator):
+    """!
+    Split current MESH into sub-meshes, each assigned to its own MPI process.
+    """
+
+    bl_label = "Split MESH"
+    bl_idname = "object.bf_split_mesh"
+    bl_description = "Split current MESH into sub-meshes, each assigned to its own MPI process"
+    bl_options = {"REGISTER", "UNDO"}
+
+    bf_split_n: IntProperty(
+        name="Sub-meshes",
+        description="Number of sub-meshes",
+        default=2,
+        min=1,
+    )
+    bf_split_max_cells: IntProperty(
+        name="Max Cells",
+        description="Max number of cells per sub-mesh, if set the number of sub-meshes is computed",
+        default=0,
+        min=0,
+    )
+    bf_poisson_restriction: BoolProperty(
+        name="Poisson Restriction",
+        description="Respect FDS Poisson solver restriction on IJK values of sub-meshes.\nThe MESH may be slightly extended.",
+        default=True,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        """!
+        Test if the operator can be called or not.
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        @return True if operator can be called, False otherwise.
+        """
+        ob = context.active_object
+        return ob and ob.bf_namelist_cls == "ON_MESH"
+
+    def draw(self, context):
+        """!
+        Draw function for the operator.
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        """
+        layout = self.layout
+        col = layout.column()
+        col.active = not self.bf_split_max_cells
+        col.prop(self, "bf_split_n")
+        layout.prop(self, "bf_split_max_cells")
+        layout.prop(self, "bf_poisson_restriction")
+
+    def execute(self, context):
+        if context.object:
+            bpy.ops.object.mode_set(mode="OBJECT")
+        ob = context.active_object
+        scale_length = context.scene.unit_settings.scale_length
+        xbs = geometry.utils.get_bbox_xbs(
+            context=context, ob=ob, scale_length=scale_length, world=True
+        )
+        try:
+            meshes, msgs = fds.mesh_tools.split_mesh(
+                ijk=ob.bf_mesh_ijk,
+                xbs=xbs,
+                n=not self.bf_split_max_cells and self.bf_split_n or None,
+                max_cells=self.bf_split_max_cells or None,
+                poisson=self.bf_poisson_restriction,
+            )
+        except ValueError as err:
+            self.report({"ERROR"}, str(err))
+            return {"CANCELLED"}
+        # Create the sub-mesh Objects, in world coordinates, after the MPI processes
+        # of the other MESHes. Names are zero padded to keep the export order.
+        first_process = 1 + max(
+            (
+                o.bf_mesh_mpi_process
+                for o in _get_exported_obs(context.scene)
+                if o != ob
+                and o.bf_namelist_cls == "ON_MESH"
+                and o.bf_mesh_mpi_process_export
+            ),
+            default=-1,
+        )
+        width = len(str(len(meshes) - 1))
+        for i, (ijk, sxbs) in enumerate(meshes):
+            ob_new = _add_mesh_ob(context, ob, f"{ob.name}_{i:0{width}d}", ijk, sxbs)
+            ob_new.bf_mesh_mpi_process = first_process + i
+            ob_new.bf_mesh_mpi_process_export = True
+        # Remove the original MESH
+        bpy.data.objects.remove(ob, do_unlink=True)
+        self.report({"INFO"}, ", ".join(msgs))
+        return {"FINISHED"}
+
+    def invoke(self, context, event):
+        # Call dialog
+        wm = context.window_manager
+        return wm.invoke_props_dialog(self)
+
+
+@subscribe
+class OBJECT_OT_bf_refine_mesh(Operator):
+    """!
+    Refine current MESH around selected Objects, or burners, with nested fine MESHes.
+    """
+
+    bl_label = "Refine MESH"
+    bl_idname = "object.bf_refine_mesh"
+    bl_description = "Refine current MESH around selected Objects, or around burners if none is selected, with nested fine MESHes"
+    bl_options = {"REGISTER", "UNDO"}
+
+    bf_refine_ratio: EnumProperty(
+        name="Refinement",
+        description="Max refinement ratio, reduced if over the cell budget",
+        items=(("2", "2x", "Refine twice"), ("4", "4x", "Refine four times")),
+        default="2",
+    )
+    bf_refine_margin: IntProperty(
+        name="Margin",
+        description="Margin around refined regions, in coarse cells",
+        default=2,
+        min=0,
+    )
+    bf_refine_max_cells: IntProperty(
+        name="Max Cells",
+        description="Max total number of cells, if set",
+        default=0,
+        min=0,
+    )
+    bf_poisson_restriction: BoolProperty(
+        name="Poisson Restriction",
+        description="Respect FDS Poisson solver restriction on IJK values of new MESHes.\nRefined regions may be slightly extended.",
+        default=True,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        """!
+        Test if the operator can be called or not.
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        @return True if operator can be called, False otherwise.
+        """
+        ob = context.active_object
+        return ob and ob.bf_namelist_cls == "ON_MESH"
+
+    def draw(self, context):
+        """!
+        Draw function for the operator.
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        """
+        layout = self.layout
+        layout.prop(self, "bf_refine_ratio", expand=True)
+        layout.prop(self, "bf_refine_margin")
+        layout.prop(self, "bf_refine_max_cells")
+        layout.prop(self, "bf_poisson_restriction")
+
+    def _get_region_obs(self, context, ob):
+        """!
+        Get the Objects to refine around: the selected ones, or else the burners.
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        @param ob: the coarse MESH Object.
+        @return the list of Objects.
+        """
+        obs = list(
+            o for o in context.selected_objects if o != ob and o.type == "MESH"
+        )
+        if obs:
+            return obs
+        return list(
+            o
+            for o in context.scene.objects
+            if o.type == "MESH"
+            and not o.hide_render
+            and not o.bf_is_tmp
+            and o.bf_namelist_cls != "ON_MESH"
+            and any(s.material and s.material.bf_hrrpua > 0.0 for s in o.material_slots)
+        )
+
+    def execute(self, context):
+        if context.object:
+            bpy.ops.object.mode_set(mode="OBJECT")
+        ob = context.active_object
+        scale_length = context.scene.unit_settings.scale_length
+        regions = list(
+            geometry.utils.get_bbox_xbs(
+                context=context, ob=o, scale_length=scale_length, world=True
+            )
+            for o in self._get_region_obs(context, ob)
+        )
+        if not regions:
+            self.report({"WARNING"}, "No selected Object or burner to refine around")
+            return {"CANCELLED"}
+        try:
+            meshes, msgs = fds.mesh_tools.refine_mesh(
+                ijk=ob.bf_mesh_ijk,
+                xbs=geometry.utils.get_bbox_xbs(
+                    context=context, ob=ob, scale_length=scale_length, world=True
+                ),
+                regions=regions,
+                ratio=int(self.bf_refine_ratio),
+                margin=self.bf_refine_margin,
+                max_cells=self.bf_refine_max_cells or None,
+                poisson=self.bf_poisson_restriction,
+            )
+        except ValueError as err:
+            self.report({"ERROR"}, str(err))
+            return {"CANCELLED"}
+        # Create the new MESH Objects, fine ones first
+        for i, (ijk, xbs, ratio) in enumerate(meshes):
+            kind = ratio > 1 and "fine" or "coarse"
+            _add_mesh_ob(context, ob, f"{ob.name}_{kind}_{i}", ijk, xbs)
+        # Remove the original MESH
+        bpy.data.objects.remove(ob, do_unlink=True)
+        self.report({"INFO"}, ", ".join(msgs))
+        return {"FINISHED"}
+
+    def invoke(self, context, event):
+        # Call dialog
+        wm = context.window_manager
+        return wm.invoke_props_dialog(self)
+
+
+@subscribe
+class SCENE_OT_bf_balance_mpi_processes(Operator):
+    """!
+    Assign exported MESHes to MPI processes, balancing their computational cost.
+    The MPI processes are non-decreasing in MESH export order, as required by FDS.
+    """
+
+    bl_label = "Balance MPI Processes"
+    bl_idname = "scene.bf_balance_mpi_processes"
+    bl_description = "Assign exported MESHes to MPI processes, balancing their cells, OBSTs and GEOM faces"
+    bl_options = {"REGISTER", "UNDO"}
+
+    bf_n_processes: IntProperty(
+        name="MPI Processes",
+        description="Number of MPI processes",
+        default=2,
+        min=1,
+    )
+    bf_box_weight: FloatProperty(
+        name="XB Box Cost",
+        description="Cost of each XB box (eg. OBST, HOLE, VENT) overlapping a MESH, in cells",
+        default=8.0,
+        min=0.0,
+    )
+    bf_face_weight: FloatProperty(
+        name="GEOM Face Cost",
+        description="Cost of each GEOM face overlapping a MESH, in cells",
+        default=4.0,
+        min=0.0,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        """!
+        Test if the operator can be called or not.
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        @return True if operator can be called, False otherwise.
+        """
+        return context.scene
+
+    def draw(self, context):
+        """!
+        Draw function for the operator.
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        """
+        layout = self.layout
+        layout.prop(self, "bf_n_processes")
+        layout.prop(self, "bf_box_weight")
+        layout.prop(self, "bf_face_weight")
+
+    def _get_geometry(self, context, obs, scale_length):
+        """!
+        Get the exported MESH, XB box and GEOM face geometry.
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        @param obs: the exported Objects.
+        @param scale_length: the scale to use.
+        @return the MESH Objects, their xbs and cell counts, the XB boxes, the GEOM face bboxes.
+        """
+        mobs, mxbs, cell_counts, xbs, faces = list(), list(), list(), list(), list()
+        for ob in obs:
+            if ob.bf_namelist_cls == "ON_MESH":
+                mxb = geometry.utils.get_bbox_xbs(
+                    context=context, ob=ob, scale_length=scale_length, world=True
+                )
+                mobs.append(ob)
+                mxbs.append(mxb)
+                cell_counts.append(
+                    fds.mesh_tools.calc_cell_infos(ijk=ob.bf_mesh_ijk, xbs=mxb)[2]
+                )
+            elif ob.bf_namelist_cls == "ON_GEOM":
+                cache = geometry.to_fds.ob_to_geom(
+                    context=context, ob=ob, scale_length=scale_length
+                )
+                verts, fs = cache[1], cache[2]
+                for i in range(0, len(fs), 3):
+                    co = list(verts[3 * (v - 1) : 3 * v] for v in fs[i : i + 3])
+                    faces.append(
+                        (
+                            min(c[0] for c in co),
+                            max(c[0] for c in co),
+                            min(c[1] for c in co),
+                            max(c[1] for c in co),
+                            min(c[2] for c in co),
+                            max(c[2] for c in co),
+                        )
+                    )
+            elif ob.bf_namelist_cls not in ("ON_OBST", "ON_HOLE", "ON_VENT"):
+                continue
+            elif "bf_merged_params" in ob:
+                xbs.extend(
+                    geometry.to_fds.ob_to_merged_xbs(
+                        context, ob, scale_length=scale_length
+                    ).values()
+                )
+            elif ob.bf_xb_export:
+                xbs.extend(
+                    geometry.to_fds.ob_to_xbs(
+                        context=context, ob=ob, scale_length=scale_length
+                    )[0]
+                )
+        return mobs, mxbs, cell_counts, xbs, faces
+
+    def execute(self, context):
+        if context.object:
+            bpy.ops.object.mode_set(mode="OBJECT")
+        sc = context.scene
+        scale_length = sc.unit_settings.scale_length
+        obs = _get_exported_obs(sc)  # MESHes in export order
+        # Get the exported geometry and the MESH costs
+        try:
+            with geometry.utils.geometric_transaction():
+                mobs, mxbs, cell_counts, xbs, faces = self._get_geometry(
+                    context, obs, scale_length
+                )
+        except BFException as err:
+            self.report({"ERROR"}, str(err))
+            return {"CANCELLED"}
+        if not mobs:
+            self.report({"WARNING"}, "No exported MESH")
+            return {"CANCELLED"}
+        costs, _ = fds.mesh_tools.calc_mesh_costs(
+            mxbs=mxbs,
+            cell_counts=cell_counts,
+            xbs=xbs,
+            faces=faces,
+            box_weight=self.bf_box_weight,
+            face_weight=self.bf_face_weight,
+        )
+        # Assign the MPI processes, non-decreasing in export order
+        processes, loads, imbalance = fds.mesh_tools.balance_mpi_processes(
+            costs=costs, n_processes=self.bf_n_processes
+        )
+        for ob, process in zip(mobs, processes):
+            ob.bf_mesh_mpi_process = process
+            ob.bf_mesh_mpi_process_export = True
+        self.report(
+            {"INFO"},
+            f"{len(mobs)} MESHes on {len(loads)} MPI processes, predicted imbalance {imbalance:.1%}",
+        )
+        return {"FINISHED"}
+
+    def invoke(self, context, event):
+        # Call dialog
+        wm = context.window_manager
+        return wm.invoke_props_dialog(self)
+
+
+@subscribe
+class SCENE_OT_bf_write_case_estimate(Operator):
+    """!
+    Write the estimate of size, memory and wall clock time of the FDS case to a JSON file.
+    """
+
+    bl_label = "Write Estimate"
+    bl_idname = "scene.bf_write_case_estimate"
+    bl_description = "Write the estimate of size, memory and wall clock time of the FDS case to a JSON file"
+
+    @classmethod
+    def poll(cls, context):
+        """!
+        Test if the operator can be called or not.
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        @return True if operator can be called, False otherwise.
+        """
+        return context.scene
+
+    def execute(self, context):
+        sc = context.scene
+        directory = bpy.path.abspath(
+            sc.bf_config_directory or os.path.dirname(bpy.data.filepath)
+        )
+        filepath = os.path.join(
+            directory, f"{bpy.path.clean_name(sc.name)}_estimate.json"
+        )
+        try:
+            estimate = sc.get_case_estimate(context)
+        except BFException as err:
+            self.report({"ERROR"}, str(err))
+            return {"CANCELLED"}
+        try:
+            with open(filepath, "w", encoding="utf-8") as f:
+                json.dump(estimate, f, indent=2)
+        except IOError:
+            self.report({"ERROR"}, f"Filepath not writable:\n<{filepath}>")
+            return {"CANCELLED"}
+        self.report({"INFO"}, f"Estimate written to <{filepath}>")
+        return {"FINISHED"}
+
+
+@subscribe
+class SCENE_OT_bf_check_meshes(Operator):
+    """!
+    Check exported MESHes for overlaps, near-miss gaps and misaligned interfaces.
+    """
+
+    bl_label = "Check MESHes"
+    bl_idname = "scene.bf_check_meshes"
+    bl_description = "Check exported MESHes for overlaps, near-miss gaps and misaligned interfaces, select the offending ones"
+
+    @classmethod
+    def poll(cls, context):
+        """!
+        Test if the operator can be called or not.
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        @return True if operator can be called, False otherwise.
+        """
+        return context.scene
+
+    def execute(self, context):
+        sc = context.scene
+        scale_length = sc.unit_settings.scale_length
+        obs = list(
+            ob
+            for ob in sc.objects
+            if ob.type == "MESH"
+            and ob.bf_namelist_cls == "ON_MESH"
+            and not ob.hide_render
+            and not ob.bf_is_tmp
+        )
+        issues = fds.mesh_tools.check_meshes(
+            ijks=list(ob.bf_mesh_ijk for ob in obs),
+            xbss=list(
+                geometry.utils.get_bbox_xbs(
+                    context=context, ob=ob, scale_length=scale_length, world=True
+                )
+                for ob in obs
+            ),
+        )
+        if not issues:
+            self.report({"INFO"}, f"{len(obs)} MESHes checked, no issue")
+            return {"FINISHED"}
+        for i, j, kind, msg in issues:
+            log.warning(f"MESH <{obs[i].name}> and <{obs[j].name}>: {msg}")
+        # Select offending Objects
+        if context.object:
+            bpy.ops.object.mode_set(mode="OBJECT")
+        bpy.ops.object.select_all(action="DESELECT")
+        for i, j, _, _ in issues:
+            obs[i].select_set(True)
+            obs[j].select_set(True)
+        i, j, kind, msg = issues[0]
+        context.view_layer.objects.active = obs[i]
+        counts = dict()
+        for issue in issues:
+            counts[issue[2]] = counts.get(issue[2], 0) + 1
+        counts = ", ".join(f"{n} {kind.lower()}" for kind, n in counts.items())
+        self.report(
+            {"ERROR"}, f"MESH issues: {counts}; first: <{obs[i].name}> and <{obs[j].name}>, {msg}",
+        )
+        return {"CANCELLED"}
 
 
 @subscribe
 class OBJECT_OT_bf_align_selected_meshes(Operator):
+    """!
+    Align selected MESHes to each other, all at once.
+    """
+
     bl_label = "Align Selected"
     bl_idname = "object.bf_align_selected_meshes"
-    bl_description = "Align selected MESHes to the current Object MESH"
+    bl_description = "Align selected MESHes to each other, protecting the finest cell sizes"
     bl_options = {"REGISTER", "UNDO"}
 
+    bf_poisson_restriction: BoolProperty(
+        name="Poisson Restriction",
+        description="Respect FDS Poisson solver restriction on IJK values of aligned MESHes.\nMESHes may be slightly extended.",
+        default=True,
+    )
+
     @classmethod
     def poll(cls, context):
+        """!
+        Test if the operator can be called or not.
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        @return True if operator can be called, False otherwise.
+        """
         ob = context.active_object
-        return ob and ob.bf_namelist == "ON_MESH"
+        return ob and ob.bf_namelist_cls == "ON_MESH"
 
-    def invoke(self, context, event):  # Ask for confirmation
+    def draw(self, context):
+        """!
+        Draw function for the operator.
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        """
+        self.layout.prop(self, "bf_poisson_restriction")
+
+    def invoke(self, context, event):
+        # Call dialog
         wm = context.window_manager
-        return wm.invoke_confirm(self, event)
+        return wm.invoke_props_dialog(self)
 
     def execute(self, context):
-        bpy.ops.object.mode_set(mode="OBJECT")
-        # Get source and destination objects
-        source_element = context.active_object
-        destination_elements = set(
+        if context.object:
+            bpy.ops.object.mode_set(mode="OBJECT")
+        scale_length = context.scene.unit_settings.scale_length
+        obs = list(
             ob
             for ob in context.selected_objects
-            if ob.type == "MESH"
-            and ob != source_element
-            and ob.bf_namelist == "ON_MESH"
+            if ob.type == "MESH" and ob.bf_namelist_cls == "ON_MESH"
         )
-        if not destination_elements:
-            self.report({"WARNING"}, "No destination Object")
+        if len(obs) < 2:
+            self.report({"WARNING"}, "Select at least two MESH Objects")
             return {"CANCELLED"}
-        if not source_element:
-            self.report({"WARNING"}, "No source Object")
-            return {"CANCELLED"}
-        # Align
-        #        _bf_props_copy(context, source_element, destination_elements)
-        self.report({"INFO"}, "MESH Objects aligned")
+        # Align, in world coordinates
+        xbss = list(
+            geometry.utils.get_bbox_xbs(
+                context=context, ob=ob, scale_length=scale_length, world=True
+            )
+            for ob in obs
+        )
+        ijks, xbss, msgs, conflicts = fds.mesh_tools.align_all_meshes(
+            ijks=list(ob.bf_mesh_ijk for ob in obs),
+            xbss=xbss,
+            poisson=self.bf_poisson_restriction,
+        )
+        # Write IJK and XB of all MESHes
+        for ob, ijk, xbs in zip(obs, ijks, xbss):
+            me_old, ma = ob.data, ob.active_material
+            me = bpy.data.meshes.new(me_old.name)
+            geometry.from_fds.xbs_bbox_to_mesh((xbs,), context, me, scale_length)
+            ob.data = me
+            ob.matrix_world = Matrix()
+            ob.active_material = ma
+            if not me_old.users:
+                bpy.data.meshes.remove(me_old)
+            ob.bf_xb, ob.bf_xb_export = "BBOX", True
+            ob.bf_mesh_ijk = ijk
+        # Report
+        for i, j, msg in conflicts:
+            log.warning(f"MESH <{obs[i].name}> and <{obs[j].name}>: {msg}")
+        if conflicts:
+            i, j, msg = conflicts[0]
+            msgs.append(f"first: <{obs[i].name}> and <{obs[j].name}>, {msg}")
+            self.report({"WARNING"}, ", ".join(msgs))
+        else:
+            self.report({"INFO"}, ", ".join(msgs))
         return {"FINISHED"}
 
 
@@ -19,9 +19,10 @@ BlenderFDS, <a href="https://docs.blender.org/api/current/bpy.types.Panel.html">
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 import bpy
-from bpy.types import Panel, UIList, Operator, bpy_struct
+from bpy.types import Panel, UIList, Operator, bpy_struct, WindowManager
+from bpy.props import EnumProperty
 
-from . import custom_uilist
+from . import custom_uilist, profiler, draw_cache
 from .. import lang, config, geometry, gis, fds
 
 bl_classes = list()
@@ -87,7 +88,7 @@ class SCENE_PT_bf_namelist:
         layout.use_property_decorate = False  # No animation.
         flow = layout.grid_flow(row_major=True, columns=1, even_columns=True)
         bf_namelist = lang.bf_namelists_by_cls[self.bf_namelist_cls]
-        bf_namelist(sc).draw(context, flow)
+        bf_namelist.get_instance(sc).draw(context, flow)
 
 
 @subscribe
@@ -109,7 +110,7 @@ class SCENE_PT_bf_case_config(Panel, SCENE_PT_bf_namelist):
         row.operator("scene.bf_props_to_scene", icon="COPYDOWN")
         bf_namelist = lang.bf_namelists_by_cls[self.bf_namelist_cls]
         flow = layout.grid_flow(row_major=True, columns=1, even_columns=True)
-        bf_namelist(sc).draw(context, flow)
+        bf_namelist.get_instance(sc).draw(context, flow)
 
 
 @subscribe
@@ -148,6 +149,118 @@ class SCENE_PT_bf_config_units(Panel, SCENE_PT_bf_namelist):
     bl_options = {"DEFAULT_CLOSED"}
 
 
+@subscribe
+class SCENE_PT_bf_config_profile(Panel):
+    """!
+    Export Profiling Report
+    """
+
+    bl_space_type = "PROPERTIES"
+    bl_region_type = "WINDOW"
+    bl_context = "scene"
+    bl_label = "Export Profiling Report"
+    bl_parent_id = "SCENE_PT_bf_case_config"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    max_rows = 30  # max number of shown objects
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene and context.scene.bf_config_profile
+
+    def draw(self, context):
+        """!
+        Draw UI elements into the panel UI layout.
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        """
+        layout = self.layout
+        report = profiler.last_report
+        if not report:
+            layout.label(text="Export the case to get the report")
+            return
+        col = layout.column()
+        col.label(
+            text=f"<{report['name']}>: {report['time']:.3f} s, "
+            f"peak {report['peak_memory'] / 1048576.0:.1f} MB"
+        )
+        # Namelists
+        box = col.box()
+        for label, n in sorted(
+            report["namelists"].items(), key=lambda k: k[1]["time"], reverse=True
+        ):
+            row = box.row()
+            row.label(text=label)
+            row.label(text=f"{n['count']} obs")
+            row.label(text=f"{n['time']:.3f} s")
+        # Objects
+        sort_by = context.window_manager.bf_profile_sort_by
+        col.prop(context.window_manager, "bf_profile_sort_by", text="Sort By")
+        obs = report["objects"]
+        if sort_by == "time":
+            key = lambda r: r["time"]
+        elif sort_by == "peak_memory":
+            key = lambda r: r["peak_memory"]
+        elif sort_by in profiler.stages:
+            key = lambda r: r["stages"].get(sort_by, 0.0)
+        else:
+            key = lambda r: r["counts"].get(sort_by, 0)
+        obs = sorted(obs, key=key, reverse=True)[: self.max_rows]
+        box = col.box()
+        for r in obs:
+            row = box.row()
+            row.label(text=r["name"])
+            row.label(text=f"{r['time']:.3f} s")
+            if sort_by == "peak_memory":
+                row.label(text=f"{r['peak_memory'] / 1048576.0:.1f} MB")
+            elif sort_by in profiler.stages:
+                row.label(text=f"{r['stages'].get(sort_by, 0.0):.3f} s")
+            elif sort_by != "time":
+                row.label(text=str(r["counts"].get(sort_by, 0)))
+
+
+@subscribe
+class SCENE_PT_bf_case_estimate(Panel):
+    """!
+    FDS Case Estimate
+    """
+
+    bl_space_type = "PROPERTIES"
+    bl_region_type = "WINDOW"
+    bl_context = "scene"
+    bl_label = "FDS Case Estimate"
+    bl_parent_id = "SCENE_PT_bf_case_config"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        """!
+        Draw UI elements into the panel UI layout.
+        @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+        """
+        sc = context.scene
+        layout = self.layout
+        e = draw_cache.get(
+            (sc.as_pointer(), "case_estimate"), sc.get_case_estimate, context
+        )
+        col = layout.column(align=True)
+        col.label(text=f"MESHes: {e['n_meshes']}, Cells: {e['n_cells']:,}")
+        col.label(
+            text=f"MPI Processes: {e['n_mpi_processes']}, "
+            f"Max Cells: {e['max_cells_per_process']:,}"
+        )
+        col.label(text=f"RAM: {e['ram'] / 1073741824.0:.2f} GB")
+        col.label(
+            text=f"Time Step: {e['time_step']:.4f} s, "
+            f"Steps: {e['n_time_steps']:,} (CFL {e['model']['cfl']})"
+        )
+        col.label(text=f"Wall Clock: {e['wall_clock_time'] / 3600.0:.1f} h")
+        c = e["counts"]
+        col.label(text=f"DEVCs: {c['devcs']}, SLCFs: {c['slcfs']}")
+        col.label(
+            text=f"OBST Boxes: {c['obst_boxes']}, GEOM Faces: {c['geom_faces']}"
+        )
+        layout.operator("scene.bf_write_case_estimate", icon="FILE")
+
+
 @subscribe
 class SCENE_PT_bf_namelist_HEAD(Panel, SCENE_PT_bf_namelist):
     """!
@@ -489,11 +602,28 @@ def register():
     """
     for cls in bl_classes:
         bpy.utils.register_class(cls)
+    WindowManager.bf_profile_sort_by = EnumProperty(
+        name="Sort By",
+        description="Sort profiled objects by",
+        items=(
+            ("time", "Total Time", "Sort by total export time"),
+            ("mesh", "Mesh Evaluation", "Sort by mesh evaluation time"),
+            ("check", "Sanity Check", "Sort by sanity check time"),
+            ("voxelize", "Voxelization", "Sort by voxelization time"),
+            ("merge", "Merge", "Sort by voxel merging time"),
+            ("format", "Formatting", "Sort by FDS formatting time"),
+            ("boxes", "Boxes", "Sort by number of exported boxes"),
+            ("faces", "Faces", "Sort by number of exported faces"),
+            ("peak_memory", "Peak Memory", "Sort by peak memory"),
+        ),
+        default="time",
+    )
 
 
 def unregister():
     """!
     Unload the Python classes and functions from blender.
     """
+    del WindowManager.bf_profile_sort_by
     for cls in bl_classes:
         bpy.utils.unregister_class(cls)
@@ -78,6 +78,13 @@ class BFPreferences(AddonPreferences):
         unit="AREA",
     )
 
+    parse_workers: IntProperty(
+        name="Parse Workers",
+        description="Max number of worker processes for parsing long FDS files,\n0 for the number of CPUs, 1 for no workers",
+        default=0,
+        min=0,
+    )
+
     def draw(self, context):
         """!
         Draw UI elements into the panel UI layout.
@@ -98,6 +105,9 @@ class BFPreferences(AddonPreferences):
         box.label(text="Default Sizes and Thresholds")
         box.prop(self, "min_edge_length")
         box.prop(self, "min_face_area")
+        box = layout.box()
+        box.label(text="Import")
+        box.prop(self, "parse_workers")
         return layout
 
 
@@ -0,0 +1,184 @@
+"""!
+BlenderFDS, export profiling with per-object, per-namelist and per-stage timings.
+"""
+
+import json, logging, tracemalloc
+from time import time, strftime, localtime
+from contextlib import contextmanager
+
+log = logging.getLogger(__name__)
+
+# While a profile is active, the export code opens an object context for
+# each exported Object and stage contexts (eg. mesh, check, voxelize,
+# merge, format, write) around the relevant computations.
+# Stages outside of an object context are recorded at case level.
+# When inactive, contexts and counters are no-ops.
+
+## Profiled stages, in order of execution
+stages = ("mesh", "check", "voxelize", "merge", "format", "write")
+
+_profile = None  # current profile, while active
+_obs = list()  # stack of current object records
+
+## Last completed profile report, shown by the profiling panel
+last_report = None
+
+
+def is_active():
+    """!
+    Check if a profile is active.
+    @return True if a profile is active, False otherwise.
+    """
+    return _profile is not None
+
+
+def start(name):
+    """!
+    Start a new profile.
+    @param name: the profiled case name.
+    """
+    global _profile
+    _obs.clear()
+    _profile = {
+        "name": name,
+        "date": strftime("%a, %d %b %Y, %H:%M:%S", localtime()),
+        "t0": time(),
+        "stages": dict(),
+        "objects": list(),
+        "peak_memory": 0,
+        "was_tracing": tracemalloc.is_tracing(),
+    }
+    if not _profile["was_tracing"]:
+        tracemalloc.start()
+    _reset_peak()
+
+
+def stop():
+    """!
+    Stop the current profile and return its report.
+    @return the report dict, or None if no profile is active.
+    """
+    global _profile, last_report
+    if _profile is None:
+        return
+    _update_peaks()
+    p, _profile = _profile, None
+    _obs.clear()
+    if not p["was_tracing"]:
+        tracemalloc.stop()
+    # Aggregate by namelist
+    namelists = dict()
+    for r in p["objects"]:
+        n = namelists.setdefault(r["namelist"], {"count": 0, "time": 0.0})
+        n["count"] += 1
+        n["time"] += r["time"]
+    # Assemble
+    objects = sorted(p["objects"], key=lambda r: r["time"], reverse=True)
+    last_report = {
+        "name": p["name"],
+        "date": p["date"],
+        "time": time() - p["t0"],
+        "peak_memory": p["peak_memory"],
+        "stages": p["stages"],
+        "namelists": namelists,
+        "objects": objects,
+    }
+    log.debug(f"Profile <{p['name']}> completed in {last_report['time']:.3f} s")
+    return last_report
+
+
+def _reset_peak():
+    """!
+    Reset the traced memory peak, if supported (Python >= 3.9).
+    """
+    try:
+        tracemalloc.reset_peak()
+    except AttributeError:
+        pass
+
+
+def _update_peaks():
+    """!
+    Update the peak memory of the profile and of the open Object records
+    with the traced memory peak, before it is reset.
+    """
+    peak = tracemalloc.get_traced_memory()[1]
+    _profile["peak_memory"] = max(_profile["peak_memory"], peak)
+    for r in _obs:
+        r["peak_memory"] = max(r["peak_memory"], peak)
+
+
+@contextmanager
+def for_object(ob):
+    """!
+    Context manager for profiling the export of an Object.
+    @param ob: the Blender object.
+    """
+    if _profile is None:
+        yield
+        return
+    r = {
+        "name": ob.name,
+        "namelist": ob.bf_namelist_cls,
+        "time": 0.0,
+        "stages": dict(),
+        "counts": dict(),
+        "peak_memory": 0,
+    }
+    _update_peaks()  # of the case and of the enclosing Objects
+    _reset_peak()
+    _obs.append(r)
+    t0 = time()
+    try:
+        yield
+    finally:
+        r["time"] = time() - t0
+        if _profile is not None:
+            _update_peaks()
+            _profile["objects"].append(r)
+        if r in _obs:
+            _obs.remove(r)
+
+
+@contextmanager
+def stage(name):
+    """!
+    Context manager for profiling a stage of the current Object or of the case.
+    @param name: the stage name, eg. "voxelize".
+    """
+    if _profile is None:
+        yield
+        return
+    t0 = time()
+    try:
+        yield
+    finally:
+        dt = time() - t0
+        if _profile is not None:
+            d = _obs[-1]["stages"] if _obs else _profile["stages"]
+            d[name] = d.get(name, 0.0) + dt
+
+
+def count(name, n):
+    """!
+    Add a counter (eg. number of boxes or faces) to the current Object.
+    @param name: the counter name, eg. "boxes".
+    @param n: the value to add.
+    """
+    if _profile is None or not _obs:
+        return
+    d = _obs[-1]["counts"]
+    d[name] = d.get(name, 0) + n
+
+
+def write_report(filepath, report=None):
+    """!
+    Write the profile report to a JSON file.
+    @param filepath: the JSON file path.
+    @param report: the report, if None the last one.
+    """
+    report = report or last_report
+    if not report:
+        return
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
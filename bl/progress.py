@@ -0,0 +1,177 @@
+"""!
+BlenderFDS, progress reporting for long operations.
+"""
+
+import bpy, logging
+from time import time
+from contextlib import contextmanager
+
+log = logging.getLogger(__name__)
+
+# Long operations (eg. export, voxelization, import) report their progress
+# by opening nested tasks. The overall fraction is computed from the stack
+# of open tasks and sent to the window manager progress indicator,
+# or printed with an ETA when Blender runs in background mode.
+# Blender does not deliver UI events while Python runs, so a running step
+# cannot be interrupted. Modal operators (eg. the FDS export) cancel on ESC
+# between steps, by closing their generator, that closes the open tasks.
+
+
+class _Task:
+    """!
+    Progress task, a stack element.
+    """
+
+    def __init__(self, label, total):
+        """!
+        Class constructor.
+        @param label: the task label.
+        @param total: the total number of steps.
+        """
+        ## Task label
+        self.label = label
+        ## Total number of steps
+        self.total = max(int(total), 1)
+        ## Completed steps
+        self.done = 0
+
+
+_tasks = list()  # stack of open tasks
+_t0 = 0.0  # start time of the outermost task
+_t_print = 0.0  # last background print time
+_print_interval = 2.0  # s, between background prints
+
+
+def _get_wm():
+    """!
+    Get the window manager, if the UI is available.
+    @return the window manager or None.
+    """
+    if bpy.app.background:
+        return None
+    return getattr(bpy.context, "window_manager", None)
+
+
+def get_fraction():
+    """!
+    Get the overall completed fraction from the stack of open tasks.
+    @return the completed fraction, from 0. to 1.
+    """
+    fraction, scale = 0.0, 1.0
+    for task in _tasks:
+        fraction += scale * min(task.done, task.total) / task.total
+        scale /= task.total
+    return min(fraction, 1.0)
+
+
+def _report(force=False):
+    """!
+    Send the current progress to the window manager or to stdout.
+    @param force: if True, print in background mode even if too early.
+    """
+    global _t_print
+    if not _tasks:
+        return
+    fraction = get_fraction()
+    wm = _get_wm()
+    if wm:
+        wm.progress_update(fraction * 100.0)
+        return
+    now = time()
+    if not force and now - _t_print < _print_interval:
+        return
+    _t_print = now
+    elapsed = now - _t0
+    if fraction > 0.0:
+        eta = f"ETA {elapsed * (1.0 - fraction) / fraction:.0f} s"
+    else:
+        eta = "ETA unknown"
+    print(f"BFDS: {_tasks[-1].label}: {fraction * 100.0:.1f}%, {eta}", flush=True)
+
+
+def begin(label, total=1):
+    """!
+    Open a new nested progress task.
+    @param label: the task label.
+    @param total: the total number of steps of the task.
+    """
+    global _t0, _t_print
+    if not _tasks:
+        _t0 = _t_print = time()
+        wm = _get_wm()
+        if wm:
+            wm.progress_begin(0.0, 100.0)
+    log.debug(f"Begin <{label}> with <{total}> steps")
+    _tasks.append(_Task(label, total))
+    _report()
+
+
+def step(n=1, label=None):
+    """!
+    Advance the current progress task.
+    @param n: number of completed steps.
+    @param label: the new task label, if any.
+    """
+    if not _tasks:
+        return
+    task = _tasks[-1]
+    task.done += n
+    if label:
+        task.label = label
+    _report()
+
+
+def end():
+    """!
+    Close the current progress task.
+    """
+    if not _tasks:
+        return
+    _tasks.pop()
+    if not _tasks:
+        _close()
+
+
+def _close():
+    """!
+    Close the progress indicator.
+    """
+    _tasks.clear()
+    wm = _get_wm()
+    if wm:
+        wm.progress_end()
+    else:
+        log.debug(f"Completed in {time() - _t0:.3f} s")
+
+
+@contextmanager
+def task(label, total=1):
+    """!
+    Context manager for a nested progress task.
+    Inner tasks left open by an exception are closed too.
+    @param label: the task label.
+    @param total: the total number of steps of the task.
+    """
+    depth = len(_tasks)
+    begin(label, total)
+    try:
+        yield
+    finally:
+        del _tasks[depth + 1 :]  # left open by exceptions
+        end()
+
+
+def is_running():
+    """!
+    Check if a progress task is open.
+    @return True if a progress task is open, False otherwise.
+    """
+    return bool(_tasks)
+
+
+def reset():
+    """!
+    Close all open progress tasks.
+    """
+    if _tasks:
+        _close()
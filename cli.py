@@ -0,0 +1,328 @@
+"""!
+BlenderFDS, headless batch export command line interface.
+
+Fan out the export of Blender files and scenes over a pool
+of background Blender processes. This module does not import bpy,
+run it with plain Python from the add-on parent directory:
+
+    python -m blenderfds.cli export --jobs 4 --all-scenes cases/*.blend
+    python -m blenderfds.cli export -s Fire1 -s Fire2 -o /tmp/cases case.blend
+    python -m blenderfds.cli bench --repeat 10
+"""
+
+import os, sys, json, time, shutil, logging, argparse, subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+log = logging.getLogger(__name__)
+
+# Worker script, executed by each background Blender process.
+# Its arguments are passed as JSON after the "--" separator.
+
+_worker_expr = """
+import sys, json, os, bpy
+args = json.loads(sys.argv[sys.argv.index("--") + 1])
+if args["scene"] is None:
+    scs = list(bpy.data.scenes) if args["all_scenes"] else [bpy.context.scene]
+else:
+    scs = [bpy.data.scenes[args["scene"]]]
+for sc in scs:
+    directory = (
+        args["output_dir"]
+        or bpy.path.abspath(sc.bf_config_directory)
+        or os.path.dirname(bpy.data.filepath)
+    )
+    filepath = os.path.join(directory, bpy.path.clean_name(sc.name) + ".fds")
+    res = bpy.ops.export_scene.fds({"scene": sc}, filepath=filepath)
+    if res != {"FINISHED"}:
+        raise RuntimeError(f"Export of scene <{sc.name}> failed")
+    print(f"BFDS: exported <{filepath}>", flush=True)
+"""
+
+# Startup benchmark script, executed by a background Blender process
+# with the add-on enabled. Prints the add-on import and registration times.
+
+_bench_expr = """
+import sys, json, importlib
+addon = importlib.import_module(sys.argv[sys.argv.index("--") + 1])
+times = dict(addon.startup_times, **{"import": addon.import_time})
+print("BFDS-BENCH:" + json.dumps(times), flush=True)
+"""
+
+
+class Job:
+    """!
+    Export job, run by a background Blender process.
+    """
+
+    def __init__(self, filepath, scene=None, all_scenes=False, output_dir=None):
+        """!
+        Class constructor.
+        @param filepath: the Blender file path.
+        @param scene: the scene name, if None the active one.
+        @param all_scenes: if True and no scene is set, export all scenes.
+        @param output_dir: the destination directory, if None the scene one.
+        """
+        ## Blender file path
+        self.filepath = filepath
+        ## Scene name
+        self.scene = scene
+        ## Export all scenes
+        self.all_scenes = all_scenes
+        ## Destination directory
+        self.output_dir = output_dir
+        ## Job status: "pending", "ok", "failed" or "timeout"
+        self.status = "pending"
+        ## Elapsed time in s
+        self.time = 0.0
+        ## Process output
+        self.output = str()
+
+    def __str__(self):
+        scene = self.scene or (self.all_scenes and "all scenes" or "active scene")
+        return f"{self.filepath} <{scene}>"
+
+    def get_cmd(self, blender, addon):
+        """!
+        Get the background Blender command line.
+        @param blender: the Blender executable.
+        @param addon: the BlenderFDS add-on module name.
+        @return the command line.
+        """
+        args = {
+            "scene": self.scene,
+            "all_scenes": self.all_scenes,
+            "output_dir": self.output_dir and os.path.abspath(self.output_dir),
+        }
+        return [
+            blender,
+            "--background",
+            "--factory-startup",
+            "--addons",
+            addon,
+            "--python-exit-code",
+            "1",
+            self.filepath,
+            "--python-expr",
+            _worker_expr,
+            "--",
+            json.dumps(args),
+        ]
+
+    def run(self, blender, addon, timeout=None):
+        """!
+        Run the job in a background Blender process.
+        @param blender: the Blender executable.
+        @param addon: the BlenderFDS add-on module name.
+        @param timeout: the timeout in s, if any.
+        @return the job itself.
+        """
+        t0 = time.time()
+        try:
+            proc = subprocess.run(
+                self.get_cmd(blender, addon),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+                timeout=timeout,
+            )
+        except subprocess.TimeoutExpired as err:
+            output = err.output or str()
+            if isinstance(output, bytes):  # not always decoded
+                output = output.decode(errors="replace")
+            self.status, self.output = "timeout", output
+        except OSError as err:
+            self.status, self.output = "failed", str(err)
+        else:
+            self.status = proc.returncode and "failed" or "ok"
+            self.output = proc.stdout
+        self.time = time.time() - t0
+        return self
+
+    def to_dict(self):
+        """!
+        Return the job report.
+        @return the job report dict.
+        """
+        return {
+            "filepath": self.filepath,
+            "scene": self.scene,
+            "all_scenes": self.all_scenes,
+            "status": self.status,
+            "time": self.time,
+            "output": self.output,
+        }
+
+
+def get_jobs(filepaths, scenes=None, all_scenes=False, output_dir=None):
+    """!
+    Get the export jobs, one per scene or one per file.
+    @param filepaths: the Blender file paths.
+    @param scenes: the scene names, if any.
+    @param all_scenes: if True and no scene is set, export all scenes of each file.
+    @param output_dir: the destination directory, if any.
+    @return the list of jobs.
+    """
+    jobs = list()
+    for filepath in filepaths:
+        filepath = os.path.abspath(filepath)
+        if scenes:
+            jobs.extend(Job(filepath, sc, False, output_dir) for sc in scenes)
+        else:
+            jobs.append(Job(filepath, None, all_scenes, output_dir))
+    return jobs
+
+
+def run_jobs(jobs, blender, addon, max_workers=1, timeout=None):
+    """!
+    Run the jobs over a pool of background Blender processes.
+    @param jobs: the list of jobs.
+    @param blender: the Blender executable.
+    @param addon: the BlenderFDS add-on module name.
+    @param max_workers: the max number of concurrent processes.
+    @param timeout: the timeout in s of each job, if any.
+    @return the list of jobs.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(job.run, blender, addon, timeout) for job in jobs]
+        for i, future in enumerate(as_completed(futures)):
+            job = future.result()
+            print(
+                f"[{i + 1}/{len(jobs)}] {job.status.upper()} {job} in {job.time:.1f} s",
+                flush=True,
+            )
+            if job.status != "ok":
+                print("\n".join(job.output.splitlines()[-20:]), flush=True)
+    return jobs
+
+
+def _export(args):
+    """!
+    Run the export command.
+    @param args: the parsed command line arguments.
+    @return the exit code.
+    """
+    blender = args.blender or shutil.which("blender")
+    if not blender:
+        print("Blender executable not found, use --blender", file=sys.stderr)
+        return 2
+    jobs = get_jobs(args.files, args.scene, args.all_scenes, args.output_dir)
+    t0 = time.time()
+    run_jobs(jobs, blender, args.addon, args.jobs, args.timeout)
+    dt = time.time() - t0
+    failed = [job for job in jobs if job.status != "ok"]
+    print(f"{len(jobs) - len(failed)} ok, {len(failed)} failed, in {dt:.1f} s")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(
+                {"time": dt, "jobs": [job.to_dict() for job in jobs]}, f, indent=2
+            )
+    return failed and 1 or 0
+
+
+def _bench(args):
+    """!
+    Run the startup benchmark command.
+    @param args: the parsed command line arguments.
+    @return the exit code.
+    """
+    blender = args.blender or shutil.which("blender")
+    if not blender:
+        print("Blender executable not found, use --blender", file=sys.stderr)
+        return 2
+    cmd = [blender, "--background", "--factory-startup"]
+    expr = ["--python-expr", _bench_expr, "--", args.addon]
+    walls, walls_ref, stages = list(), list(), dict()
+    for i in range(args.repeat):
+        # Reference, without the add-on
+        t0 = time.time()
+        subprocess.run(cmd + ["--python-expr", "pass"], stdout=subprocess.DEVNULL)
+        walls_ref.append(time.time() - t0)
+        # With the add-on
+        t0 = time.time()
+        proc = subprocess.run(
+            cmd + ["--addons", args.addon] + expr,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+        )
+        walls.append(time.time() - t0)
+        for line in proc.stdout.splitlines():
+            if line.startswith("BFDS-BENCH:"):
+                for k, v in json.loads(line[11:]).items():
+                    stages.setdefault(k, list()).append(v)
+                break
+        else:
+            print(proc.stdout, file=sys.stderr)
+            return 1
+    print(f"Startup benchmark, {args.repeat} runs, best times:")
+    for k, v in stages.items():
+        print(f"  {k:<12} {min(v):.3f} s")
+    print(f"  {'total':<12} {min(sum(v) for v in zip(*stages.values())):.3f} s")
+    print(f"Blender wall time: {min(walls):.3f} s, w/o add-on {min(walls_ref):.3f} s")
+    return 0
+
+
+def get_parser():
+    """!
+    Get the command line parser.
+    @return the parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="blenderfds", description="BlenderFDS headless tools"
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+    p = subparsers.add_parser("export", help="batch export Blender files to FDS")
+    p.add_argument("files", nargs="+", help="Blender files to export")
+    p.add_argument(
+        "-s",
+        "--scene",
+        action="append",
+        help="scene to export, repeat for more scenes (default: active scene)",
+    )
+    p.add_argument(
+        "-a", "--all-scenes", action="store_true", help="export all scenes"
+    )
+    p.add_argument(
+        "-o", "--output-dir", help="destination directory (default: scene one)"
+    )
+    p.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="max number of concurrent Blender processes",
+    )
+    p.add_argument("-t", "--timeout", type=float, help="timeout of each job in s")
+    p.add_argument("--blender", help="Blender executable (default: from PATH)")
+    p.add_argument(
+        "--addon",
+        default=os.path.basename(os.path.dirname(os.path.abspath(__file__))),
+        help="BlenderFDS add-on module name",
+    )
+    p.add_argument("--report", help="write a JSON report of all jobs")
+    p.set_defaults(func=_export)
+    p = subparsers.add_parser("bench", help="benchmark the add-on startup time")
+    p.add_argument("-r", "--repeat", type=int, default=5, help="number of runs")
+    p.add_argument("--blender", help="Blender executable (default: from PATH)")
+    p.add_argument(
+        "--addon",
+        default=os.path.basename(os.path.dirname(os.path.abspath(__file__))),
+        help="BlenderFDS add-on module name",
+    )
+    p.set_defaults(func=_bench)
+    return parser
+
+
+def main(argv=None):
+    """!
+    Command line entry point.
+    @param argv: the command line arguments.
+    @return the exit code.
+    """
+    args = get_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
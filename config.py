@@ -15,6 +15,7 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 import bpy
+from functools import lru_cache
 
 
 # Shortcut
@@ -29,6 +30,12 @@ import bpy
 ## Supported file version
 supported_file_version = 5, 0, 0
 
+## Namelists with XB that can be imported in bulk into merged Objects
+merged_fds_labels = "OBST", "HOLE", "VENT"
+
+## Heavy geometric namelists that can be imported as proxies
+proxy_fds_labels = "OBST", "HOLE", "GEOM"
+
 ## Default SURFs
 default_mas = {  # name: diffuse_color
     "Dummy Color1": ((1.0, 1.0, 1.0, 0.05),),  # white
@@ -268,9 +275,12 @@ quantities = (  # name, description, units, qtype, subject
 )
 
 
+@lru_cache(maxsize=None)
 def get_quantity_items(qtype):
     """!
-    Prepare quantity items for menus.
+    Prepare quantity items for menus, built on first request and cached.
+    @param qtype: the quantity type, eg. "D" for DEVC.
+    @return the list of quantity items.
     """
     items = []
     # Generated like this: (("[Heat] NET HEAT FLUX", "NET HEAT FLUX (kW/m²)", "Description...",) ...)
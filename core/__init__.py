@@ -0,0 +1,26 @@
+"""!
+BlenderFDS, core package independent from Blender.
+
+It can be imported in plain Python, eg. for server-side pipelines.
+Submodules are loaded on first access, to keep the import cost low:
+- fds_case: FDSParam, FDSNamelist, FDSCase for parsing and formatting
+- bingeom: FDS bingeom binary geometry files
+- terrain: terrain triangulation, by blocks from a memory-mapped cache
+- mesh_tools: FDS MESH alignment, checks, cell sizes, splitting, refinement and MPI balancing
+- utm: WGS84 UTM and longitude/latitude coordinates
+"""
+
+import importlib
+
+__all__ = ["exceptions", "fds_case", "bingeom", "terrain", "mesh_tools", "utm"]
+
+
+def __getattr__(name):
+    """!
+    Load submodules on first access.
+    @param name: the submodule name.
+    @return the submodule.
+    """
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
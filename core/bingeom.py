@@ -106,6 +106,48 @@ def write_bingeom(n_surf_id, fds_verts, fds_faces, fds_surfs, fds_volus, filepat
         _write_record(f, np.array(fds_volus, dtype="int32"))
 
 
+def _write_record_blocks(f, dtype, dlen, blocks):
+    """!
+    Write a record to a binary unformatted sequential Fortran90 file, block by block.
+    @param f: open Python file object in 'wb' mode.
+    @param dtype: type of data in 'int32' or 'float64'.
+    @param dlen: total length of the record.
+    @param blocks: iterable of np.array() of data.
+    """
+    tag = dlen * np.dtype(dtype).itemsize
+    f.write(struct.pack("i", tag))
+    n = 0
+    for data in blocks:
+        data = np.asarray(data, dtype=dtype)
+        data.tofile(f)
+        n += len(data)
+    if n != dlen:
+        raise IOError(f"Different declared and written record length: {dlen}, {n}")
+    f.write(struct.pack("i", tag))
+
+
+def write_bingeom_blocks(
+    n_surf_id, n_verts, n_faces, verts_blocks, faces_blocks, surfs_blocks, filepath
+):
+    """!
+    Write FDS bingeom file, block by block, to keep the peak memory bounded.
+    @param n_surf_id: number of referred boundary conditions
+    @param n_verts: number of vertices
+    @param n_faces: number of faces
+    @param verts_blocks: iterable of vertices coordinates blocks in FDS flat format
+    @param faces_blocks: iterable of faces connectivity blocks in FDS flat format
+    @param surfs_blocks: iterable of boundary condition indexes blocks
+    @param filepath: destination filepath
+    """
+    with open(filepath, "wb") as f:
+        _write_record(f, np.array((1,), dtype="int32"))
+        _write_record(f, np.array((n_verts, n_faces, n_surf_id, 0), dtype="int32"))
+        _write_record_blocks(f, "float64", 3 * n_verts, verts_blocks)
+        _write_record_blocks(f, "int32", 3 * n_faces, faces_blocks)
+        _write_record_blocks(f, "int32", n_faces, surfs_blocks)
+        _write_record(f, np.array((), dtype="int32"))
+
+
 # As command line: read, write and compare the results
 if __name__ == "__main__":
     # Check arguments
@@ -0,0 +1,33 @@
+"""!
+BlenderFDS, exceptions.
+"""
+
+# BF specific exception
+
+
+class BFException(Exception):
+    """!
+    Exception raised by BlenderFDS methods in case of an error.
+    """
+
+    def __init__(self, sender, msg):
+        """!
+        Class constructor.
+        @param sender: the object that generates the exception
+        @param msg: exception message
+        """
+        ## The object that generates the exception
+        self.sender = sender
+        ## Exception message
+        self.msg = msg
+
+    def __str__(self):
+        sender = self.sender
+        try:
+            element = sender.element
+            name = "{} > {}".format(
+                element.name, sender.fds_name or sender.__class__.__name__
+            )
+        except:
+            name = getattr(sender, "name", None) or sender.__class__.__name__
+        return "{}: {}".format(name, self.msg)
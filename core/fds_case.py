@@ -0,0 +1,767 @@
+"""!
+BlenderFDS, Python representations of FDS entities, independent from Blender.
+"""
+
+import re, os, sys, logging, multiprocessing, itertools
+from concurrent.futures import ProcessPoolExecutor
+
+from .exceptions import BFException
+
+log = logging.getLogger(__name__)
+
+## Min length of FDS formatted strings for parallel parsing, when requested.
+## Serial parsing takes about 1 s per MB. Workers are spawned, about 0.1 s
+## each, then the parsed namelists are sent back as flat tuples, and
+## their params are unpacked when needed. On a 13 MB case this overhead
+## was 13% of the serial time with 2 workers and 20% with 4, so parallel
+## parsing pays off only with free cores and a few MB of text.
+parallel_min_len = 4000000
+
+
+# Indexes
+#
+# FDSCase indexes its namelists by label and by ID, and FDSNamelist its params
+# by label. The indexed lists reset the index on any change, and label and ID
+# edits are counted, so that stale indexes are rebuilt on the next query.
+# An ID edit is any change of the ID params of an existing namelist,
+# or of their values, that are replaced and not changed in place.
+
+_label_edits = 0  # count of fds_label edits, after construction
+_id_edits = 0  # count of ID edits, after construction
+
+
+def _edit_label():
+    """!
+    Count an fds_label edit, indexes by label and by ID become stale.
+    """
+    global _label_edits
+    _label_edits += 1
+    _edit_id()
+
+
+def _edit_id():
+    """!
+    Count an ID edit, indexes by ID become stale.
+    """
+    global _id_edits
+    _id_edits += 1
+
+
+class _IndexedList(list):
+    """!
+    List that resets the index of its owner on any change.
+    """
+
+    __slots__ = ("_reset",)
+
+    def __init__(self, iterable=(), reset=None):
+        """!
+        Class constructor.
+        @param iterable: the initial items.
+        @param reset: the function resetting the index of the owner.
+        """
+        super().__init__(iterable)
+        self._reset = reset
+
+
+def _get_resetting(name):
+    """!
+    Get a list method that resets the index of the owner.
+    @param name: the method name.
+    @return the method.
+    """
+    method = getattr(list, name)
+
+    def resetting(self, *args, **kwargs):
+        self._reset()
+        return method(self, *args, **kwargs)
+
+    resetting.__name__ = name
+    return resetting
+
+
+for _name in (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "clear",
+    "sort",
+    "reverse",
+):
+    setattr(_IndexedList, _name, _get_resetting(_name))
+
+
+def _get_id(fds_namelist):
+    """!
+    Get the ID of an fds_namelist.
+    @param fds_namelist: FDSNamelist instance.
+    @return None or the ID value.
+    """
+    p = fds_namelist.get_fds_param_by_label("ID")
+    if p and p.values:
+        return p.values[0]
+
+
+# Python representations of FDS entities
+
+
+class FDSParam:
+    """!
+    Python datastructure representing an FDS namelist parameter.
+    """
+
+    def __init__(
+        self, fds_label, values=None, precision=3, exponential=False, msg=None
+    ):
+        """!
+        Class constructor.
+        @param label: namelist parameter label.
+        @param values: list of parameter values of type float, int, str, bool.
+        @param precision: float precision, number of decimal digits.
+        @param exponential: if True sets exponential representation of floats.
+        @param msg: comment message.
+        """
+        self._fds_label = fds_label
+        self._values = values or list()
+        ## float precision, number of decimal digits.
+        self.precision = precision
+        ## if True sets exponential representation of floats.
+        self.exponential = exponential
+        ## comment message.
+        self.msg = msg
+
+    def __str__(self):
+        result = self.to_fds()
+        if len(result) > 80:
+            return result[:37] + " ... " + result[-37:]
+        return result
+
+    @property
+    def fds_label(self):
+        """!
+        Namelist parameter label.
+        """
+        return self._fds_label
+
+    @fds_label.setter
+    def fds_label(self, value):
+        self._fds_label = value
+        _edit_label()
+
+    @property
+    def values(self):
+        """!
+        List of parameter values of type float, int, str, bool.
+        """
+        return self._values
+
+    @values.setter
+    def values(self, value):
+        self._values = value
+        if self._fds_label == "ID":
+            _edit_id()
+
+    @property
+    def formatted_values(self):
+        """!
+        Return the list of FDS formatted values, eg. "'Test1'","'Test2'"
+        """
+        try:
+            v0 = self.values[0]
+        except IndexError:
+            return list()
+        strings = list()
+        if isinstance(v0, float):
+            p = self.precision
+            if self.exponential:
+                strings.extend(f"{round(v,p):.{p}E}" for v in self.values)
+            else:
+                strings.extend(f"{round(v,p):.{p}f}" for v in self.values)
+        elif isinstance(v0, str):
+            strings.extend("'" in v and f'"{v}"' or f"'{v}'" for v in self.values)
+        elif isinstance(v0, bool):  # always before int
+            strings.extend(v and "T" or "F" for v in self.values)
+        elif isinstance(v0, int):
+            strings.extend(str(v) for v in self.values)
+        else:
+            raise ValueError(f"Unknown value type for parameter <{self.fds_label}>")
+        return strings
+
+    _re_decimal = r"\.([0-9]+)"  # decimal positions
+
+    _scan_decimal = re.compile(_re_decimal, re.VERBOSE | re.DOTALL | re.IGNORECASE)
+
+    _re_integer = r"([0-9]*)\.?[0-9]*[eE]"  # integer postions of exp notation
+
+    _scan_integer = re.compile(_re_integer, re.VERBOSE | re.DOTALL | re.IGNORECASE)
+
+    def to_fds(self):
+        """!
+        Return the FDS formatted string.
+        @return FDS formatted string, eg. "ID='Test'"
+        """
+        v = ",".join(self.formatted_values)
+        if not v:
+            return self.fds_label
+        return self.fds_label + "=" + v
+
+    def from_fds(self, f90_values):
+        """!
+        Import from FDS formatted string of values, on error raise BFException.
+        @param f90_values: FDS formatted string of values, eg. "2.34, 1.23, 3.44" or ".TRUE.,.FALSE.".
+        """
+        f90_values += ","  # always return a tuple, eg. "34" -> "34,"
+        # Translate F90 booleans
+        if f90_values[0] == ".":
+            f90_values = (
+                f90_values.upper().replace(".TRUE.", "True").replace(".FALSE.", "False")
+            )
+        elif f90_values[0] in ("T", "F"):
+            f90_values = f90_values.upper().replace("T", "True").replace("F", "False")
+        # Python evaluation of F90 value, after cleaning from \n \r
+        f90_values = " ".join(f90_values.split())
+        try:
+            values = eval(f90_values)
+        except Exception as err:
+            raise BFException(
+                self,
+                f"Parsing error in parameter <{self.fds_label}={f90_values} ... />\n{err}",
+            )
+        self.values = values
+        # Get precision from the first f90 float value
+        if isinstance(values[0], float):
+            match = re.findall(self._re_decimal, f90_values)
+            if match:
+                self.precision = max(len(m) for m in match)
+            else:
+                self.precision = 1
+            # Exp notation?
+            match = re.findall(self._re_integer, f90_values)
+            if match:
+                self.exponential = True
+                self.precision += max(len(m) for m in match) - 1
+
+
+class FDSNamelist:
+    """!
+    Python datastructure representing an FDS namelist.
+    """
+
+    ## max number of columns of formatted output
+    maxlen = 80  # TODO to config
+
+    def __init__(self, fds_label, fds_params=None, msg=None):
+        """!
+        Class constructor.
+        @param fds_label: namelist group label.
+        @param fds_params: list of FDSParam instances.
+                Can contain one and only one list of lists of FDSParam instances
+                to represent multiple params: (("ID=X1", "PBX=1"), ("ID=X2", "PBX=2"), ...).
+        @param msg: comment message.
+        """
+        self._fds_label = fds_label
+        # Index of single FDSParam instances by label, built when needed
+        self._fds_params_by_label = None
+        self._label_edits = 0  # label edits when indexed
+        self._packed_fds_params = None  # from worker processes, unpacked when needed
+        self._fds_params = _IndexedList(fds_params or (), self._edit_params)
+        ## comment message
+        self.msg = msg
+        ## original FDS formatted string, when imported and requested
+        self.f90 = None
+
+    def __str__(self):
+        return self.to_fds()
+
+    @property
+    def fds_label(self):
+        """!
+        Namelist group label.
+        """
+        return self._fds_label
+
+    @fds_label.setter
+    def fds_label(self, value):
+        self._fds_label = value
+        _edit_label()
+
+    @property
+    def fds_params(self):
+        """!
+        List of FDSParam instances, the index is reset on any change.
+        """
+        if self._packed_fds_params:
+            data, self._packed_fds_params = self._packed_fds_params, None
+            self._fds_params = _IndexedList(
+                (
+                    FDSParam(fds_label=l, values=v, precision=pr, exponential=e)
+                    for l, v, pr, e in zip(*(iter(data[2:]),) * 4)
+                ),
+                self._edit_params,
+            )
+        return self._fds_params
+
+    @fds_params.setter
+    def fds_params(self, value):
+        self._packed_fds_params = None
+        self._fds_params = _IndexedList(value, self._edit_params)
+        self._edit_params()
+
+    def _edit_params(self):
+        """!
+        Reset the index of fds_params by label, and count an ID edit.
+        """
+        self._reset_index()
+        _edit_id()
+
+    def _reset_index(self):
+        """!
+        Reset the index of fds_params by label.
+        """
+        self._fds_params_by_label = None
+
+    def to_tuple(self):
+        """!
+        Return the compact serialized form, for passing between processes.
+        @return flat tuple (fds_label, f90 or None, fds_label, values, precision, exponential, ...).
+        """
+        data = [self.fds_label, self.f90]
+        for p in self.fds_params:
+            data.extend((p.fds_label, p.values, p.precision, p.exponential))
+        return tuple(data)
+
+    @classmethod
+    def from_tuple(cls, data):
+        """!
+        Return a new instance from its compact serialized form.
+        Its fds_params are unpacked when first needed.
+        @param data: flat tuple, as returned by to_tuple().
+        @return FDSNamelist.
+        """
+        nl = cls.__new__(cls)  # lightweight, as there can be millions
+        nl._fds_label, nl.f90, nl.msg = data[0], data[1], None
+        nl._fds_params_by_label, nl._label_edits = None, 0
+        nl._fds_params, nl._packed_fds_params = None, data
+        return nl
+
+    def _get_index(self):
+        """!
+        Return the index of fds_params by label, rebuild it if stale.
+        @return dict {fds_label: FDSParam}, first param by label.
+        """
+        if self._fds_params_by_label is None or self._label_edits != _label_edits:
+            self._fds_params_by_label = dict()
+            for p in self.fds_params:
+                if isinstance(p, FDSParam):
+                    self._fds_params_by_label.setdefault(p.fds_label, p)
+            self._label_edits = _label_edits
+        return self._fds_params_by_label
+
+    def get_fds_param_by_label(self, fds_label) -> "FDSParam or None":
+        """!
+        Return the fds_param by its label.
+        @param fds_label: namelist parameter label.
+        @return None or FDSParam.
+        """
+        return self._get_index().get(fds_label)
+
+    def append_fds_param(self, fds_param):
+        """!
+        Append an fds_param and update the index.
+        @param fds_param: FDSParam instance.
+        """
+        index = self._get_index()
+        list.append(self.fds_params, fds_param)  # no index reset
+        if isinstance(fds_param, FDSParam):
+            index.setdefault(fds_param.fds_label, fds_param)
+            if fds_param.fds_label == "ID":
+                _edit_id()
+
+    def remove_fds_param(self, fds_param):
+        """!
+        Remove an fds_param and update the index.
+        @param fds_param: FDSParam instance.
+        """
+        index = self._get_index()
+        list.remove(self.fds_params, fds_param)  # no index reset
+        label = getattr(fds_param, "fds_label", None)
+        if label == "ID":
+            _edit_id()
+        if index.get(label) is fds_param:
+            del index[label]
+            for p in self.fds_params:  # next with the same label, if any
+                if isinstance(p, FDSParam) and p.fds_label == label:
+                    index[label] = p
+                    break
+
+    def to_fds(self):
+        """!
+        Return the FDS formatted string.
+        @return FDS formatted string, eg. "&OBST ID='Test' /".
+        """
+        # Mix parameters
+        invps = list()  # invariant parameters
+        multips = list()  # multi parameters
+        msgs = list((self.msg,))  # messages
+        for p in self.fds_params:
+            # Empty
+            if p is None:  # Protect from None
+                continue
+            # Invariant
+            elif isinstance(p, FDSParam):  # single
+                invps.append(p)
+                msgs.append(p.msg)
+            elif isinstance(p, tuple):  # many or multi
+                if isinstance(p[0], FDSParam):  # many
+                    invps.extend(p)
+                    msgs.extend(pi.msg for pi in p)
+                elif isinstance(p[0], tuple):  # multi
+                    multips = p
+                    msgs.extend(
+                        p0.msg for p0 in multips[0]
+                    )  # msg only from first many of multi
+            else:
+                raise ValueError(f"Unrecognized type of <{p}>")
+        # Treat invariant, many and multi parameters
+        # nl = FDSParam, FDSParam, ...
+        nls = list()  # list of nl
+        if multips:
+            # Remove ID parameter, as multi embeds a new indexed ID.
+            for i, p in enumerate(invps):
+                if p.fds_label == "ID":
+                    invps.pop(i)
+                    break
+            # Add nl with one of multips + invps
+            for multip in multips:
+                nl = list(multip)
+                nl.extend(invps)
+                nls.append(nl)
+        else:
+            nls.append(invps)
+        # Prepare strings
+        lines = list(f"! {m}" for m in msgs if m)  # all messages
+        for nl in nls:
+            newline = False
+            line = "&" + self.fds_label
+            for p in nl:
+                label = p.fds_label
+                vs = p.formatted_values  # list of str
+                if not vs:  # no values
+                    if not newline and len(line) + 1 + len(label) <= self.maxlen:
+                        # Parameter to the same line
+                        newline = False
+                        line += " " + label
+                    else:
+                        # Parameter to new line
+                        lines.append(line)
+                        line = "      " + label  # new line
+                else:  # values
+                    v = ",".join(vs)  # values str
+                    if (
+                        not newline
+                        and len(line) + 1 + len(label) + 1 + len(v) <= self.maxlen
+                    ):
+                        # Parameter to the same line
+                        newline = False
+                        line += " " + label + "=" + v
+                    else:
+                        # Parameter to new line
+                        lines.append(line)
+                        line = "      " + label + "="  # new line
+                        if len(line) + len(v) <= self.maxlen:
+                            # Values do not need splitting
+                            line += v
+                        else:
+                            # Values need splitting
+                            newline = True  # the following needs a new line
+                            for v in vs:
+                                if len(line) + len(v) + 1 <= self.maxlen:
+                                    line += v + ","
+                                else:
+                                    lines.append(line)
+                                    line = "        " + v + ","  # new line
+                            line = line[:-1]  # remove last ","
+            line += " /"
+            lines.append(line)
+        return "\n".join(lines)
+
+    _re_label = r"([A-Z][A-Z0-9_\(\):,]*?)"  # param label w indexes
+    _re_space = r"[\s\t]*"  # zero or more spaces
+    _re_sep = r"[,\s\t]+"  # one or more separators
+    _re_end = r"[,\s\t]*/"  # zero or more separators + "/"
+    _re_values = (
+        r"(.+?)"  # one or more of any char, not greedy
+        + r"(?="  # end previous match when
+        + _re_sep
+        + _re_label  # either a new label
+        + _re_space
+        + "="  # followed by an equal sign
+        + "|"  # or
+        + _re_end  # the end of the namelist
+        + ")"
+    )
+    _re_param = (
+        _re_label + _re_space + "=" + _re_space + _re_values
+    )  # groups: label, vals
+
+    _scan = re.compile(
+        _re_param, re.VERBOSE | re.DOTALL | re.IGNORECASE
+    )  # no MULTILINE, so that $ is the end of the file
+
+    def from_fds(self, f90_params, keep_f90=False):  # TODO change signature
+        """!
+        Import from FDS formatted string of parameters, on error raise BFException.
+        @param f90_params: FDS formatted string of parameters, eg. "ID='Test' PROP=2.34, 1.23, 3.44".
+        @param keep_f90: if True, keep the original string in self.f90, eg. for proxies.
+        """
+        end = 0
+        if re.match(self._re_end, f90_params):  # no params, eg. "&TAIL /"
+            if keep_f90:
+                self.f90 = f"&{self.fds_label}{f90_params[:f90_params.find('/') + 1]}"
+            return
+        for match in re.finditer(self._scan, f90_params):
+            label, f90_values, following_label = match.groups()
+            p = FDSParam(fds_label=label)
+            p.from_fds(f90_values=f90_values)
+            self.append_fds_param(p)
+            end = match.end()
+            if following_label is None:
+                break
+        # Keep the original string, up to the closing "/"
+        if keep_f90:
+            end = f90_params.find("/", end) + 1
+            self.f90 = f"&{self.fds_label}{f90_params[:end]}"
+
+
+class FDSCase:
+    """!
+    Python datastructure representing an FDS case.
+    """
+
+    def __init__(self, fds_namelists=None):
+        """!
+        Class constructor.
+        @param fds_namelists: list of FDSNamelist instances.
+        """
+        # Indexes of fds_namelists by label and by ID, built when needed
+        self._fds_namelists_by_label = None
+        self._label_edits = 0  # label edits when indexed
+        self._fds_namelists_by_id = None
+        self._id_edits = 0  # ID edits when indexed
+        self.fds_namelists = fds_namelists or list()
+
+    def __str__(self):
+        return self.to_fds()
+
+    @property
+    def fds_namelists(self):
+        """!
+        List of FDSNamelist instances, the index is reset on any change.
+        """
+        return self._fds_namelists
+
+    @fds_namelists.setter
+    def fds_namelists(self, value):
+        self._fds_namelists = _IndexedList(value, self._reset_index)
+        self._reset_index()
+
+    def _reset_index(self):
+        """!
+        Reset the indexes of fds_namelists by label and by ID.
+        """
+        self._fds_namelists_by_label = None
+        self._fds_namelists_by_id = None
+
+    def _get_index(self):
+        """!
+        Return the index of fds_namelists by label, rebuild it if stale.
+        @return dict {fds_label: [FDSNamelist, ...]}.
+        """
+        if self._fds_namelists_by_label is None or self._label_edits != _label_edits:
+            index = self._fds_namelists_by_label = dict()
+            for n in self._fds_namelists:
+                if n is not None:
+                    index.setdefault(n.fds_label, list()).append(n)
+            self._label_edits = _label_edits
+        return self._fds_namelists_by_label
+
+    def get_fds_namelists_by_label(self, label):
+        """!
+        Return the tuple of fds_namelists by their label.
+        @param label: namelist parameter label.
+        @return tuple of fds namelists.
+        """
+        return tuple(self._get_index().get(label, ()))
+
+    def _get_id_index(self):
+        """!
+        Return the index of fds_namelists by ID, rebuild it if stale.
+        @return dict {ID: FDSNamelist}, first namelist by ID.
+        """
+        if self._fds_namelists_by_id is None or self._id_edits != _id_edits:
+            index = self._fds_namelists_by_id = dict()
+            for n in self._fds_namelists:
+                hid = n is not None and _get_id(n)
+                if hid:
+                    index.setdefault(hid, n)
+            self._id_edits = _id_edits
+        return self._fds_namelists_by_id
+
+    def get_fds_namelist_by_id(self, hid):
+        """!
+        Return the first fds_namelist by its ID.
+        @param hid: namelist ID.
+        @return None or FDSNamelist.
+        """
+        return self._get_id_index().get(hid)
+
+    def append_fds_namelist(self, fds_namelist):
+        """!
+        Append an fds_namelist and update the indexes.
+        @param fds_namelist: FDSNamelist instance.
+        """
+        index = self._get_index()
+        list.append(self._fds_namelists, fds_namelist)  # no index reset
+        index.setdefault(fds_namelist.fds_label, list()).append(fds_namelist)
+        if self._fds_namelists_by_id is not None and self._id_edits == _id_edits:
+            hid = _get_id(fds_namelist)
+            if hid:
+                self._fds_namelists_by_id.setdefault(hid, fds_namelist)
+
+    def remove_fds_namelist(self, fds_namelist):
+        """!
+        Remove an fds_namelist and update the indexes.
+        @param fds_namelist: FDSNamelist instance.
+        """
+        index = self._get_index()
+        list.remove(self._fds_namelists, fds_namelist)  # no index reset
+        index[fds_namelist.fds_label].remove(fds_namelist)
+        hid = _get_id(fds_namelist)
+        if hid and self._fds_namelists_by_id:
+            if self._fds_namelists_by_id.get(hid) is fds_namelist:
+                self._fds_namelists_by_id = None  # rebuilt, another may have hid
+
+    def to_fds(self):
+        """!
+        Return the FDS formatted string.
+        @return FDS formatted string, eg. "&OBST ID='Test' /\n&TAIL /".
+        """
+        return "\n".join(
+            n.to_fds() for n in self.fds_namelists if n is not None
+        )  # Protect None
+
+    _scan = re.compile(
+        r"""
+        (?:^&)             # & at the beginning
+        ([A-Z]+[A-Z0-9]*)  # namelist label
+        """,
+        re.VERBOSE | re.DOTALL | re.IGNORECASE | re.MULTILINE,
+    )  # MULTILINE, so that ^ is the beginning of each line
+
+    def from_fds(self, f90_namelists, reset=True, max_workers=1, keep_f90=False):
+        """!
+        Import from FDS formatted string of namelists, on error raise BFException.
+        If requested, long strings are split at namelist boundaries
+        and parsed by spawned worker processes, eg. by the Blender import operator,
+        or by scripts that must then guard their main code with if __name__ == "__main__".
+        @param f90_namelists: FDS formatted string of namelists, eg. "&OBST ID='Test' /\n&TAIL /".
+        @param reset: if True, reset self.fds_namelists to empty list before importing.
+        @param max_workers: max number of worker processes, if None the cpu count, if 1 no workers.
+        @param keep_f90: if True, keep the original string of each namelist, eg. for proxies.
+        """
+        if reset:
+            self.fds_namelists = list()
+        # First pass, get the namelist boundaries
+        matches = list(re.finditer(self._scan, f90_namelists))
+        # Parallel parsing
+        max_workers = max_workers or os.cpu_count() or 1
+        if (
+            max_workers > 1
+            and len(f90_namelists) >= parallel_min_len
+            and len(matches) > 1
+        ):
+            try:
+                fds_namelists = self._from_fds_parallel(
+                    f90_namelists, matches, max_workers, keep_f90
+                )
+            except BFException:
+                raise
+            except Exception as err:
+                log.warning(f"Parallel parsing not available, {err}")
+            else:
+                self.fds_namelists.extend(fds_namelists)
+                return
+        # Serial parsing, each namelist up to the next one
+        ends = list(m.start() for m in matches[1:])
+        ends.append(len(f90_namelists))
+        for match, end in zip(matches, ends):
+            nl = FDSNamelist(fds_label=match.groups()[0])
+            nl.from_fds(f90_params=f90_namelists[match.end() : end], keep_f90=keep_f90)
+            self.append_fds_namelist(nl)
+
+    def _from_fds_parallel(self, f90_namelists, matches, max_workers, keep_f90):
+        """!
+        Parse FDS formatted string of namelists in chunks by worker processes.
+        @param f90_namelists: FDS formatted string of namelists.
+        @param matches: the namelist boundary matches.
+        @param max_workers: max number of worker processes.
+        @param keep_f90: if True, keep the original string of each namelist.
+        @return the list of FDSNamelist, in order.
+        """
+        mp_context = _get_mp_context()
+        if mp_context is None:
+            raise RuntimeError("no suitable process start method")
+        # Split at namelist boundaries, in about 4 chunks per worker
+        size = len(f90_namelists) // (max_workers * 4) + 1
+        bounds = [0]
+        for m in matches[1:]:
+            if m.start() - bounds[-1] >= size:
+                bounds.append(m.start())
+        bounds.append(len(f90_namelists))
+        chunks = (f90_namelists[b0:b1] for b0, b1 in zip(bounds, bounds[1:]))
+        log.debug(f"Parsing <{len(bounds) - 1}> chunks by <{max_workers}> workers")
+        # Parse and merge in order, the params are unpacked when needed
+        fds_namelists = list()
+        with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=mp_context
+        ) as executor:
+            for result in executor.map(
+                _parse_chunk, chunks, itertools.repeat(keep_f90)
+            ):
+                if isinstance(result, str):  # error msg
+                    raise BFException(self, result)
+                fds_namelists.extend(FDSNamelist.from_tuple(data) for data in result)
+        return fds_namelists
+
+
+def _get_mp_context():
+    """!
+    Get the multiprocessing context for the parsing workers.
+    Workers are spawned, as forking a multithreaded process like Blender
+    can deadlock. Spawning needs a Python interpreter, that old Blender
+    versions do not expose as sys.executable.
+    @return the multiprocessing context, or None if not available.
+    """
+    if os.path.basename(sys.executable).lower().startswith("python"):
+        return multiprocessing.get_context("spawn")
+
+
+def _parse_chunk(f90_namelists, keep_f90):
+    """!
+    Parse a chunk of FDS formatted namelists, run by the worker processes.
+    @param f90_namelists: FDS formatted string of whole namelists.
+    @param keep_f90: if True, keep the original string of each namelist.
+    @return tuple of serialized namelists, or the error message.
+    """
+    fds_case = FDSCase()
+    try:
+        fds_case.from_fds(f90_namelists, max_workers=1, keep_f90=keep_f90)
+    except BFException as err:
+        return str(err)
+    return tuple(nl.to_tuple() for nl in fds_case.fds_namelists)
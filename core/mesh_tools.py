@@ -0,0 +1,1253 @@
+"""!
+BlenderFDS, FDS MESH tools.
+"""
+
+from collections import deque
+from bisect import bisect_left, bisect_right
+from math import floor, ceil
+from itertools import product
+
+# Mesh alignment:
+#
+# Before:
+#   |   |rcs|   |   | ri  ref mesh
+#   ·---·---·---·---·
+#  rx0   <-rl->    rx1
+# mx0      <-ml->      mx1
+#  ·------·------·------·
+#  |      | mcs  |      | mi  other mesh
+# ---> axis
+
+# Either protect rl or rcs.
+# Instead ml and mcs are changed for alignment.
+
+# After:
+#  |   |   |   |   |
+#  ·---·---·---·---·-------·
+#  |       |       |       |
+
+# Not allowed:
+#  |    |     |    |
+#  ·----·--·--·----·
+#  |       |       |
+
+#  |   |   |   |
+#  ·---·---·---·---·
+#  |       |       |
+
+
+# Good numbers for the FDS Poisson solver, in the form 2^a·3^b·5^c,
+# precomputed and sorted up to a bound well above any MESH cell count
+
+_poisson_max_n = 2 ** 31
+
+
+def _calc_poisson_ns(max_n):
+    """!
+    Calc the sorted good numbers for the Poisson solver up to max_n.
+    @param max_n: the upper bound.
+    @return the sorted list of good numbers.
+    """
+    ns = list()
+    n2 = 1
+    while n2 <= max_n:
+        n3 = n2
+        while n3 <= max_n:
+            n5 = n3
+            while n5 <= max_n:
+                ns.append(n5)
+                n5 *= 5
+            n3 *= 3
+        n2 *= 2
+    return sorted(ns)
+
+
+_poisson_ns = _calc_poisson_ns(_poisson_max_n)
+
+
+def get_poisson_n_above(n):
+    """!
+    Get the nearest good number for the Poisson solver, equal or bigger than n.
+    @param n: the number.
+    @return the good number.
+    """
+    if n < 1:
+        return n
+    try:
+        return _poisson_ns[bisect_left(_poisson_ns, n)]
+    except IndexError:
+        raise ValueError(f"Number too big for the Poisson solver: {n}")
+
+
+def get_poisson_n_below(n):
+    """!
+    Get the nearest good number for the Poisson solver, equal or smaller than n.
+    @param n: the number.
+    @return the good number.
+    """
+    if n < 1:
+        return n
+    return _poisson_ns[bisect_right(_poisson_ns, n) - 1]
+
+
+def is_poisson_n(n):
+    """!
+    Check if n is a good number for the Poisson solver.
+    @param n: the number.
+    @return True if n is good.
+    """
+    return n >= 1 and get_poisson_n_above(n) == n
+
+
+def _align_along_axis(ri, rx0, rx1, mi, mx0, mx1, poisson=False, protect_rl=False):
+    """!Align coarse MESH to fixed ref MESH along an axis."""
+    # Init
+    assert rx0 < rx1 and mx0 < mx1  # coordinate order
+    rl, ml = rx1 - rx0, mx1 - mx0  # lengths
+    rcs, mcs = rl / ri, ml / mi  # cell sizes
+    # Coarsening ratio
+    assert mcs / rcs > 0.501  # same or coarser allowed, protect from float err
+    n = round(mcs / rcs)
+    # Set ref cell count multiple of n
+    # to allow full cover of coarse cells by ref cells
+    ri = round(ri / n) * n
+    if poisson:
+        ri = get_poisson_n_above(ri)
+    if protect_rl:  # protect ref length
+        rcs = rl / ri  # reduce ref cell size
+    else:
+        rl = rcs * ri  # extend ref length due to updated ri
+        rx1 = rx0 + rl
+    # Calc new coarse cell size from ref cell size
+    mcs = rcs * n
+    # Calc new coarse cell count,
+    # trying to keep ml as close as possible to the original
+    mi = round(ml / mcs)
+    if poisson:
+        mi = get_poisson_n_above(mi)
+    # Align coarse mesh positions to the ref mesh
+    mx0 = rx0 + round((mx0 - rx0) / mcs) * mcs
+    ml = mcs * mi  # extend other mesh due to updated mi
+    mx1 = mx0 + ml
+    return ri, rx0, rx1, mi, mx0, mx1
+
+
+def _align_along_x(rijk, rxbs, mijk, mxbs, poisson=False, protect_rl=False):
+    """!Align coarse MESH to fixed ref MESH along axis x."""
+    rijk[0], rxbs[0], rxbs[1], mijk[0], mxbs[0], mxbs[1] = _align_along_axis(
+        ri=rijk[0],
+        rx0=rxbs[0],
+        rx1=rxbs[1],
+        mi=mijk[0],
+        mx0=mxbs[0],
+        mx1=mxbs[1],
+        poisson=False,  # not needed along x
+        protect_rl=protect_rl,
+    )
+
+
+def _align_along_y(rijk, rxbs, mijk, mxbs, poisson=False, protect_rl=False):
+    """!Align coarse MESH to fixed ref MESH along axis y."""
+    rijk[1], rxbs[2], rxbs[3], mijk[1], mxbs[2], mxbs[3] = _align_along_axis(
+        ri=rijk[1],
+        rx0=rxbs[2],
+        rx1=rxbs[3],
+        mi=mijk[1],
+        mx0=mxbs[2],
+        mx1=mxbs[3],
+        poisson=poisson,  # needed along y
+        protect_rl=protect_rl,
+    )
+
+
+def _align_along_z(rijk, rxbs, mijk, mxbs, poisson=False, protect_rl=False):
+    """!Align coarse MESH to fixed ref MESH along axis z."""
+    rijk[2], rxbs[4], rxbs[5], mijk[2], mxbs[4], mxbs[5] = _align_along_axis(
+        ri=rijk[2],
+        rx0=rxbs[4],
+        rx1=rxbs[5],
+        mi=mijk[2],
+        mx0=mxbs[4],
+        mx1=mxbs[5],
+        poisson=poisson,  # needed along z
+        protect_rl=protect_rl,
+    )
+
+
+# rx0 rx1
+#  .---.
+#       delta .----.
+#            mx0  mx1
+
+
+def _is_far(rxbs, mxbs, deltas):
+    return (
+        rxbs[0] - mxbs[1] > deltas[0]
+        or mxbs[0] - rxbs[1] > deltas[0]  # x
+        or rxbs[2] - mxbs[3] > deltas[1]
+        or mxbs[2] - rxbs[3] > deltas[1]  # y
+        or rxbs[4] - mxbs[5] > deltas[2]
+        or mxbs[4] - rxbs[5] > deltas[2]  # z
+    )
+
+
+def align_meshes(rijk, rxbs, mijk, mxbs, poisson=False, protect_rl=False):
+    """!
+    Function to align meshes.
+    @param rijk:  ijk of the ref mesh.
+    @param rxbs: xbs of the ref mesh.
+    @param mijk: ijk of the other mesh.
+    @param mxbs: xbs of the other mesh.
+    @param poisson: True for respecting the Poisson constraint.
+    @param protect_rl: True to protect ref length.
+    @return return new rijk, rxbs, mijk and mxbs.
+    """
+    # Init
+    deltas = (  # rcs
+        abs(rxbs[0] - rxbs[1]) / rijk[0],
+        abs(rxbs[2] - rxbs[3]) / rijk[1],
+        abs(rxbs[4] - rxbs[5]) / rijk[2],
+    )
+    msgs = list()
+    # Are meshes far apart?
+    if _is_far(rxbs=rxbs, mxbs=mxbs, deltas=deltas):
+        msgs.append("Far apart, alignment not needed")
+        return rijk, rxbs, mijk, mxbs, msgs
+    else:
+        msgs.append("Close enough, alignment needed")
+    if protect_rl:
+        msgs.append("Ref MESH cell size updated, Object size untouched")
+    else:
+        msgs.append("Ref MESH size updated, cell size untouched")
+    # If mesh sides are close, then snap them
+    # otherwise align their meshes
+    if abs(rxbs[0] - mxbs[1]) <= deltas[0]:  # -x close?
+        msgs.append(f"Close enough at ref x0, snapped")
+        mxbs[1] = rxbs[0]
+    elif abs(mxbs[0] - rxbs[1]) <= deltas[0]:  # +x close?
+        msgs.append(f"Close enough at ref x1, snapped")
+        mxbs[0] = rxbs[1]
+    else:
+        msgs.append("Aligned along x axis")
+        _align_along_x(rijk, rxbs, mijk, mxbs, poisson, protect_rl)
+    if abs(rxbs[2] - mxbs[3]) <= deltas[1]:  # -y close?
+        msgs.append(f"Close enough at ref y0, snapped")
+        mxbs[3] = rxbs[2]
+    elif abs(mxbs[2] - rxbs[3]) <= deltas[1]:  # +y close?
+        msgs.append(f"Close enough at ref y1, snapped")
+        mxbs[2] = rxbs[3]
+    else:
+        msgs.append("Aligned along y axis")
+        _align_along_y(rijk, rxbs, mijk, mxbs, poisson, protect_rl)
+    if abs(rxbs[4] - mxbs[5]) <= deltas[2]:  # -z close?
+        msgs.append(f"Close enough at ref z0, snapped")
+        mxbs[5] = rxbs[4]
+    elif abs(mxbs[4] - rxbs[5]) <= deltas[2]:  # +z close?
+        msgs.append(f"Close enough at ref z1, snapped")
+        mxbs[4] = rxbs[5]
+    else:
+        msgs.append("Aligned along z axis")
+        _align_along_z(rijk, rxbs, mijk, mxbs, poisson, protect_rl)
+    return rijk, rxbs, mijk, mxbs, msgs
+
+
+def calc_poisson_ijk(ijk):
+    """!
+    Get an IJK respecting the Poisson constraint, close to the current one.
+    @param ijk: ijk of the mesh.
+    @return return new ijk values.
+    """
+    return ijk[0], get_poisson_n_above(ijk[1]), get_poisson_n_above(ijk[2])
+
+
+def calc_cell_sizes(ijk, xbs):
+    """!
+    Calc MESH cell sizes.
+    @param ijk: ijk of the mesh.
+    @param xbs: xbs of the mesh.
+    @return return the MESH cell sizes.
+    """
+    return (
+        (xbs[1] - xbs[0]) / ijk[0],
+        (xbs[3] - xbs[2]) / ijk[1],
+        (xbs[5] - xbs[4]) / ijk[2],
+    )
+
+
+def calc_ijk(xbs, desired_cs, poisson):
+    """!
+    Calc MESH IJK from cell sizes.
+    @param xbs: xbs of the mesh.
+    @param desired_cs: desired cell sizes.
+    @param poisson: True for respecting the Poisson constraint.
+    @return return the MESH IJK from cell sizes.
+    """
+    ijk = (
+        round((xbs[1] - xbs[0]) / desired_cs[0]) or 1,
+        round((xbs[3] - xbs[2]) / desired_cs[1]) or 1,
+        round((xbs[5] - xbs[4]) / desired_cs[2]) or 1,
+    )
+    if poisson:
+        return calc_poisson_ijk(ijk)
+    else:
+        return ijk
+
+
+def calc_cell_infos(ijk, xbs):
+    """!
+    Calc many cell infos: cell ijk goodness, sizes, count and aspect ratio.
+    @param ijk: ijk of the mesh.
+    @param xbs: xbs of the mesh.
+    @return return if cell infos.
+    """
+    cs = calc_cell_sizes(ijk, xbs)
+    has_good_ijk = is_poisson_n(ijk[1]) and is_poisson_n(ijk[2])
+    cell_count = ijk[0] * ijk[1] * ijk[2]
+    cell_sizes_sorted = sorted(cs)
+    try:
+        cell_aspect_ratio = max(
+            cell_sizes_sorted[2] / cell_sizes_sorted[0],
+            cell_sizes_sorted[2] / cell_sizes_sorted[1],
+            cell_sizes_sorted[1] / cell_sizes_sorted[0],
+        )
+    except ZeroDivisionError:
+        cell_aspect_ratio = 999.0
+    # Return
+    return has_good_ijk, cs, cell_count, cell_aspect_ratio
+
+
+def _split_cells(n_cells, n_parts):
+    """!
+    Split a cell count in integer parts, as equal as possible.
+    @param n_cells: the cell count.
+    @param n_parts: the number of parts.
+    @return the list of part cell counts.
+    """
+    q, r = divmod(n_cells, n_parts)
+    return [q + 1] * r + [q] * (n_parts - r)
+
+
+def _split_poisson_cells(n_cells, n_parts):
+    """!
+    Split a cell count in parts with good cell counts for the Poisson solver,
+    as equal as possible, by dynamic programming on the partial sums.
+    @param n_cells: the cell count.
+    @param n_parts: the number of parts.
+    @return the list of part cell counts, or None if impossible.
+    """
+    mean = n_cells / n_parts
+    lo, hi = bisect_left(_poisson_ns, mean / 2), bisect_right(_poisson_ns, 2 * mean)
+    candidates = _poisson_ns[lo:hi]
+    if not candidates:
+        return None
+    # {partial sum: (cost, part cell counts)}, cost is the squared deviation
+    best = {0: (0.0, ())}
+    for i in range(n_parts, 0, -1):  # i parts left
+        # Partial sums that can still reach n_cells
+        t_min = n_cells - (i - 1) * candidates[-1]
+        t_max = n_cells - (i - 1) * candidates[0]
+        new_best = dict()
+        for s, (cost, parts) in best.items():
+            for c in candidates:
+                t = s + c
+                if t > t_max:
+                    break
+                if t < t_min:
+                    continue
+                new_cost = cost + (c - mean) ** 2
+                if t not in new_best or new_cost < new_best[t][0]:
+                    new_best[t] = new_cost, parts + (c,)
+        best = new_best
+    if n_cells in best:
+        return sorted(best[n_cells][1], reverse=True)
+
+
+def _get_split_counts(ijk, xbs, n):
+    """!
+    Choose the number of sub-meshes along each axis, preferring near-cubic blocks.
+    @param ijk: the ijk of the mesh.
+    @param xbs: the xbs of the mesh.
+    @param n: the total number of sub-meshes.
+    @return the number of sub-meshes along x, y, z, or None if impossible.
+    """
+    best, best_score = None, None
+    for nx in range(1, n + 1):
+        if n % nx:
+            continue
+        for ny in range(1, n // nx + 1):
+            if (n // nx) % ny:
+                continue
+            ns = nx, ny, n // nx // ny
+            if any(ns[a] > ijk[a] for a in range(3)):
+                continue  # less than a cell per sub-mesh
+            lengths = tuple((xbs[a * 2 + 1] - xbs[a * 2]) / ns[a] for a in range(3))
+            score = max(lengths) / min(lengths)  # block aspect ratio
+            if best_score is None or score < best_score:
+                best, best_score = ns, score
+    return best
+
+
+def split_mesh(ijk, xbs, n=None, max_cells=None, poisson=False):
+    """!
+    Split a mesh into sub-meshes, aligned to its cell boundaries.
+    The number of sub-meshes is either n, or the smallest one
+    with max_cells cells at most in each sub-mesh.
+    With the Poisson constraint, the sub-meshes along y and z have
+    good cell counts that add up to the mesh ones. If impossible,
+    they have the same good cell count, and the mesh is slightly extended.
+    @param ijk: the ijk of the mesh.
+    @param xbs: the xbs of the mesh.
+    @param n: the requested number of sub-meshes.
+    @param max_cells: the requested max number of cells per sub-mesh, if n is None.
+    @param poisson: True for respecting the Poisson constraint.
+    @return the list of (ijk, xbs) of the sub-meshes, and the list of messages.
+    """
+    if n is None:
+        if not max_cells:
+            raise ValueError("Either n or max_cells required")
+        n = max(1, -(-ijk[0] * ijk[1] * ijk[2] // max_cells))  # ceil
+    cs = calc_cell_sizes(ijk, xbs)
+    for n in range(n, n + 64):  # increase n if max_cells not respected
+        ns = _get_split_counts(ijk, xbs, n)
+        if ns is None:
+            if max_cells:
+                continue
+            raise ValueError(f"Cannot split MESH in {n} parts")
+        # Cell counts of the parts along each axis
+        parts, msgs = list(), list()
+        for a in range(3):
+            if poisson and a > 0 and ns[a] > 1:  # Poisson needed along y, z
+                ps = _split_poisson_cells(ijk[a], ns[a])
+                if ps is None:  # extend the mesh
+                    ni = get_poisson_n_above(-(-ijk[a] // ns[a]))
+                    ps = [ni] * ns[a]
+                    msgs.append(
+                        f"MESH extended by {ni * ns[a] - ijk[a]} cells along {'xyz'[a]} axis"
+                    )
+                parts.append(ps)
+            else:
+                parts.append(_split_cells(ijk[a], ns[a]))
+        if max_cells and max(parts[0]) * max(parts[1]) * max(parts[2]) > max_cells:
+            continue
+        break
+    else:
+        raise ValueError(f"Cannot split MESH in parts with {max_cells} cells at most")
+    # Sub-mesh boundaries, at cell boundaries
+    bounds = list()
+    for a in range(3):
+        cells, bs = 0, [xbs[a * 2]]
+        for ni in parts[a]:
+            cells += ni
+            bs.append(xbs[a * 2] + cells * cs[a])
+        bounds.append(bs)
+    # Sub-meshes
+    meshes = list()
+    for i, ni in enumerate(parts[0]):
+        for j, nj in enumerate(parts[1]):
+            for k, nk in enumerate(parts[2]):
+                meshes.append(
+                    (
+                        (ni, nj, nk),
+                        (
+                            bounds[0][i],
+                            bounds[0][i + 1],
+                            bounds[1][j],
+                            bounds[1][j + 1],
+                            bounds[2][k],
+                            bounds[2][k + 1],
+                        ),
+                    )
+                )
+    msgs.insert(0, f"MESH split in {ns[0]}x{ns[1]}x{ns[2]} sub-meshes")
+    return meshes, msgs
+
+
+# Spatial index of boxes
+
+
+def _overlap(xb0, xb1, tolerance=0.0):
+    """!
+    Check if two boxes overlap, more than tolerance along each axis.
+    @param xb0: the first box (x0, x1, y0, y1, z0, z1).
+    @param xb1: the second box.
+    @param tolerance: the tolerance, negative values include touching boxes.
+    @return True if boxes overlap.
+    """
+    return (
+        xb0[0] < xb1[1] - tolerance
+        and xb1[0] < xb0[1] - tolerance
+        and xb0[2] < xb1[3] - tolerance
+        and xb1[2] < xb0[3] - tolerance
+        and xb0[4] < xb1[5] - tolerance
+        and xb1[4] < xb0[5] - tolerance
+    )
+
+
+class BoxIndex:
+    """!
+    Uniform grid spatial index of axis aligned boxes, eg. MESH xbs.
+    Queries are near constant time for boxes of similar size.
+    With very mixed sizes, large boxes span many bins and small ones
+    crowd the same bins, so queries degrade towards linear time.
+    """
+
+    def __init__(self, xbs, bin_size=None):
+        """!
+        Class constructor.
+        @param xbs: the indexed boxes ((x0, x1, y0, y1, z0, z1), ...).
+        @param bin_size: the grid bin size, if None the mean box size.
+        """
+        ## Indexed boxes
+        self.xbs = list(xbs)
+        if not bin_size:
+            sizes = list(
+                max(xb[1] - xb[0], xb[3] - xb[2], xb[5] - xb[4]) for xb in self.xbs
+            )
+            bin_size = sizes and sum(sizes) / len(sizes) or 1.0
+        ## Grid bin size
+        self.bin_size = bin_size or 1.0
+        self._bins = dict()  # {(i, j, k): [box index, ...]}
+        for i, xb in enumerate(self.xbs):
+            for key in self._get_keys(xb):
+                self._bins.setdefault(key, list()).append(i)
+
+    def _get_keys(self, xb):
+        """!
+        Get the grid bins covered by a box.
+        @param xb: the box.
+        @return iterator of bin keys.
+        """
+        s = self.bin_size
+        return product(
+            range(floor(xb[0] / s), floor(xb[1] / s) + 1),
+            range(floor(xb[2] / s), floor(xb[3] / s) + 1),
+            range(floor(xb[4] / s), floor(xb[5] / s) + 1),
+        )
+
+    def query(self, xb, tolerance=-1e-6):
+        """!
+        Get the indexed boxes overlapping a box.
+        @param xb: the box.
+        @param tolerance: the overlap tolerance, negative values include touching boxes.
+        @return sorted list of indexes of overlapping boxes.
+        """
+        candidates = set()
+        if tolerance < 0.0:  # also look for close boxes
+            xb = tuple(
+                c + (-tolerance if i % 2 else tolerance) for i, c in enumerate(xb)
+            )
+        for key in self._get_keys(xb):
+            candidates.update(self._bins.get(key, ()))
+        return sorted(i for i in candidates if _overlap(self.xbs[i], xb, tolerance))
+
+    def query_point(self, xyz):
+        """!
+        Get the indexed boxes containing a point.
+        @param xyz: the point.
+        @return sorted list of indexes of containing boxes.
+        """
+        x, y, z = xyz
+        return self.query((x, x, y, y, z, z))
+
+
+# Nested refinement
+#
+# The refinement regions are snapped to the coarse grid, extended by a margin,
+# and merged when overlapping. Their sides become cut planes, moved outwards
+# so that the cuts are never too close, to avoid thin slab MESHes,
+# and the cell counts between cuts respect the Poisson restriction.
+# The domain is then split into blocks along the cuts, fine inside the regions
+# and coarse elsewhere, and blocks of the same kind are merged back.
+
+
+def _get_merged_boxes(boxes):
+    """!
+    Merge overlapping or touching boxes of cell indexes into their bounding boxes.
+    @param boxes: the boxes as (i0, i1, j0, j1, k0, k1).
+    @return the list of merged boxes.
+    """
+    boxes = list(boxes)
+    merged = True
+    while merged:
+        merged = False
+        for a in range(len(boxes)):
+            for b in range(a + 1, len(boxes)):
+                ba, bb = boxes[a], boxes[b]
+                if all(
+                    ba[2 * i] <= bb[2 * i + 1] and bb[2 * i] <= ba[2 * i + 1]
+                    for i in range(3)
+                ):
+                    boxes[a] = tuple((min, max)[i % 2](ba[i], bb[i]) for i in range(6))
+                    del boxes[b]
+                    merged = True
+                    break
+            if merged:
+                break
+    return boxes
+
+
+def _calc_cuts(n, sides, min_cells, poisson):
+    """!
+    Choose the cuts that least expand the box sides, by dynamic programming.
+    Each lower side goes down to the nearest cut, each upper side up,
+    the cost is their total displacement, then the number of cuts.
+    @param n: the domain cell count along the axis.
+    @param sides: the sorted box sides as (cell index, 0 for lower or 1 for upper).
+    @param min_cells: the min cell count between cuts.
+    @param poisson: True for Poisson cell counts between cuts.
+    @return the sorted cuts, or None if impossible.
+    """
+    # Prefix counts and sums of the lower and upper sides, by cell index
+    nl, sl, nu, su = ([0] * (n + 1) for _ in range(4))
+    for c, s in sides:
+        if s:
+            nu[c], su[c] = nu[c] + 1, su[c] + c
+        else:
+            nl[c], sl[c] = nl[c] + 1, sl[c] + c
+    for x in range(1, n + 1):
+        nl[x], sl[x] = nl[x] + nl[x - 1], sl[x] + sl[x - 1]
+        nu[x], su[x] = nu[x] + nu[x - 1], su[x] + su[x - 1]
+    if poisson:
+        steps = _poisson_ns[
+            bisect_left(_poisson_ns, min_cells) : bisect_right(_poisson_ns, n)
+        ]
+    else:
+        steps = range(min_cells, n + 1)
+    # Cost of the best cuts up to each cell index, lexicographic on
+    # the side displacement and the number of cuts
+    costs, prevs = [None] * (n + 1), [None] * (n + 1)
+    costs[0] = 0
+    for p in range(n):
+        if costs[p] is None:
+            continue
+        for step in steps:
+            q = p + step
+            if q > n:
+                break
+            dl = sl[q - 1] - sl[p] - p * (nl[q - 1] - nl[p])
+            du = q * (nu[q - 1] - nu[p]) - (su[q - 1] - su[p])
+            cost = costs[p] + (dl + du) * (n + 2) + 1
+            if costs[q] is None or cost < costs[q]:
+                costs[q], prevs[q] = cost, p
+    if costs[n] is None:
+        return None
+    cuts = [n]
+    while cuts[-1]:
+        cuts.append(prevs[cuts[-1]])
+    return cuts[::-1]
+
+
+def _get_cuts(n, boxes, axis, poisson, min_cells=3):
+    """!
+    Get the cut cell indexes along an axis, moving box sides outwards.
+    Cuts are at least min_cells apart, and their cell counts respect
+    the Poisson restriction, if possible.
+    @param n: the domain cell count along the axis.
+    @param boxes: the boxes of cell indexes.
+    @param axis: the axis index.
+    @param poisson: True for respecting the Poisson constraint.
+    @param min_cells: the min cell count between cuts.
+    @return the sorted cuts, and the map from original (cut, side) to moved cuts.
+    """
+    poisson = poisson and axis  # not needed along x
+    min_cells = min(min_cells, n)
+    sides = sorted(set((b[2 * axis + s], s) for b in boxes for s in (0, 1)))
+    cuts = poisson and _calc_cuts(n, sides, min_cells, True)
+    if not cuts:  # always possible, at least [0, n]
+        cuts = _calc_cuts(n, sides, min_cells, False)
+    moved = dict()
+    for c, s in sides:
+        if s:  # upper side, move up
+            moved[c, s] = cuts[bisect_left(cuts, c)]
+        else:  # lower side, move down
+            moved[c, s] = cuts[bisect_right(cuts, c) - 1]
+    return cuts, moved
+
+
+def refine_mesh(
+    ijk, xbs, regions, ratio=2, margin=2, max_cells=None, poisson=True, min_cells=3
+):
+    """!
+    Refine a coarse MESH around regions, with nested fine MESHes.
+    @param ijk: ijk of the coarse mesh.
+    @param xbs: xbs of the coarse mesh.
+    @param regions: xbs of the regions to be refined.
+    @param ratio: the max refinement ratio, 2 or 4, reduced to 2 if over the budget.
+    @param margin: the margin around regions, in coarse cells.
+    @param max_cells: the max total number of cells, if any.
+    @param poisson: True for respecting the Poisson constraint.
+    @param min_cells: the min coarse cell count of the new meshes along each axis.
+    @return the list of (ijk, xbs, ratio) of the new meshes, fine ones first, and messages.
+    """
+    cs = calc_cell_sizes(ijk, xbs)
+    # Snap the regions to the coarse grid, inside the domain
+    boxes = list()
+    for r in regions:
+        box = list()
+        for a in range(3):
+            i0 = floor((max(r[2 * a], xbs[2 * a]) - xbs[2 * a]) / cs[a] + 1e-6)
+            i1 = ceil((min(r[2 * a + 1], xbs[2 * a + 1]) - xbs[2 * a]) / cs[a] - 1e-6)
+            box.extend((max(0, i0 - margin), min(ijk[a], max(i1, i0 + 1) + margin)))
+        if all(box[2 * a] < box[2 * a + 1] for a in range(3)):
+            boxes.append(tuple(box))
+    if not boxes:
+        raise ValueError("No refinement region inside the MESH")
+    boxes = _get_merged_boxes(boxes)
+    if poisson:  # extend the boxes to respect the Poisson constraint
+        for ib, b in enumerate(boxes):
+            b = list(b)
+            for a in (1, 2):  # not needed along x
+                n = get_poisson_n_above(b[2 * a + 1] - b[2 * a])
+                b[2 * a + 1] = min(ijk[a], b[2 * a] + n)
+                b[2 * a] = max(0, b[2 * a + 1] - n)
+            boxes[ib] = tuple(b)
+        boxes = _get_merged_boxes(boxes)
+    # Cut the domain
+    cuts, maps = list(), list()
+    for a in range(3):
+        c, m = _get_cuts(ijk[a], boxes, a, poisson, min_cells)
+        cuts.append(c)
+        maps.append(m)
+    boxes = list(tuple(maps[i // 2][b[i], i % 2] for i in range(6)) for b in boxes)
+    # Split in blocks, with their kind: index of the fine box or -1 for coarse
+    blocks = list()
+    for i0, i1 in zip(cuts[0], cuts[0][1:]):
+        for j0, j1 in zip(cuts[1], cuts[1][1:]):
+            for k0, k1 in zip(cuts[2], cuts[2][1:]):
+                block = (i0, i1, j0, j1, k0, k1)
+                kind = -1
+                for ib, b in enumerate(boxes):
+                    if all(
+                        b[2 * a] <= block[2 * a] and block[2 * a + 1] <= b[2 * a + 1]
+                        for a in range(3)
+                    ):
+                        kind = ib
+                        break
+                blocks.append([block, kind])
+    # Merge blocks of the same kind, along x, y, z
+    for a in range(3):
+        merged = True
+        while merged:
+            merged = False
+            for ba in blocks:
+                for bb in blocks:
+                    (xa, ka), (xb, kb) = ba, bb
+                    if (
+                        ka != kb
+                        or xa[2 * a + 1] != xb[2 * a]
+                        or any(
+                            xa[2 * o : 2 * o + 2] != xb[2 * o : 2 * o + 2]
+                            for o in range(3)
+                            if o != a
+                        )
+                        or (
+                            poisson
+                            and a
+                            and not is_poisson_n(xb[2 * a + 1] - xa[2 * a])
+                        )
+                    ):
+                        continue
+                    ba[0] = tuple(xb[i] if i == 2 * a + 1 else xa[i] for i in range(6))
+                    blocks.remove(bb)
+                    merged = True
+                    break
+                if merged:
+                    break
+    # Choose the ratio within budget
+    n_fine = sum(
+        (b[1] - b[0]) * (b[3] - b[2]) * (b[5] - b[4]) for b, k in blocks if k >= 0
+    )
+    n_coarse = ijk[0] * ijk[1] * ijk[2] - n_fine
+    while ratio > 2 and max_cells and n_coarse + n_fine * ratio ** 3 > max_cells:
+        ratio //= 2
+    n_cells = n_coarse + n_fine * ratio ** 3
+    if max_cells and n_cells > max_cells:
+        raise ValueError(f"Too many cells for the budget: {n_cells} > {max_cells}")
+    # Build the meshes, fine ones first
+    meshes, n_bad = list(), 0
+    for b, k in sorted(blocks, key=lambda bk: bk[1] < 0):
+        r = k >= 0 and ratio or 1
+        mijk = tuple((b[2 * a + 1] - b[2 * a]) * r for a in range(3))
+        mxbs = tuple(xbs[2 * (i // 2)] + b[i] * cs[i // 2] for i in range(6))
+        if poisson and not (is_poisson_n(mijk[1]) and is_poisson_n(mijk[2])):
+            n_bad += 1
+        meshes.append((mijk, mxbs, r))
+    msgs = [
+        f"{sum(1 for m in meshes if m[2] > 1)} fine MESHes at {ratio}x",
+        f"{sum(1 for m in meshes if m[2] == 1)} coarse MESHes",
+        f"{n_cells} cells",
+    ]
+    if n_bad:
+        msgs.append(f"{n_bad} MESHes not respecting the Poisson restriction")
+    return meshes, msgs
+
+
+# Global MESH alignment
+#
+# MESHes closer than their cell size are connected in an adjacency graph,
+# and each connected group is aligned at once, axis by axis.
+# The finest cell size of the group is protected, the others become
+# integer multiples of it, keeping integer ratios between neighbours
+# by propagating them from the finest MESH through the graph.
+# Then each MESH side is snapped to the grid of the coarsest MESH
+# sharing it, all grids starting from the same origin.
+
+
+def _get_mesh_graph(xbss, css):
+    """!
+    Get the adjacency graph of MESHes closer than their cell size.
+    @param xbss: the MESH xbs.
+    @param css: the MESH cell sizes.
+    @return the list of neighbour sets, by MESH.
+    """
+    index = BoxIndex(xbss)
+    graph = list(set() for _ in xbss)
+    for i, xb in enumerate(xbss):
+        for j in index.query(xb, tolerance=-max(css[i])):
+            if j != i:
+                graph[i].add(j)
+                graph[j].add(i)
+    return graph
+
+
+def _get_mesh_groups(graph):
+    """!
+    Get the connected groups of the MESH adjacency graph.
+    @param graph: the list of neighbour sets, by MESH.
+    @return the list of groups, each a sorted list of MESH indexes.
+    """
+    seen, groups = set(), list()
+    for i in range(len(graph)):
+        if i in seen:
+            continue
+        seen.add(i)
+        group, stack = list(), [i]
+        while stack:
+            j = stack.pop()
+            group.append(j)
+            for k in graph[j] - seen:
+                seen.add(k)
+                stack.append(k)
+        groups.append(sorted(group))
+    return groups
+
+
+def _get_compatible_ratio(r, n):
+    """!
+    Get the integer cell size ratio closest to r, compatible with a neighbour ratio.
+    @param r: the desired cell size ratio.
+    @param n: the ratio of the neighbour.
+    @return a multiple or a divisor of n.
+    """
+    if r >= n:
+        return n * max(1, round(r / n))
+    return min((d for d in range(1, n + 1) if not n % d), key=lambda d: abs(d - r))
+
+
+def _calc_group_ratios(group, graph, css, axis):
+    """!
+    Calc the integer cell size ratios to the finest cell size of a MESH group.
+    @param group: the MESH group.
+    @param graph: the list of neighbour sets, by MESH.
+    @param css: the MESH cell sizes.
+    @param axis: the axis index.
+    @return the finest MESH index, and the ratios by MESH index.
+    """
+    ref = min(group, key=lambda i: css[i][axis])
+    ratios = {ref: 1}
+    queue = deque((ref,))
+    while queue:  # breadth first, from the finest MESH
+        p = queue.popleft()
+        for c in sorted(graph[p], key=lambda i: css[i][axis]):
+            if c not in ratios:
+                ratios[c] = _get_compatible_ratio(
+                    css[c][axis] / css[ref][axis], ratios[p]
+                )
+                queue.append(c)
+    return ref, ratios
+
+
+def align_all_meshes(ijks, xbss, poisson=False):
+    """!
+    Align many MESHes at once, through their adjacency graph.
+    @param ijks: ijk of the meshes.
+    @param xbss: xbs of the meshes.
+    @param poisson: True for respecting the Poisson constraint.
+    @return new ijks and xbss, messages, and unresolved conflicts as (i, j, msg).
+    """
+    ijks = list(list(ijk) for ijk in ijks)
+    xbss = list(list(xbs) for xbs in xbss)
+    css = list(calc_cell_sizes(ijk, xbs) for ijk, xbs in zip(ijks, xbss))
+    graph = _get_mesh_graph(xbss, css)
+    groups = _get_mesh_groups(graph)
+    conflicts, n_snapped, n_extended = list(), 0, 0
+    for axis in range(3):
+        a0, a1 = 2 * axis, 2 * axis + 1
+        new_xbss = list(list(xbs) for xbs in xbss)
+        for group in groups:
+            ref, ratios = _calc_group_ratios(group, graph, css, axis)
+            steps = {i: ratios[i] * css[ref][axis] for i in group}
+            origin = xbss[ref][a0]
+            # Cluster the shared sides, (i, side) pairs, by union find
+            parents, shared = dict(), list()
+
+            def _root(key):
+                while parents.setdefault(key, key) != key:
+                    key = parents[key]
+                return key
+
+            for i in group:
+                for side in (0, 1):
+                    x = xbss[i][a0 + side]
+                    for j in graph[i]:
+                        if i > j:
+                            continue
+                        tolerance = max(css[i][axis], css[j][axis])
+                        if abs(xbss[j][a1 - side] - x) <= tolerance:
+                            shared.append((i, side, j))
+                            parents[_root((i, side))] = _root((j, 1 - side))
+                            if max(ratios[i], ratios[j]) % min(ratios[i], ratios[j]):
+                                conflicts.append(
+                                    (
+                                        i,
+                                        j,
+                                        f"Non integer cell size ratio along {'xyz'[axis]}",
+                                    )
+                                )
+            clusters = dict()  # {root: [(i, side), ...]}
+            for i in group:
+                for side in (0, 1):
+                    clusters.setdefault(_root((i, side)), list()).append((i, side))
+            is_shared = set(
+                k for keys in clusters.values() if len(keys) > 1 for k in keys
+            )
+            # Snap each cluster of sides to the coarsest grid, from the same origin
+            for keys in clusters.values():
+                x = sum(xbss[i][a0 + side] for i, side in keys) / len(keys)
+                step = max(steps[i] for i, _ in keys)
+                x = origin + round((x - origin) / step) * step
+                for i, side in keys:
+                    new_xbss[i][a0 + side] = x
+            # Set the cell counts
+            for i in group:
+                step = steps[i]
+                n = max(1, round((new_xbss[i][a1] - new_xbss[i][a0]) / step))
+                if poisson and axis:  # not needed along x
+                    n_poisson = get_poisson_n_above(n)
+                    if n_poisson != n:
+                        n, n_extended = n_poisson, n_extended + 1
+                if (i, 1) in is_shared and (i, 0) not in is_shared:
+                    new_xbss[i][a0] = new_xbss[i][a1] - n * step  # extend below
+                else:
+                    new_xbss[i][a1] = new_xbss[i][a0] + n * step
+                ijks[i][axis] = n
+            # Check the shared sides
+            for i, side, j in shared:
+                n_snapped += 1
+                if abs(new_xbss[i][a0 + side] - new_xbss[j][a1 - side]) > 1e-6 * (
+                    steps[i] + steps[j]
+                ):
+                    conflicts.append((i, j, f"Side not snapped along {'xyz'[axis]}"))
+        xbss = new_xbss
+    msgs = [
+        f"{len(xbss)} MESHes aligned in {len(groups)} groups",
+        f"{n_snapped} sides snapped",
+    ]
+    if n_extended:
+        msgs.append(f"{n_extended} IJK values extended for Poisson solver")
+    if conflicts:
+        msgs.append(f"{len(conflicts)} unresolved conflicts")
+    return ijks, xbss, msgs, conflicts
+
+
+# MESH overlaps, gaps and interfaces check
+#
+# Close MESH pairs are found through the BoxIndex, in near linear time
+# for MESHes of similar size, then classified by their signed gaps along
+# each axis. Gaps filled by other MESHes are not reported.
+
+
+def _is_multiple(a, b, rtol):
+    """!
+    Check if a is an integer multiple of b, within relative tolerance.
+    @param a: the first number.
+    @param b: the second number, not zero.
+    @param rtol: the relative tolerance.
+    @return True if a is a multiple of b.
+    """
+    r = a / b
+    return abs(r - round(r)) <= rtol
+
+
+def _check_mesh_pair(xbi, csi, xbj, csj, rtol):
+    """!
+    Check a MESH pair for overlaps, near-miss gaps and misaligned interfaces.
+    @param xbi: xbs of the first mesh.
+    @param csi: cell sizes of the first mesh.
+    @param xbj: xbs of the second mesh.
+    @param csj: cell sizes of the second mesh.
+    @param rtol: the tolerance, relative to the cell size.
+    @return None or the issue as (kind, msg).
+    """
+    # Signed gaps along each axis, negative for overlaps
+    gaps = list(
+        max(xbi[2 * a] - xbj[2 * a + 1], xbj[2 * a] - xbi[2 * a + 1]) for a in range(3)
+    )
+    tols = list(rtol * min(csi[a], csj[a]) for a in range(3))
+    overlapping = list(a for a in range(3) if gaps[a] < -tols[a])
+    if len(overlapping) == 3:
+        return "OVERLAP", "MESHes overlap"
+    if len(overlapping) != 2:
+        return  # apart, or touching at edges or corners
+    a = ({0, 1, 2} - set(overlapping)).pop()
+    if gaps[a] >= max(csi[a], csj[a]):
+        return  # far apart
+    if gaps[a] > tols[a]:
+        return "GAP", f"Near-miss gap along {'xyz'[a]}: {gaps[a]:.6g}"
+    # Touching along a, check the interface cells
+    for b in overlapping:
+        if csi[b] <= csj[b]:
+            cf, cc, xf0, xc0 = csi[b], csj[b], xbi[2 * b], xbj[2 * b]
+        else:
+            cf, cc, xf0, xc0 = csj[b], csi[b], xbj[2 * b], xbi[2 * b]
+        if not _is_multiple(cc, cf, rtol) or not _is_multiple(xc0 - xf0, cf, rtol):
+            return "MISALIGNED", f"Misaligned cells along {'xyz'[b]}"
+
+
+def _get_between_xb(xbi, xbj):
+    """!
+    Get the box between two MESHes, the gap slab if they are apart.
+    @param xbi: xbs of the first mesh.
+    @param xbj: xbs of the second mesh.
+    @return the box (x0, x1, y0, y1, z0, z1).
+    """
+    xb = list()
+    for a in range(3):
+        x0, x1 = max(xbi[2 * a], xbj[2 * a]), min(xbi[2 * a + 1], xbj[2 * a + 1])
+        xb.extend((min(x0, x1), max(x0, x1)))
+    return xb
+
+
+def _is_covered(xb, xbs, tolerance=0.0):
+    """!
+    Check if a box is covered by the union of other boxes.
+    @param xb: the box.
+    @param xbs: the covering boxes.
+    @param tolerance: the tolerance, smaller uncovered parts are ignored.
+    @return True if the box is covered.
+    """
+    # Split the box along the sides of the covering boxes,
+    # then check the center of each part
+    centers = list()
+    for a in range(3):
+        x0, x1 = xb[2 * a], xb[2 * a + 1]
+        cs = set((x0, x1))
+        cs.update(
+            c
+            for b in xbs
+            for c in b[2 * a : 2 * a + 2]
+            if x0 + tolerance < c < x1 - tolerance
+        )
+        cs = sorted(cs)
+        centers.append(
+            list((c0 + c1) / 2.0 for c0, c1 in zip(cs, cs[1:]) if c1 - c0 > tolerance)
+        )
+    return all(
+        any(b[0] < x < b[1] and b[2] < y < b[3] and b[4] < z < b[5] for b in xbs)
+        for x, y, z in product(*centers)
+    )
+
+
+def check_meshes(ijks, xbss, rtol=0.01):
+    """!
+    Check MESHes for overlaps, near-miss gaps and misaligned interfaces.
+    @param ijks: ijk of the meshes.
+    @param xbss: xbs of the meshes.
+    @param rtol: the tolerance, relative to the cell size.
+    @return the sorted list of issues as (i, j, kind, msg), kind in "OVERLAP", "GAP", "MISALIGNED".
+    """
+    css = list(calc_cell_sizes(ijk, xbs) for ijk, xbs in zip(ijks, xbss))
+    index = BoxIndex(xbss)
+    issues = list()
+    for i, xb in enumerate(xbss):
+        for j in index.query(xb, tolerance=-max(css[i])):
+            if j <= i:
+                continue
+            issue = _check_mesh_pair(xb, css[i], xbss[j], css[j], rtol)
+            if issue and issue[0] == "GAP":  # filled by other meshes?
+                between_xb = _get_between_xb(xb, xbss[j])
+                others = list(
+                    xbss[k] for k in index.query(between_xb, 0.0) if k not in (i, j)
+                )
+                tolerance = rtol * min(min(css[i]), min(css[j]))
+                if _is_covered(between_xb, others, tolerance):
+                    continue
+            if issue:
+                issues.append((i, j, *issue))
+    return issues
+
+
+# MPI process load balancing
+
+
+def calc_mesh_costs(
+    mxbs, cell_counts, xbs=(), faces=(), box_weight=8.0, face_weight=4.0
+):
+    """!
+    Estimate the computational cost of each MESH, from its cells and contents.
+    @param mxbs: the MESH xbs.
+    @param cell_counts: the MESH cell counts.
+    @param xbs: the xbs of the exported boxes (eg. OBST voxels).
+    @param faces: the bboxes of the exported GEOM faces.
+    @param box_weight: the cost of a box, in cells.
+    @param face_weight: the cost of a GEOM face, in cells.
+    @return the list of costs, and the list of (box count, face count) by MESH.
+    """
+    index = BoxIndex(mxbs)
+    counts = [[0, 0] for _ in mxbs]
+    for xb in xbs:
+        for i in index.query(xb):
+            counts[i][0] += 1
+    for xb in faces:
+        for i in index.query(xb):
+            counts[i][1] += 1
+    costs = list(
+        c + box_weight * nb + face_weight * nf
+        for c, (nb, nf) in zip(cell_counts, counts)
+    )
+    return costs, counts
+
+
+def _split_costs(costs, n_processes, max_load):
+    """!
+    Split the MESH costs in contiguous groups, greedily.
+    Each group is filled up to max_load, the last MESHes get
+    their own process when needed to use all the processes.
+    @param costs: the MESH costs, in MESH export order.
+    @param n_processes: the number of MPI processes, not more than the MESHes.
+    @param max_load: the max load of a process.
+    @return the list of MPI process by MESH, or None if more processes are needed.
+    """
+    processes, p, load = list(), 0, 0.0
+    for i, cost in enumerate(costs):
+        if processes and (
+            load + cost > max_load or len(costs) - i <= n_processes - 1 - p
+        ):
+            p, load = p + 1, 0.0
+            if p == n_processes:
+                return None
+        processes.append(p)
+        load += cost
+    return processes
+
+
+def balance_mpi_processes(costs, n_processes):
+    """!
+    Assign MESHes to MPI processes, balancing their costs.
+    FDS requires non-decreasing MPI_PROCESS values in MESH order,
+    so the MESHes are split in contiguous groups, minimizing the max load
+    by bisection on the max load.
+    @param costs: the MESH costs, in MESH export order.
+    @param n_processes: the number of MPI processes.
+    @return the list of MPI process by MESH, the process loads, and the imbalance.
+    """
+    n_processes = max(1, min(n_processes, len(costs)))
+    lo = max(max(costs, default=0.0), sum(costs) / n_processes)
+    hi = max(lo, sum(costs))
+    processes = _split_costs(costs, n_processes, lo)
+    for _ in range(64):
+        if processes or hi - lo <= 1e-9 * hi:
+            break
+        mid = (lo + hi) / 2.0
+        if _split_costs(costs, n_processes, mid):
+            hi = mid
+        else:
+            lo = mid
+    processes = processes or _split_costs(costs, n_processes, hi)
+    loads = [0.0] * n_processes
+    for cost, p in zip(costs, processes):
+        loads[p] += cost
+    mean = sum(loads) / n_processes
+    imbalance = mean and max(loads) / mean - 1.0 or 0.0
+    return processes, loads, imbalance
+
+
+# Case estimate
+#
+# Rough pre-run estimate of an FDS case: about 1 kB of RAM per cell,
+# a time step limited by the CFL condition on the smallest cell size
+# at a characteristic velocity, and a constant cost per cell update.
+
+
+def estimate_case(
+    ijks,
+    xbss,
+    mpi_processes=None,
+    t_end=0.0,
+    counts=None,
+    bytes_per_cell=1000.0,
+    cfl=0.9,
+    velocity=5.0,
+    cell_update_time=2e-6,
+):
+    """!
+    Estimate the size, memory and wall clock time of an FDS case.
+    @param ijks: ijk of the meshes.
+    @param xbss: xbs of the meshes.
+    @param mpi_processes: MPI process of the meshes, None for their own process.
+    @param t_end: the simulation ending time in s.
+    @param counts: other counts to be reported, eg. {"devcs": 12, "slcfs": 3}.
+    @param bytes_per_cell: the memory per cell in bytes.
+    @param cfl: the target CFL number.
+    @param velocity: the characteristic max velocity in m/s.
+    @param cell_update_time: the wall clock time of a cell update in s.
+    @return the estimate dict.
+    """
+    mpi_processes = mpi_processes or [None] * len(ijks)
+    cells_by_process, min_cs = dict(), None
+    for i, (ijk, xbs, p) in enumerate(zip(ijks, xbss, mpi_processes)):
+        key = p is None and ("mesh", i) or p  # own process
+        cells_by_process[key] = cells_by_process.get(key, 0) + ijk[0] * ijk[1] * ijk[2]
+        cs = min(calc_cell_sizes(ijk, xbs))
+        min_cs = min_cs is None and cs or min(min_cs, cs)
+    cells = list(cells_by_process.values())
+    n_cells, max_cells = sum(cells), max(cells, default=0)
+    time_step = min_cs and cfl * min_cs / velocity or 0.0
+    n_time_steps = time_step and ceil(t_end / time_step) or 0
+    return {
+        "n_meshes": len(ijks),
+        "n_cells": n_cells,
+        "n_mpi_processes": len(cells),
+        "max_cells_per_process": max_cells,
+        "cells_per_process": sorted(cells, reverse=True),
+        "ram": n_cells * bytes_per_cell,
+        "min_cell_size": min_cs or 0.0,
+        "t_end": t_end,
+        "time_step": time_step,
+        "n_time_steps": n_time_steps,
+        "wall_clock_time": n_time_steps * max_cells * cell_update_time,
+        "counts": dict(counts or {}),
+        "model": {
+            "bytes_per_cell": bytes_per_cell,
+            "cfl": cfl,
+            "velocity": velocity,
+            "cell_update_time": cell_update_time,
+        },
+    }
+
+
+def test():
+    print("Test")
+    rijk, rxbs, mijk, mxbs, msgs = align_meshes(
+        rijk=[15, 37, 51],
+        rxbs=[0, 5, 0, 5, 0, 5],
+        mijk=[9, 38, 20],
+        mxbs=[0, 5, 0, 5, 5, 10],
+        poisson=True,
+        protect_rl=True,
+    )
+    print(rijk, rxbs, mijk, mxbs, msgs)
+
+
+if __name__ == "__main__":
+    test()
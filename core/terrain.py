@@ -0,0 +1,696 @@
+#!/usr/bin/python3
+
+"""!
+BlenderFDS, import/export terrain (DEM and landuse).
+"""
+
+
+import os, tempfile, hashlib
+import numpy as np
+
+# The terrain is a grid of face centers (n_rows, n_cols), each with x, y, z
+# and property. It is triangulated into a grid of nodes (n_rows + 1, n_cols + 1),
+# two triangles per face. Large grids are cached in a memory-mapped binary file,
+# and triangulated by blocks of rows, so that the peak memory stays bounded.
+
+## Byte size of the chunks read from the csv file
+chunk_size = 1 << 24
+
+
+def _parse_csv_text(text, n_cols):
+    """!
+    Parse csv text with a bulk loader.
+    @param text: the csv text, made of full lines.
+    @param n_cols: the number of columns.
+    @return the (n, 4) array of x, y, z and property of the face centers.
+    """
+    data = np.fromstring(text.replace("\n", ","), dtype=np.float64, sep=",")
+    if data.size % n_cols:
+        raise ValueError("Bad csv file, wrong number of values")
+    return data.reshape(-1, n_cols)[:, :4]
+
+
+def _iter_csv_chunks(csv_file_path):
+    """!
+    Generate the csv text in chunks of full lines, header excluded.
+    @param csv_file_path: csv file path.
+    @return generator of csv text chunks.
+    """
+    with open(csv_file_path, "r") as csv_file:
+        next(csv_file)  # ignoring csv header
+        rest = ""
+        while True:
+            chunk = csv_file.read(chunk_size)
+            if not chunk:
+                break
+            chunk, sep, tail = (rest + chunk).rpartition("\n")
+            if not sep:  # no full line yet
+                rest = tail
+                continue
+            rest = tail
+            yield chunk
+        if rest.strip():
+            yield rest
+
+
+def _read_csv(csv_file_path):
+    """!
+    Read the csv file with a bulk loader.
+    @param csv_file_path: csv file path.
+    @return the (n, 4) array of x, y, z and property of the face centers.
+    """
+    chunks = _iter_csv_chunks(csv_file_path)
+    first = next(chunks, "")
+    n_cols = first.split("\n", 1)[0].count(",") + 1
+    if n_cols < 4:
+        raise ValueError(f"Bad csv file: {csv_file_path}")
+    return np.concatenate(
+        [_parse_csv_text(first, n_cols)]
+        + [_parse_csv_text(chunk, n_cols) for chunk in chunks]
+    )
+
+
+def _calc_row_len(points, tolerance=0.1):
+    """!
+    Calc the row length of the grid, where points stop being collinear.
+    @param points: the (n, 2) array of x and y of the face centers.
+    @param tolerance: the tolerance on the cosine of the angle between points.
+    @return the row length.
+    """
+    if len(points) < 3:
+        return len(points)
+    a = points[1:-1] - points[0]  # from the first point to the previous one
+    b = points[2:] - points[0]  # from the first point to the current one
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cos = np.einsum("ij,ij->i", a, b) / (
+            np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1)
+        )
+    (breaks,) = np.nonzero(np.abs(cos - 1.0) >= tolerance)
+    return breaks.size and int(breaks[0]) + 2 or len(points)
+
+
+def _to_grid(data, name):
+    """!
+    Reshape the face centers to a grid, detecting rows by collinearity.
+    @param data: the (n, 4) array of the face centers.
+    @param name: the source name, for error messages.
+    @return the (n_rows, n_cols, 4) grid.
+    """
+    n_cols = _calc_row_len(data[:, :2])
+    n_rows = len(data) // n_cols
+    if n_rows < 2 or n_cols < 2 or n_rows * n_cols != len(data):
+        raise ValueError(f"Not a regular grid: {name}")
+    return data.reshape(n_rows, n_cols, 4)
+
+
+def _get_cache_paths(csv_file_path, cache_dir=None):
+    """!
+    Get the candidate cache file paths of the csv file.
+    The cache is keyed on the csv file size and modification time.
+    @param csv_file_path: csv file path.
+    @param cache_dir: the cache directory, if None next to the csv file, then the temp directory.
+    @return the list of candidate cache file paths, and the common file name prefix.
+    """
+    path = os.path.abspath(csv_file_path)
+    st = os.stat(path)
+    prefix = f"{os.path.basename(path)}.{hashlib.sha1(path.encode()).hexdigest()[:8]}."
+    name = f"{prefix}{st.st_size}-{st.st_mtime_ns}.npy"
+    if cache_dir:
+        return [os.path.join(cache_dir, name)], prefix
+    return [
+        os.path.join(os.path.dirname(path), name),
+        os.path.join(tempfile.gettempdir(), "blenderfds", name),
+    ], prefix
+
+
+def _remove_stale_caches(cache_path, prefix):
+    """!
+    Remove the stale caches of the same csv file, best effort.
+    @param cache_path: the current or candidate cache file path.
+    @param prefix: the common file name prefix of the caches.
+    """
+    cache_dir, name = os.path.split(cache_path)
+    if not os.path.isdir(cache_dir):
+        return
+    for other in os.listdir(cache_dir):
+        if other != name and other.startswith(prefix) and other.endswith(".npy"):
+            try:
+                os.remove(os.path.join(cache_dir, other))
+            except OSError:  # eg. still memory-mapped on Windows
+                pass
+
+
+def _write_cache(csv_file_path, cache_path):
+    """!
+    Write the memory-mapped binary cache of the terrain grid, by chunks.
+    @param csv_file_path: csv file path.
+    @param cache_path: the cache file path.
+    """
+    # Count the lines, in binary chunks
+    with open(csv_file_path, "rb") as f:
+        n_lines, last = 0, b"\n"
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            n_lines += chunk.count(b"\n")
+            last = chunk[-1:]
+        n_lines += last != b"\n"
+    n_points = n_lines - 1  # ignoring csv header
+    # Get the grid shape from the first chunk
+    chunks = _iter_csv_chunks(csv_file_path)
+    first = next(chunks, "")
+    n_cols = first.split("\n", 1)[0].count(",") + 1
+    if n_cols < 4:
+        raise ValueError(f"Bad csv file: {csv_file_path}")
+    data = _parse_csv_text(first, n_cols)
+    row_len = _calc_row_len(data[:, :2])
+    while row_len == len(data):  # first row not complete yet
+        chunk = next(chunks, None)
+        if chunk is None:
+            break
+        data = np.concatenate((data, _parse_csv_text(chunk, n_cols)))
+        row_len = _calc_row_len(data[:, :2])
+    shape = n_points // row_len, row_len, 4
+    if shape[0] < 2 or shape[1] < 2 or shape[0] * shape[1] != n_points:
+        raise ValueError(f"Not a regular grid: {csv_file_path}")
+    # Parse the chunks into the cache, renamed when complete
+    tmp_path = f"{cache_path}.part"
+    try:
+        grid = np.lib.format.open_memmap(
+            tmp_path, mode="w+", dtype=np.float64, shape=shape
+        )
+        flat = grid.reshape(-1, 4)
+        flat[: len(data)] = data
+        i = len(data)
+        for chunk in chunks:
+            data = _parse_csv_text(chunk, n_cols)
+            flat[i : i + len(data)] = data
+            i += len(data)
+        grid.flush()
+        del grid, flat
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        if os.path.isfile(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def get_grid(csv_file_path, cache_dir=None):
+    """!
+    Get the terrain grid from a csv file, through a memory-mapped binary cache.
+    The cache is built on first read, by chunks, and rebuilt when the csv file changes.
+    When the csv directory is not writable, the cache is built in the temp directory.
+    @param csv_file_path: csv file path.
+    @param cache_dir: the cache directory, if None next to the csv file, then the temp directory.
+    @return the read-only memory-mapped (n_rows, n_cols, 4) grid.
+    """
+    cache_paths, prefix = _get_cache_paths(csv_file_path, cache_dir)
+    for cache_path in cache_paths:
+        if os.path.isfile(cache_path):
+            return np.load(cache_path, mmap_mode="r")
+    for i, cache_path in enumerate(cache_paths):
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            _write_cache(csv_file_path, cache_path)
+        except OSError:
+            if i == len(cache_paths) - 1:  # no writable cache directory
+                raise
+            continue
+        for other_path in cache_paths:
+            _remove_stale_caches(other_path, prefix)
+        return np.load(cache_path, mmap_mode="r")
+
+
+def _get_boundary_nodes(p1, p2):
+    """!
+    Get the boundary nodes, aligned with two adjacent face centers.
+    @param p1: the array of the nearest face centers.
+    @param p2: the array of the other face centers.
+    @return the array of boundary nodes.
+    """
+    return p1 - (p2 - p1) / 2.0
+
+
+def calc_nodes(grid, r0, r1):
+    """!
+    Calc a block of node rows of the triangulation.
+    Each node is the average of the 4 adjacent face centers,
+    boundary nodes are aligned with two adjacent face centers.
+    @param grid: the (n_rows, n_cols, 4) grid of face centers.
+    @param r0: the first node row.
+    @param r1: the last node row, excluded, up to n_rows + 1.
+    @return the (r1 - r0, n_cols + 1, 3) array of nodes.
+    """
+    n_rows, n_cols = grid.shape[:2]
+    nodes = np.empty((r1 - r0, n_cols + 1, 3))
+    a, b = max(r0, 1), min(r1, n_rows)  # interior node rows
+    if a < b:
+        m = np.asarray(grid[a - 1 : b, :, :3])  # only the needed face centers
+        nodes[a - r0 : b - r0, 1:-1] = (
+            m[:-1, :-1] + m[:-1, 1:] + m[1:, :-1] + m[1:, 1:]
+        ) / 4.0
+        nodes[a - r0 : b - r0, 0] = _get_boundary_nodes(m[1:, 0], m[1:, 1])
+        nodes[a - r0 : b - r0, -1] = _get_boundary_nodes(m[1:, -1], m[1:, -2])
+    for r, i0, i1 in ((0, 0, 1), (n_rows, -1, -2)):  # first and last node rows
+        if r0 <= r < r1:
+            m0, m1 = np.asarray(grid[i0, :, :3]), np.asarray(grid[i1, :, :3])
+            nodes[r - r0, 1:-1] = _get_boundary_nodes(m0[1:], m1[1:])
+            nodes[r - r0, 0] = _get_boundary_nodes(m0[0], m1[1])
+            nodes[r - r0, -1] = _get_boundary_nodes(m0[-1], m1[-2])
+    return nodes
+
+
+def calc_connectivity(n_rows, n_cols, r0, r1):
+    """!
+    Calc a block of face rows of the triangulation connectivity.
+    @param n_rows: the number of face rows of the grid.
+    @param n_cols: the number of face columns of the grid.
+    @param r0: the first face row.
+    @param r1: the last face row, excluded, up to n_rows.
+    @return the (2 * (r1 - r0) * n_cols, 3) int32 array of node indexes, from 0.
+    """
+    n = (
+        np.arange(r0, r1, dtype=np.int32)[:, None] * (n_cols + 1)
+        + np.arange(n_cols, dtype=np.int32)[None, :]
+    ).ravel()
+    connectivity = np.empty((n.size, 2, 3), dtype=np.int32)
+    connectivity[:, 0, 0] = n
+    connectivity[:, 0, 1] = n + n_cols + 1
+    connectivity[:, 0, 2] = n + 1
+    connectivity[:, 1, 0] = n + 1
+    connectivity[:, 1, 1] = n + n_cols + 1
+    connectivity[:, 1, 2] = n + n_cols + 2
+    return connectivity.reshape(-1, 3)
+
+
+def calc_properties(grid, r0, r1):
+    """!
+    Calc a block of face rows of the triangulation properties.
+    @param grid: the (n_rows, n_cols, 4) grid of face centers.
+    @param r0: the first face row.
+    @param r1: the last face row, excluded, up to n_rows.
+    @return the (2 * (r1 - r0) * n_cols,) int32 array of properties.
+    """
+    return np.repeat(np.rint(grid[r0:r1, :, 3]).astype(np.int32).ravel(), 2)
+
+
+def _iter_blocks(n_rows, block_rows):
+    """!
+    Generate the blocks of rows of the triangulation.
+    @param n_rows: the number of face rows of the grid.
+    @param block_rows: the number of face rows per block.
+    @return generator of first and last face row, and last node row, excluded.
+    """
+    for r0 in range(0, n_rows, block_rows):
+        r1 = min(n_rows, r0 + block_rows)
+        yield r0, r1, r1 == n_rows and n_rows + 1 or r1  # last node row at the end
+
+
+def iter_triangulation(grid, block_rows=1024):
+    """!
+    Generate the triangulation of the grid by blocks of rows.
+    @param grid: the (n_rows, n_cols, 4) grid of face centers, eg. memory-mapped.
+    @param block_rows: the number of face rows per block.
+    @return generator of nodes (n, 3), connectivity (m, 3) and properties (m,) blocks.
+    """
+    n_rows, n_cols = grid.shape[:2]
+    for r0, r1, n1 in _iter_blocks(n_rows, block_rows):
+        yield (
+            calc_nodes(grid, r0, n1).reshape(-1, 3),
+            calc_connectivity(n_rows, n_cols, r0, r1),
+            calc_properties(grid, r0, r1),
+        )
+
+
+def calc_triangulation(csv_file_path):
+    """!
+    Function to convert a csv file into a mesh.
+    @param csv_file_path: csv file path.
+    @return return three arrays: nodes, connectivity and properties.
+        Nodes: (n, 3) float array of the nodes that make up the mesh, each made up of x, y and z;
+        Connectivity: (m, 3) int32 array of the triangles, each made up of three node indexes;
+        Properties: (m,) int32 array of the properties of the fourth column of the csv file, by triangle;
+    """
+    grid = _to_grid(_read_csv(csv_file_path), csv_file_path)
+    n_rows, n_cols = grid.shape[:2]
+    return (
+        calc_nodes(grid, 0, n_rows + 1).reshape(-1, 3),
+        calc_connectivity(n_rows, n_cols, 0, n_rows),
+        calc_properties(grid, 0, n_rows),
+    )
+
+
+def terrain_to_bingeom(
+    grid, filepath, n_surf_id=None, origin=(0.0, 0.0, 0.0), block_rows=1024
+):
+    """!
+    Write the terrain triangulation to an FDS bingeom file, by blocks of rows.
+    @param grid: the (n_rows, n_cols, 4) grid of face centers, eg. memory-mapped.
+    @param filepath: destination filepath.
+    @param n_surf_id: number of referred boundary conditions, if None the max property.
+    @param origin: the origin subtracted from node coordinates.
+    @param block_rows: the number of face rows per block.
+    """
+    from .bingeom import write_bingeom_blocks
+
+    n_rows, n_cols = grid.shape[:2]
+    blocks = list(_iter_blocks(n_rows, block_rows))
+    if n_surf_id is None:
+        n_surf_id = max(
+            int(calc_properties(grid, r0, r1).max()) for r0, r1, _ in blocks
+        )
+    origin = np.array(origin, dtype=np.float64)
+    write_bingeom_blocks(
+        n_surf_id=n_surf_id,
+        n_verts=(n_rows + 1) * (n_cols + 1),
+        n_faces=2 * n_rows * n_cols,
+        verts_blocks=(
+            (calc_nodes(grid, r0, n1) - origin).ravel() for r0, _, n1 in blocks
+        ),
+        faces_blocks=(
+            calc_connectivity(n_rows, n_cols, r0, r1).ravel() + 1  # FDS from 1
+            for r0, r1, _ in blocks
+        ),
+        surfs_blocks=(calc_properties(grid, r0, r1) for r0, r1, _ in blocks),
+        filepath=filepath,
+    )
+
+
+# Rasters: ESRI ASCII grid (.asc), and raw binary rasters
+# with ESRI header (.bil, .flt, .raw and related .hdr)
+
+
+def _parse_header(lines):
+    """!
+    Parse raster header lines.
+    @param lines: the header lines, made of key and value.
+    @return the header dict, with lower case keys.
+    """
+    header = dict()
+    for line in lines:
+        tokens = line.split()
+        if len(tokens) >= 2:
+            header[tokens[0].lower()] = tokens[1]
+    return header
+
+
+def _get_geo(header, nrows):
+    """!
+    Get the raster georeference from the header.
+    @param header: the header dict.
+    @param nrows: the number of rows.
+    @return the dict of x0, y0 (center of the north west cell), dx, dy, and nodata.
+    """
+    h = dict()
+    for k, v in header.items():
+        try:
+            h[k] = float(v)
+        except ValueError:  # eg. BYTEORDER, LAYOUT
+            pass
+    if "ulxmap" in h:  # BIL header, center of upper left cell
+        dx, dy = h.get("xdim", 1.0), h.get("ydim", 1.0)
+        x0, y0 = h["ulxmap"], h["ulymap"]
+    else:  # ESRI grid header, lower left corner or center
+        dx = dy = h.get("cellsize", 1.0)
+        dx, dy = h.get("dx", dx), h.get("dy", dy)
+        if "xllcenter" in h:
+            x0, y0 = h["xllcenter"], h["yllcenter"] + (nrows - 1) * dy
+        else:
+            x0, y0 = h["xllcorner"] + dx / 2.0, h["yllcorner"] + (nrows - 0.5) * dy
+    nodata = h.get("nodata_value", h.get("nodata"))
+    return {"x0": x0, "y0": y0, "dx": dx, "dy": dy, "nodata": nodata}
+
+
+def read_esri_ascii(filepath):
+    """!
+    Read an ESRI ASCII grid raster file, with a bulk loader.
+    @param filepath: the .asc file path.
+    @return the (nrows, ncols) array of values from north to south, and the georeference dict.
+    """
+    with open(filepath, "r") as f:
+        text = f.read()
+    lines = text.split("\n", 8)
+    n_header = 0
+    while n_header < len(lines) and lines[n_header].lstrip()[:1].isalpha():
+        n_header += 1
+    header = _parse_header(lines[:n_header])
+    nrows, ncols = int(header["nrows"]), int(header["ncols"])
+    data = text.split("\n", n_header)[-1]
+    del text
+    values = np.fromstring(data, dtype=np.float64, sep=" ")
+    if values.size != nrows * ncols:
+        raise ValueError(
+            f"Bad ESRI ASCII grid file, wrong number of values: {filepath}"
+        )
+    return values.reshape(nrows, ncols), _get_geo(header, nrows)
+
+
+def read_raw_raster(filepath, header_path=None):
+    """!
+    Read a raw binary raster file, described by its ESRI header file.
+    Only the first band is read, through a memory map, and is never fully loaded.
+    @param filepath: the raster file path, eg. .bil, .flt, .raw.
+    @param header_path: the header file path, if None the .hdr next to the raster file.
+    @return the memory-mapped (nrows, ncols) array of values from north to south, and the georeference dict.
+    """
+    header_path = header_path or f"{os.path.splitext(filepath)[0]}.hdr"
+    with open(header_path, "r") as f:
+        header = _parse_header(f.readlines())
+    nrows, ncols = int(header["nrows"]), int(header["ncols"])
+    nbands = int(header.get("nbands", 1))
+    # Data type
+    is_float = filepath.lower().endswith(".flt")
+    nbits = int(header.get("nbits", is_float and 32 or 8))
+    pixeltype = header.get("pixeltype", is_float and "float" or "unsignedint").lower()
+    if pixeltype.startswith("float"):
+        kind = "f"
+    elif pixeltype in ("signedint", "unsignedint"):
+        kind = pixeltype == "signedint" and "i" or "u"
+    else:
+        raise ValueError(f"Unsupported PIXELTYPE <{pixeltype}> in: {header_path}")
+    byteorder = header.get("byteorder", "i").lower()
+    dtype = np.dtype(f"{byteorder[0] in ('m', 'b') and '>' or '<'}{kind}{nbits // 8}")
+    # Layout
+    layout = header.get("layout", "bil").lower()
+    shape = {
+        "bil": (nrows, nbands, ncols),
+        "bsq": (nbands, nrows, ncols),
+        "bip": (nrows, ncols, nbands),
+    }[layout]
+    data = np.memmap(
+        filepath,
+        dtype=dtype,
+        mode="r",
+        offset=int(header.get("skipbytes", 0)),
+        shape=shape,
+    )
+    values = {"bil": data[:, 0, :], "bsq": data[0], "bip": data[:, :, 0]}[layout]
+    return values, _get_geo(header, nrows)
+
+
+def read_raster(filepath):
+    """!
+    Read a raster file, choosing the reader by file extension.
+    @param filepath: the raster file path, .asc for ESRI ASCII grid, otherwise raw binary.
+    @return the (nrows, ncols) array of values from north to south, and the georeference dict.
+    """
+    if filepath.lower().endswith((".asc", ".txt")):
+        return read_esri_ascii(filepath)
+    return read_raw_raster(filepath)
+
+
+def _get_landuse_codes(landuse, nodata, blocks):
+    """!
+    Get the landuse codes, by blocks of rows.
+    @param landuse: the (nrows, ncols) array of landuse codes, eg. memory-mapped.
+    @param nodata: the landuse no data value, or None.
+    @param blocks: the list of first and last row, excluded, of each block.
+    @return the sorted array of landuse codes, and True if there are no data cells.
+    """
+    codes = np.unique(np.concatenate([np.unique(landuse[r0:r1]) for r0, r1 in blocks]))
+    if nodata is None or not (codes == nodata).any():
+        return codes, False
+    return codes[codes != nodata], True
+
+
+def raster_to_grid(
+    values, geo, landuse=None, landuse_nodata=None, filepath=None, block_rows=1024
+):
+    """!
+    Get the terrain grid of face centers from an elevation raster, by blocks of rows.
+    No data elevations are set to the min elevation, no data landuse cells to INERT.
+    @param values: the (nrows, ncols) array of elevations from north to south, eg. memory-mapped.
+    @param geo: the georeference dict.
+    @param landuse: the optional (nrows, ncols) array of landuse codes, eg. memory-mapped.
+    @param landuse_nodata: the landuse no data value, or None.
+    @param filepath: the .npy file path of the memory-mapped grid, if None the grid is in memory.
+    @param block_rows: the number of rows per block.
+    @return the (nrows, ncols, 4) grid, with properties from 1, and the landuse codes by property, None for INERT.
+    """
+    nrows, ncols = values.shape
+    if nrows < 2 or ncols < 2:
+        raise ValueError("Raster too small")
+    if landuse is not None and landuse.shape != values.shape:
+        raise ValueError(
+            f"Different elevation and landuse raster shapes: {values.shape}, {landuse.shape}"
+        )
+    blocks = [(r0, min(nrows, r0 + block_rows)) for r0 in range(0, nrows, block_rows)]
+    # Min elevation, for no data values
+    nodata = geo.get("nodata")
+    if nodata is not None:
+        mins = list()
+        for r0, r1 in blocks:
+            z = values[r0:r1]
+            z = z[z != nodata]
+            if z.size:
+                mins.append(z.min())
+        if not mins:
+            raise ValueError("No elevation data in raster")
+        z_min = min(mins)
+    # Landuse codes, property 1 is INERT when there are no data cells
+    codes, has_inert = [None], True
+    if landuse is not None:
+        codes, has_inert = _get_landuse_codes(landuse, landuse_nodata, blocks)
+    # Fill the grid, block by block
+    shape = nrows, ncols, 4
+    if filepath:
+        grid = np.lib.format.open_memmap(
+            filepath, mode="w+", dtype=np.float64, shape=shape
+        )
+    else:
+        grid = np.empty(shape)
+    xs = geo["x0"] + np.arange(ncols) * geo["dx"]
+    for r0, r1 in blocks:
+        block = grid[r0:r1]
+        block[:, :, 0] = xs
+        block[:, :, 1] = (geo["y0"] - np.arange(r0, r1) * geo["dy"])[:, None]
+        block[:, :, 2] = values[r0:r1]
+        if nodata is not None:
+            z = block[:, :, 2]
+            z[values[r0:r1] == nodata] = z_min
+        if landuse is None:
+            block[:, :, 3] = 1
+            continue
+        lu = landuse[r0:r1]
+        block[:, :, 3] = np.searchsorted(codes, lu) + 1 + has_inert
+        if has_inert:
+            block[:, :, 3][lu == landuse_nodata] = 1
+    if landuse is not None:
+        codes = (has_inert and [None] or []) + codes.tolist()
+    return grid, codes
+
+
+def test():
+    print("Test")
+    rijk, rxbs, mijk, mxbs, msgs = align_meshes(
+        rijk=[15, 37, 51],
+        rxbs=[0, 5, 0, 5, 0, 5],
+        mijk=[9, 38, 20],
+        mxbs=[0, 5, 0, 5, 5, 10],
+        poisson=True,
+        protect_rl=True,
+    )
+    print(rijk, rxbs, mijk, mxbs, msgs)
+
+
+# if __name__ == "__main__":
+#     test()
+
+
+# TODO @GISSI -> Verification of calc_triangulation using an STL file as output
+def test2(filepath):
+    print("Test2:", filepath)
+    [nodes, connectivity, properties] = calc_triangulation(filepath)
+    # print(nodes)  # [[1.,2.,3.],[...],...]
+    # print(connectivity)  # [[1,2,3], [...], ...]
+    # print(properties)  # [1,2,3,4, ...]
+    c = 471000.0, 4915200.0, 0.0
+    verts_str = "".join(
+        (f"{v[0]-c[0]:.3f},{v[1]-c[1]:.3f},{v[2]-c[2]:.3f}," for v in nodes)
+    )
+    faces_str = "".join(
+        (
+            f"{vi[0]},{vi[1]},{vi[2]},{int(properties[fi])},"
+            for fi, vi in enumerate(connectivity)
+        )
+    )
+
+    f = open(f"{filepath}.fds", "w")
+    f.write("&MISC ORIGIN_LAT=8.635897 ORIGIN_LON=44.389503 /\n")
+    f.write("&DEVC ID='FIRE_START' XYZ=1143.6,1027.7,192.0 QUANTITY='TEMPERATURE' /\n")
+    f.write("&SURF ID='P01-A05' RGB=249,197,92 /\n")
+    f.write("&SURF ID='P02-A04' RGB=254,193,119 /\n")
+    f.write("&SURF ID='P03-Barren' RGB=133,153,156 /\n")
+    f.write("&SURF ID='P04-A03' RGB=236,212,99 /\n")
+    f.write("&SURF ID='P05-A10' RGB=114,154,85 /\n")
+    f.write("&SURF ID='P06-A01' RGB=255,254,212 /\n")
+    f.write("&SURF ID='P07-A08' RGB=229,253,214 /\n")
+    f.write(
+        f"&GEOM ID='Cogoleto Fire' SURF_ID='P01-A05','P02-A04','P03-Barren','P04-A03','P05-A10','P06-A01','P07-A08'\nVERTS={verts_str}\nFACES={faces_str} /\n"
+    )
+    f.close()
+
+
+    c = 471000.0, 4915200.0, 0.0
+    verts_str = "\n".join(
+        (f"v {v[0]-c[0]:.3f} {v[1]-c[1]:.3f} {v[2]-c[2]:.3f} " for v in nodes)
+    )
+    faces_str = "\n".join(
+        (
+            f"usemtl P{int(properties[fi])}\nf {vi[0]+1} {vi[1]+1} {vi[2]+1}"
+            for fi, vi in enumerate(connectivity)
+        )
+    )
+
+
+    f = open(f"{filepath[:-4]}.obj", "w")
+    f.write(f"mtllib {filepath[:-4]}.mtl\n")
+    f.write("\n")
+    f.write(f"o terrain\n")
+    f.write("\n")
+    f.write(verts_str)
+    f.write("\n")
+    f.write(faces_str)
+    f.close()
+
+
+    exit()
+
+    f = open("output.stl", "w")
+    f.write("solid\n")
+
+    center = 471000, 4915200, 0.0
+
+    for face in connectivity:
+        f.write("    facet normal 0 0 1\n")
+        f.write("        outer loop\n")
+
+        for i in range(3):
+            node = nodes[face[i]]
+            f.write(
+                "            vertex "
+                + str(node[0] - center[0])
+                + " "
+                + str(node[1] - center[1])
+                + " "
+                + str(node[2] - center[2])
+                + "\n"
+            )
+
+    f.write("        endloop\n")
+    f.write("    endfacet\n")
+
+    f.write("endsolid\n")
+    f.close()
+
+
+if __name__ == "__main__":
+
+    # Check arguments
+    import sys
+
+    if len(sys.argv) != 2:
+        print("\nUsage: terrain.py <filepath>")
+        sys.exit(2)
+    filepath = sys.argv[1]
+
+    # test(filepath)
+    test2(filepath)
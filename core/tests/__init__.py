@@ -0,0 +1,3 @@
+"""!
+BlenderFDS, tests of the core package, run with pytest outside of Blender.
+"""
@@ -0,0 +1,169 @@
+"""!
+BlenderFDS, tests of the Python representations of FDS entities.
+"""
+
+import logging
+
+import pytest
+
+from .. import fds_case as fc
+from ..exceptions import BFException
+
+# Helpers
+
+
+def _get_f90(n):
+    """!
+    Get an FDS formatted string of n OBST namelists, between HEAD and TAIL.
+    """
+    lines = ["&HEAD CHID='test' TITLE='Test case' /"]
+    for i in range(n):
+        lines.append(
+            f"&OBST ID='OB{i}' XB={i * 0.1:.3f},{i * 0.1 + 0.1:.3f},0.,1.,0.,1.\n"
+            f"      SURF_ID='INERT' THICKEN={i % 2 and 'T' or 'F'} /"
+        )
+    lines.append("&TAIL /")
+    return "\n".join(lines)
+
+
+def _to_fds(fds_case):
+    """!
+    Get the FDS formatted strings of all namelists.
+    """
+    return list(nl.to_fds() for nl in fds_case.fds_namelists)
+
+
+# Parallel parsing
+
+
+def test_from_fds_parallel(monkeypatch, caplog):
+    f90 = _get_f90(400)
+    serial = fc.FDSCase()
+    serial.from_fds(f90, keep_f90=True)
+    monkeypatch.setattr(fc, "parallel_min_len", 0)
+    parallel = fc.FDSCase()
+    with caplog.at_level(logging.WARNING, logger=fc.log.name):
+        parallel.from_fds(f90, max_workers=2, keep_f90=True)
+    assert "Parallel parsing not available" not in caplog.text
+    assert len(parallel.fds_namelists) == 402
+    assert _to_fds(parallel) == _to_fds(serial)
+    assert len(parallel.get_fds_namelists_by_label("OBST")) == 400
+    for nl, other in zip(parallel.fds_namelists, serial.fds_namelists):
+        assert nl.f90 and nl.f90 == other.f90
+        for p, o in zip(nl.fds_params, other.fds_params):
+            assert (p.fds_label, p.values, p.precision, p.exponential) == (
+                o.fds_label,
+                o.values,
+                o.precision,
+                o.exponential,
+            )
+    nl = parallel.fds_namelists[5]
+    assert nl.get_fds_param_by_label("ID").values == ("OB4",)
+    assert nl.get_fds_param_by_label("THICKEN").values == (False,)
+    # Original strings kept only if requested
+    parallel.from_fds(f90, max_workers=2)
+    assert all(nl.f90 is None for nl in parallel.fds_namelists)
+
+
+def test_from_fds_parallel_error(monkeypatch, caplog):
+    monkeypatch.setattr(fc, "parallel_min_len", 0)
+    f90 = _get_f90(100) + "\n&OBST ID='Bad' XB=1,2,3 4 /"
+    with pytest.raises(BFException):
+        fc.FDSCase().from_fds(f90)
+    with caplog.at_level(logging.WARNING, logger=fc.log.name):
+        with pytest.raises(BFException):
+            fc.FDSCase().from_fds(f90, max_workers=2)
+    assert "Parallel parsing not available" not in caplog.text
+
+
+def test_to_tuple():
+    for keep_f90 in (False, True):
+        fds_case = fc.FDSCase()
+        fds_case.from_fds(_get_f90(3), keep_f90=keep_f90)
+        for nl in fds_case.fds_namelists:
+            other = fc.FDSNamelist.from_tuple(nl.to_tuple())
+            assert other.fds_label == nl.fds_label and other.f90 == nl.f90
+            assert (nl.f90 is not None) == keep_f90
+            assert other.to_fds() == nl.to_fds()
+
+
+# Indexes
+
+
+def test_namelist_index():
+    nl = fc.FDSNamelist(
+        fds_label="OBST",
+        fds_params=[fc.FDSParam(fds_label="ID", values=["A"])],
+    )
+    p_id = nl.get_fds_param_by_label("ID")
+    assert p_id.values == ["A"]
+    # Changes of the list, through its mutators
+    p_xb = fc.FDSParam(fds_label="XB", values=[0, 1, 0, 1, 0, 1])
+    nl.fds_params.append(p_xb)
+    assert nl.get_fds_param_by_label("XB") is p_xb
+    nl.fds_params[0] = fc.FDSParam(fds_label="ID", values=["B"])
+    assert nl.get_fds_param_by_label("ID").values == ["B"]
+    del nl.fds_params[0]
+    assert nl.get_fds_param_by_label("ID") is None
+    nl.fds_params = [p_id]
+    assert nl.get_fds_param_by_label("ID") is p_id
+    # Label edits
+    p_id.fds_label = "SURF_ID"
+    assert nl.get_fds_param_by_label("ID") is None
+    assert nl.get_fds_param_by_label("SURF_ID") is p_id
+    # Indexed append and remove, first param by label
+    p_id2 = fc.FDSParam(fds_label="SURF_ID", values=["INERT"])
+    nl.append_fds_param(p_id2)
+    assert nl.get_fds_param_by_label("SURF_ID") is p_id
+    nl.remove_fds_param(p_id)
+    assert nl.get_fds_param_by_label("SURF_ID") is p_id2
+
+
+def test_case_index():
+    fds_case = fc.FDSCase()
+    fds_case.from_fds(_get_f90(3))
+    assert len(fds_case.get_fds_namelists_by_label("OBST")) == 3
+    fds_case.fds_namelists.pop()  # TAIL
+    fds_case.fds_namelists.pop()
+    assert len(fds_case.get_fds_namelists_by_label("OBST")) == 2
+    assert not fds_case.get_fds_namelists_by_label("TAIL")
+    fds_case.fds_namelists[1].fds_label = "HOLE"
+    assert len(fds_case.get_fds_namelists_by_label("OBST")) == 1
+    assert len(fds_case.get_fds_namelists_by_label("HOLE")) == 1
+    nl = fc.FDSNamelist(fds_label="OBST")
+    fds_case.append_fds_namelist(nl)
+    assert fds_case.get_fds_namelists_by_label("OBST")[-1] is nl
+    fds_case.remove_fds_namelist(nl)
+    assert nl not in fds_case.get_fds_namelists_by_label("OBST")
+
+
+def test_case_id_index():
+    fds_case = fc.FDSCase()
+    fds_case.from_fds(_get_f90(3))
+    ob1 = fds_case.get_fds_namelist_by_id("OB1")
+    assert ob1 is fds_case.fds_namelists[2]
+    assert fds_case.get_fds_namelist_by_id("Missing") is None
+    # Value and label edits
+    p_id = ob1.get_fds_param_by_label("ID")
+    p_id.values = ("New",)
+    assert fds_case.get_fds_namelist_by_id("OB1") is None
+    assert fds_case.get_fds_namelist_by_id("New") is ob1
+    p_id.fds_label = "FYI"
+    assert fds_case.get_fds_namelist_by_id("New") is None
+    # Param list edits
+    ob1.fds_params.insert(0, fc.FDSParam(fds_label="ID", values=["Other"]))
+    assert fds_case.get_fds_namelist_by_id("Other") is ob1
+    ob1.remove_fds_param(ob1.fds_params[0])
+    assert fds_case.get_fds_namelist_by_id("Other") is None
+    ob1.append_fds_param(fc.FDSParam(fds_label="ID", values=["OB1"]))
+    assert fds_case.get_fds_namelist_by_id("OB1") is ob1
+    # Namelist list edits, first namelist by ID
+    nl = fc.FDSNamelist(
+        fds_label="HOLE", fds_params=[fc.FDSParam(fds_label="ID", values=["OB0"])]
+    )
+    fds_case.append_fds_namelist(nl)
+    assert fds_case.get_fds_namelist_by_id("OB0") is fds_case.fds_namelists[1]
+    fds_case.remove_fds_namelist(fds_case.fds_namelists[1])
+    assert fds_case.get_fds_namelist_by_id("OB0") is nl
+    del fds_case.fds_namelists[-1]
+    assert fds_case.get_fds_namelist_by_id("OB0") is None
@@ -0,0 +1,281 @@
+"""!
+BlenderFDS, tests of the FDS MESH tools.
+"""
+
+import random
+from math import floor, ceil
+from itertools import product, combinations
+
+import pytest
+
+from .. import mesh_tools as mt
+
+# Helpers
+
+
+def _to_cells(ijk, xbs, mxbs):
+    """!
+    Get the coarse cell indexes of a mesh inside the coarse mesh.
+    """
+    cs = mt.calc_cell_sizes(ijk, xbs)
+    return tuple(round((mxbs[i] - xbs[i - i % 2]) / cs[i // 2]) for i in range(6))
+
+
+def _random_refine_case(rnd):
+    """!
+    Get a random coarse mesh, regions and refine_mesh parameters.
+    """
+    ijk = tuple(rnd.randint(4, 40) for _ in range(3))
+    xbs = (0.0, ijk[0] * 0.1, 0.0, ijk[1] * 0.1, 0.0, ijk[2] * 0.1)
+    regions = list()
+    for _ in range(rnd.randint(1, 3)):
+        region = list()
+        for a in range(3):
+            x0 = rnd.uniform(xbs[2 * a], xbs[2 * a + 1])
+            region.extend((x0, x0 + rnd.uniform(0.05, xbs[2 * a + 1] / 2)))
+        regions.append(region)
+    kwargs = dict(
+        ratio=rnd.choice((2, 4)),
+        margin=rnd.randint(0, 3),
+        poisson=rnd.random() < 0.7,
+    )
+    return ijk, xbs, regions, kwargs
+
+
+# Nested refinement
+
+
+def test_refine_mesh_fuzz():
+    rnd = random.Random(0)
+    for _ in range(200):
+        ijk, xbs, regions, kwargs = _random_refine_case(rnd)
+        meshes, msgs = mt.refine_mesh(ijk, xbs, regions, **kwargs)
+        cs = mt.calc_cell_sizes(ijk, xbs)
+        owners = dict()
+        for im, (mijk, mxbs, r) in enumerate(meshes):
+            b = _to_cells(ijk, xbs, mxbs)
+            for a in range(3):
+                n = b[2 * a + 1] - b[2 * a]
+                # Min thickness, no slab MESH
+                assert n >= min(3, ijk[a]), (ijk, regions, kwargs, mxbs)
+                assert mijk[a] == n * r
+            # Exact tiling, no overlap
+            for c in product(*(range(b[2 * a], b[2 * a + 1]) for a in range(3))):
+                assert c not in owners
+                owners[c] = r
+        assert len(owners) == ijk[0] * ijk[1] * ijk[2]
+        # Region coverage by fine meshes
+        for region in regions:
+            ranges = list()
+            for a in range(3):
+                i0 = floor(max(region[2 * a], xbs[2 * a]) / cs[a] + 1e-6)
+                i1 = ceil(min(region[2 * a + 1], xbs[2 * a + 1]) / cs[a] - 1e-6)
+                ranges.append(range(i0, max(i1, i0 + 1)))
+            assert all(owners[c] > 1 for c in product(*ranges))
+        # Poisson restriction, possible on these cases
+        if kwargs["poisson"]:
+            assert not any("Poisson" in msg for msg in msgs), msgs
+
+
+def test_refine_mesh_simple():
+    meshes, _ = mt.refine_mesh(
+        (32, 32, 32), (0, 3.2, 0, 3.2, 0, 3.2), [(1.4, 1.8, 1.4, 1.8, 1.4, 1.8)]
+    )
+    fine = [m for m in meshes if m[2] > 1]
+    assert len(fine) == 1
+    assert meshes[0] is fine[0]
+    assert all(mt.is_poisson_n(n) for m in meshes for n in m[0][1:])
+
+
+def test_refine_mesh_budget():
+    ijk, xbs = (20, 20, 20), (0, 2, 0, 2, 0, 2)
+    region = [(0.8, 1.2, 0.8, 1.2, 0.8, 1.2)]
+    meshes, _ = mt.refine_mesh(ijk, xbs, region, ratio=4, max_cells=20000)
+    assert max(m[2] for m in meshes) == 2
+    with pytest.raises(ValueError):
+        mt.refine_mesh(ijk, xbs, region, max_cells=8000)
+
+
+# MESH overlaps, gaps and interfaces check
+
+
+def test_check_meshes_kinds():
+    ijks = [(10, 10, 10)] * 2
+    xb0 = (0.0, 1.0, 0.0, 1.0, 0.0, 1.0)
+    issues = mt.check_meshes(ijks, [xb0, (0.5, 1.5, 0.0, 1.0, 0.0, 1.0)])
+    assert [i[2] for i in issues] == ["OVERLAP"]
+    issues = mt.check_meshes(ijks, [xb0, (1.05, 2.05, 0.0, 1.0, 0.0, 1.0)])
+    assert [i[2] for i in issues] == ["GAP"]
+    issues = mt.check_meshes(ijks, [xb0, (1.0, 2.0, 0.05, 1.05, 0.0, 1.0)])
+    assert [i[2] for i in issues] == ["MISALIGNED"]
+    assert not mt.check_meshes(ijks, [xb0, (1.0, 2.0, 0.0, 1.0, 0.0, 1.0)])
+    # A gap of one cell is far apart
+    assert not mt.check_meshes(ijks, [xb0, (1.1, 2.1, 0.0, 1.0, 0.0, 1.0)])
+
+
+def test_check_meshes_filled_gap():
+    ijks = [(10, 10, 10), (10, 10, 10), (1, 10, 10)]
+    xbss = [
+        (0.0, 1.0, 0.0, 1.0, 0.0, 1.0),
+        (1.05, 2.05, 0.0, 1.0, 0.0, 1.0),
+        (1.0, 1.05, 0.0, 1.0, 0.0, 1.0),
+    ]
+    assert not mt.check_meshes(ijks, xbss)
+    # Partially filled
+    ijks[2], xbss[2] = (1, 5, 10), (1.0, 1.05, 0.0, 0.5, 0.0, 1.0)
+    assert [i[:3] for i in mt.check_meshes(ijks, xbss)] == [(0, 1, "GAP")]
+
+
+def test_check_meshes_refined():
+    rnd = random.Random(1)
+    for _ in range(100):
+        ijk, xbs, regions, kwargs = _random_refine_case(rnd)
+        meshes, _ = mt.refine_mesh(ijk, xbs, regions, **kwargs)
+        ijks, xbss = [m[0] for m in meshes], [m[1] for m in meshes]
+        assert not mt.check_meshes(ijks, xbss)
+
+
+# Poisson constraint
+
+
+def test_poisson_ns():
+    assert [n for n in range(1, 33) if mt.is_poisson_n(n)] == [
+        1, 2, 3, 4, 5, 6, 8, 9, 10, 12, 15, 16, 18, 20, 24, 25, 27, 30, 32,
+    ]  # fmt: skip
+    for n in (7, 11, 13, 31, 1000):
+        assert mt.is_poisson_n(mt.get_poisson_n_above(n))
+        assert mt.get_poisson_n_above(n) >= n >= mt.get_poisson_n_below(n)
+
+
+# Split
+
+
+def _assert_tiling(ijk, xbs, meshes):
+    """!
+    Check that the sub-meshes tile the mesh, with the same cell sizes.
+    """
+    cs = mt.calc_cell_sizes(ijk, xbs)
+    volume = 0.0
+    for mijk, mxbs in meshes:
+        assert mt.calc_cell_sizes(mijk, mxbs) == pytest.approx(cs)
+        volume += (mxbs[1] - mxbs[0]) * (mxbs[3] - mxbs[2]) * (mxbs[5] - mxbs[4])
+    assert not mt.check_meshes([m[0] for m in meshes], [m[1] for m in meshes])
+    return volume
+
+
+def test_split_mesh():
+    ijk, xbs = (40, 20, 10), (0.0, 4.0, 0.0, 2.0, 0.0, 1.0)
+    meshes, msgs = mt.split_mesh(ijk, xbs, n=8)
+    assert len(meshes) == 8
+    assert sum(m[0][0] * m[0][1] * m[0][2] for m in meshes) == 8000
+    assert _assert_tiling(ijk, xbs, meshes) == pytest.approx(8.0)
+    assert msgs[0] == "MESH split in 4x2x1 sub-meshes"
+    # By max cells
+    meshes, _ = mt.split_mesh(ijk, xbs, max_cells=1500)
+    assert all(m[0][0] * m[0][1] * m[0][2] <= 1500 for m in meshes)
+    with pytest.raises(ValueError):
+        mt.split_mesh(ijk, xbs)
+    with pytest.raises(ValueError):
+        mt.split_mesh((2, 2, 2), xbs, n=27)
+
+
+def test_split_mesh_poisson():
+    ijk, xbs = (10, 14, 14), (0.0, 1.0, 0.0, 1.4, 0.0, 1.4)
+    meshes, msgs = mt.split_mesh(ijk, xbs, n=4, poisson=True)
+    assert all(mt.is_poisson_n(n) for m in meshes for n in m[0][1:])
+    assert sorted(set(m[0][1] for m in meshes)) == [6, 8]  # 14 = 8 + 6
+    assert _assert_tiling(ijk, xbs, meshes) == pytest.approx(1.0 * 1.4 * 1.4)
+    assert not any("extended" in msg for msg in msgs)
+    # No balanced good cell counts, extended
+    ijk, xbs = (5, 53, 5), (0.0, 0.5, 0.0, 5.3, 0.0, 0.5)
+    meshes, msgs = mt.split_mesh(ijk, xbs, n=2, poisson=True)
+    assert [m[0] for m in meshes] == [(5, 27, 5), (5, 27, 5)]
+    assert _assert_tiling(ijk, xbs, meshes) == pytest.approx(0.5 * 5.4 * 0.5)
+    assert "MESH extended by 1 cells along y axis" in msgs
+
+
+# Alignment
+
+
+def test_align_all_meshes():
+    ijks = [(10, 10, 10), (21, 19, 10), (9, 11, 10)]
+    xbss = [
+        (0.0, 1.0, 0.0, 1.0, 0.0, 1.0),
+        (1.02, 2.0, 0.0, 1.0, 0.0, 1.0),
+        (2.0, 3.0, 0.03, 0.98, 0.0, 1.0),
+    ]
+    assert mt.check_meshes(ijks, xbss)
+    ijks, xbss, msgs, conflicts = mt.align_all_meshes(ijks, xbss)
+    assert not conflicts
+    assert msgs[0] == "3 MESHes aligned in 1 groups"
+    assert not mt.check_meshes(ijks, xbss)
+    assert xbss[0][1] == pytest.approx(xbss[1][0])
+    assert xbss[1][1] == pytest.approx(xbss[2][0])
+
+
+def test_align_all_meshes_poisson():
+    ijks = [(10, 10, 10), (10, 7, 11)]
+    xbss = [(0.0, 1.0, 0.0, 1.0, 0.0, 1.0), (1.0, 2.0, 0.0, 0.7, 0.0, 1.1)]
+    ijks, xbss, msgs, conflicts = mt.align_all_meshes(ijks, xbss, poisson=True)
+    assert not conflicts
+    assert all(mt.is_poisson_n(n) for ijk in ijks for n in ijk[1:])
+    assert not mt.check_meshes(ijks, xbss)
+
+
+# MPI process load balancing and case estimate
+
+
+def test_calc_mesh_costs():
+    mxbs = [(0.0, 1.0, 0.0, 1.0, 0.0, 1.0), (1.0, 2.0, 0.0, 1.0, 0.0, 1.0)]
+    xbs = [(0.1, 0.2, 0.1, 0.2, 0.1, 0.2)] * 3 + [(1.5, 1.6, 0.1, 0.2, 0.1, 0.2)]
+    faces = [(1.2, 1.3, 0.1, 0.2, 0.1, 0.2)]
+    costs, counts = mt.calc_mesh_costs(mxbs, [100, 100], xbs, faces)
+    assert counts == [[3, 0], [1, 1]]
+    assert costs == [100 + 8.0 * 3, 100 + 8.0 + 4.0]
+
+
+def test_balance_mpi_processes():
+    costs = [7.0, 5.0, 4.0, 3.0, 3.0, 2.0]
+    processes, loads, imbalance = mt.balance_mpi_processes(costs, 2)
+    assert processes == [0, 0, 1, 1, 1, 1]
+    assert loads == [12.0, 12.0]
+    assert imbalance == 0.0
+    for p in range(2):
+        assert sum(c for c, q in zip(costs, processes) if q == p) == loads[p]
+    # More processes than MESHes
+    processes, loads, imbalance = mt.balance_mpi_processes([1.0, 3.0], 8)
+    assert sorted(processes) == [0, 1] and len(loads) == 2
+    assert imbalance == pytest.approx(0.5)
+
+
+def test_balance_mpi_processes_order():
+    rnd = random.Random(2)
+    for _ in range(200):
+        n, n_processes = rnd.randint(1, 8), rnd.randint(1, 5)
+        costs = list(rnd.choice((0.0, rnd.uniform(1.0, 100.0))) for _ in range(n))
+        processes, loads, _ = mt.balance_mpi_processes(costs, n_processes)
+        # Non-decreasing in MESH order, as required by FDS, all processes used
+        assert processes == sorted(processes)
+        assert sorted(set(processes)) == list(range(min(n, n_processes)))
+        # Optimal contiguous split
+        best = min(
+            max(sum(costs[a:b]) for a, b in zip((0,) + cuts, cuts + (n,)))
+            for cuts in combinations(range(1, n), min(n, n_processes) - 1)
+        )
+        assert max(loads) == pytest.approx(best)
+
+
+def test_estimate_case():
+    ijks = [(10, 10, 10), (20, 20, 20)]
+    xbss = [(0.0, 1.0, 0.0, 1.0, 0.0, 1.0), (1.0, 2.0, 0.0, 1.0, 0.0, 1.0)]
+    e = mt.estimate_case(ijks, xbss, t_end=9.0, counts={"devcs": 2})
+    assert e["n_cells"] == 9000 and e["n_mpi_processes"] == 2
+    assert e["max_cells_per_process"] == 8000
+    assert e["min_cell_size"] == pytest.approx(0.05)
+    assert e["time_step"] == pytest.approx(0.9 * 0.05 / 5.0)
+    assert e["n_time_steps"] == 1000
+    assert e["wall_clock_time"] == pytest.approx(1000 * 8000 * 2e-6)
+    assert e["counts"] == {"devcs": 2}
+    # Both meshes in the same MPI process
+    e = mt.estimate_case(ijks, xbss, mpi_processes=[0, 0])
+    assert e["cells_per_process"] == [9000] and e["wall_clock_time"] == 0.0
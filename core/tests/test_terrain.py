@@ -0,0 +1,181 @@
+"""!
+BlenderFDS, tests of the terrain import/export.
+"""
+
+import os, tempfile
+
+import numpy as np
+import pytest
+
+from .. import terrain
+from ..bingeom import read_bingeom
+
+# Helpers
+
+
+def _write_csv(filepath, n_rows=5, n_cols=7, z0=10.0):
+    """!
+    Write a csv file of a sloped terrain, with two properties.
+    """
+    with open(filepath, "w") as f:
+        f.write("x,y,z,property\n")
+        for j in range(n_rows):
+            for i in range(n_cols):
+                x, y = 100.0 + 2.0 * i, 200.0 + 3.0 * j
+                f.write(f"{x},{y},{z0 + 0.5 * x - 0.25 * y},{1 + (i > 2)}\n")
+
+
+def _concat_blocks(blocks):
+    """!
+    Concatenate the triangulation blocks.
+    """
+    return tuple(np.concatenate(arrays) for arrays in zip(*blocks))
+
+
+# Triangulation
+
+
+def test_calc_triangulation(tmp_path):
+    csv = str(tmp_path / "dem.csv")
+    _write_csv(csv)
+    nodes, connectivity, properties = terrain.calc_triangulation(csv)
+    assert nodes.shape == (6 * 8, 3)
+    assert connectivity.shape == (2 * 5 * 7, 3)
+    assert connectivity.min() == 0 and connectivity.max() == 6 * 8 - 1
+    assert properties.tolist() == 5 * ([1] * 6 + [2] * 8)
+    # Nodes at the face corners, on the same plane
+    assert nodes[0, :2].tolist() == [99.0, 198.5]
+    assert nodes[-1, :2].tolist() == [113.0, 213.5]
+    z = 10.0 + 0.5 * nodes[:, 0] - 0.25 * nodes[:, 1]
+    assert nodes[:, 2] == pytest.approx(z)
+
+
+def test_iter_triangulation(tmp_path, monkeypatch):
+    csv = str(tmp_path / "dem.csv")
+    _write_csv(csv, n_rows=11, n_cols=4)
+    monkeypatch.setattr(terrain, "chunk_size", 64)  # many chunks
+    grid = terrain.get_grid(csv, cache_dir=str(tmp_path))
+    assert isinstance(grid, np.memmap) and grid.shape == (11, 4, 4)
+    expected = terrain.calc_triangulation(csv)
+    for block_rows in (1, 3, 11, 100):
+        blocks = terrain.iter_triangulation(grid, block_rows=block_rows)
+        for a, b in zip(_concat_blocks(blocks), expected):
+            assert np.array_equal(a, b)
+
+
+def test_terrain_to_bingeom(tmp_path):
+    csv = str(tmp_path / "dem.csv")
+    _write_csv(csv)
+    grid = terrain.get_grid(csv, cache_dir=str(tmp_path))
+    filepath = str(tmp_path / "terrain.bingeom")
+    origin = (100.0, 200.0, 0.0)
+    terrain.terrain_to_bingeom(grid, filepath, origin=origin, block_rows=2)
+    n_surf_id, verts, faces, surfs, volus = read_bingeom(filepath)
+    nodes, connectivity, properties = terrain.calc_triangulation(csv)
+    assert n_surf_id == 2
+    assert np.allclose(verts, (nodes - origin).ravel())
+    assert np.array_equal(faces, connectivity.ravel() + 1)
+    assert np.array_equal(surfs, properties)
+    assert volus.size == 0
+
+
+# Grid cache
+
+
+def test_get_grid_cache(tmp_path):
+    csv = str(tmp_path / "dem.csv")
+    _write_csv(csv)
+    grid = terrain.get_grid(csv)
+    assert os.path.dirname(grid.filename) == str(tmp_path)
+    assert terrain.get_grid(csv).filename == grid.filename  # reused
+    # Rebuilt on change, same mtime but different size
+    st = os.stat(csv)
+    _write_csv(csv, z0=1000.0)
+    os.utime(csv, ns=(st.st_atime_ns, st.st_mtime_ns))
+    new_grid = terrain.get_grid(csv)
+    assert new_grid.filename != grid.filename
+    assert new_grid[0, 0, 2] == grid[0, 0, 2] + 990.0
+    del grid, new_grid
+    assert len([f for f in os.listdir(tmp_path) if f.endswith(".npy")]) == 1
+
+
+def test_get_grid_read_only(tmp_path, monkeypatch):
+    csv_dir, tmp_dir = tmp_path / "read_only", tmp_path / "tmp"
+    csv_dir.mkdir()
+    csv = str(csv_dir / "dem.csv")
+    _write_csv(csv)
+    open_memmap = np.lib.format.open_memmap
+
+    def _open_memmap(filename, *args, **kwargs):
+        if os.path.dirname(filename) == str(csv_dir):
+            raise PermissionError(filename)
+        return open_memmap(filename, *args, **kwargs)
+
+    monkeypatch.setattr(np.lib.format, "open_memmap", _open_memmap)
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_dir))
+    grid = terrain.get_grid(csv)
+    assert os.path.dirname(grid.filename) == str(tmp_dir / "blenderfds")
+    assert os.listdir(csv_dir) == ["dem.csv"]  # no partial file left
+    assert terrain.get_grid(csv).filename == grid.filename  # reused
+    # Same file name in another directory, another cache
+    other_csv = str(tmp_path / "dem.csv")
+    _write_csv(other_csv)
+    assert terrain.get_grid(other_csv).filename != grid.filename
+
+
+# Rasters
+
+
+def test_read_esri_ascii(tmp_path):
+    filepath = str(tmp_path / "dem.asc")
+    with open(filepath, "w") as f:
+        f.write("ncols 3\nnrows 2\nxllcorner 100\nyllcorner 200\n")
+        f.write("cellsize 10\nNODATA_value -9999\n1 2 3\n4 -9999 6\n")
+    values, geo = terrain.read_esri_ascii(filepath)
+    assert values.tolist() == [[1, 2, 3], [4, -9999, 6]]
+    assert geo == {"x0": 105.0, "y0": 215.0, "dx": 10.0, "dy": 10.0, "nodata": -9999}
+
+
+def test_read_raw_raster(tmp_path):
+    filepath = str(tmp_path / "dem.bil")
+    values = np.arange(12, dtype="<i2").reshape(3, 4)
+    values.tofile(filepath)
+    with open(str(tmp_path / "dem.hdr"), "w") as f:
+        f.write("BYTEORDER I\nLAYOUT BIL\nNROWS 3\nNCOLS 4\nNBANDS 1\nNBITS 16\n")
+        f.write("PIXELTYPE SIGNEDINT\nULXMAP 100\nULYMAP 200\nXDIM 2\nYDIM 3\n")
+    read_values, geo = terrain.read_raster(filepath)
+    assert isinstance(read_values, np.memmap)
+    assert np.array_equal(read_values, values)
+    assert geo == {"x0": 100.0, "y0": 200.0, "dx": 2.0, "dy": 3.0, "nodata": None}
+
+
+def test_raster_to_grid(tmp_path):
+    values = np.arange(15, dtype=np.float64).reshape(5, 3)
+    values[1, 1] = -9999.0
+    landuse = np.array([[7, 7, 3], [3, 0, 7], [7, 7, 7], [3, 3, 3], [7, 7, 0]])
+    geo = {"x0": 100.0, "y0": 200.0, "dx": 2.0, "dy": 3.0, "nodata": -9999.0}
+    grid, codes = terrain.raster_to_grid(values, geo, landuse, 0, block_rows=2)
+    assert codes == [None, 3, 7]  # no data is INERT
+    assert grid[:, :, 3].tolist() == [
+        [3, 3, 2],
+        [2, 1, 3],
+        [3, 3, 3],
+        [2, 2, 2],
+        [3, 3, 1],
+    ]
+    assert grid[1, 1, 2] == 0.0  # min elevation
+    assert grid[4, 2, :3].tolist() == [104.0, 188.0, 14.0]
+    # Into a memory-mapped file, without landuse no data
+    filepath = str(tmp_path / "grid.npy")
+    mm_grid, codes = terrain.raster_to_grid(
+        values, geo, landuse + 1, 0, filepath=filepath, block_rows=3
+    )
+    assert codes == [1, 4, 8]
+    assert np.array_equal(np.load(filepath), grid)  # same property order
+    # Without landuse
+    grid, codes = terrain.raster_to_grid(values, geo)
+    assert codes == [None] and np.all(grid[:, :, 3] == 1)
+    with pytest.raises(ValueError):
+        terrain.raster_to_grid(values, geo, landuse[:4])
+    with pytest.raises(ValueError):
+        terrain.raster_to_grid(np.full((3, 3), -9999.0), geo)
@@ -1 +1 @@
-from . import mesh_tools
+from ..core import mesh_tools
@@ -8,6 +8,7 @@ from math import floor, ceil
 import bpy, bmesh, mathutils, logging
 
 from ..types import BFException
+from ..bl import progress, profiler
 from . import utils
 
 log = logging.getLogger(__name__)
@@ -40,8 +41,11 @@ def get_fds_trisurface(context, ob, scale_length, check=True, world=True):
     bm = utils.get_object_bmesh(
         context=context, ob=ob, world=world, triangulate=True, lookup=False
     )
+    progress.step()
     if check:
-        _check_bm_sanity(context, ob, bm, protect=True)
+        with profiler.stage("check"):
+            _check_bm_sanity(context, ob, bm, protect=True)
+    progress.step()
     # Get geometric data from bmesh
     fds_verts, fds_faces, fds_surfs = list(), list(), list()
     fds_volus, fds_faces_surfs = list(), list()
@@ -50,6 +54,7 @@ def get_fds_trisurface(context, ob, scale_length, check=True, world=True):
         fds_verts.extend(
             (co.x * scale_length, co.y * scale_length, co.z * scale_length)
         )
+    progress.step()
     for f in bm.faces:
         v = f.verts
         fds_faces.extend((v[0].index + 1, v[1].index + 1, v[2].index + 1))
@@ -58,6 +63,9 @@ def get_fds_trisurface(context, ob, scale_length, check=True, world=True):
             (v[0].index + 1, v[1].index + 1, v[2].index + 1, f.material_index + 1)
         )
     bm.free()  # clean up bmesh
+    profiler.count("verts", len(fds_verts) // 3)
+    profiler.count("faces", len(fds_surfs))
+    progress.step()
     if not fds_verts or not fds_faces:
         raise BFException(ob, "The object is empty")
     return fds_surfids, fds_verts, fds_faces, fds_surfs, fds_volus, fds_faces_surfs
@@ -8,6 +8,7 @@ from math import floor, ceil
 from mathutils import Matrix
 
 from ..types import BFException
+from ..bl import progress, profiler
 from . import utils
 
 log = logging.getLogger(__name__)
@@ -38,20 +39,24 @@ def get_voxels(context, ob, scale_length):
     me_eval = bpy.data.meshes.new_from_object(ob_eval)  # static
     # Create a new Object, in world coo
     ob_tmp = bpy.data.objects.new(f"{ob.name}_voxels_tmp", me_eval)
+    ob_tmp.bf_is_tmp = True  # ignored by cache invalidation
     ob_tmp.data.transform(ob.matrix_world)
     context.collection.objects.link(ob_tmp)
     # Align voxels to world origin and add remesh modifier
     _align_remesh_bbox(context, ob_tmp, voxel_size, centered=ob.bf_xb_center_voxels)
     _add_remesh_mod(context, ob_tmp, voxel_size)
+    progress.step()
     # Get evaluated bmesh from ob_tmp; it is already in world coo
     bm = utils.get_object_bmesh(context, ob_tmp, world=False)
     # Clean up
     bpy.data.meshes.remove(ob_tmp.data, do_unlink=True)  # no mem leaks
+    progress.step()
     # Check
     if len(bm.faces) == 0:  # no faces
         raise BFException(ob, "No voxel created!")
     # Get faces and sort them according to normals
-    x_faces, y_faces, z_faces = _sort_faces_by_normal(bm)
+    with profiler.stage("voxelize"):
+        x_faces, y_faces, z_faces = _sort_faces_by_normal(bm)
     # Choose shorter list of faces, relative functions, and parameters
     choices = [
         (len(x_faces), _get_boxes_along_x, x_faces, _grow_boxes_along_x, 0),
@@ -66,10 +71,16 @@ def get_voxels(context, ob, scale_length):
     grow_boxes_along_second_axis = choices[2][3]  # 2nd axis growing direction
     second_sort_by = choices[1][4]
     # For each face find other sides and build boxes data structure
-    boxes, origin = get_boxes(faces, voxel_size)
+    with profiler.stage("voxelize"):
+        boxes, origin = get_boxes(faces, voxel_size)
+    profiler.count("voxels", len(boxes))
+    progress.step()
     # Join boxes along other axis and return their world coordinates
-    boxes = grow_boxes_along_first_axis(boxes, first_sort_by)
-    boxes = grow_boxes_along_second_axis(boxes, second_sort_by)
+    with profiler.stage("merge"):
+        boxes = grow_boxes_along_first_axis(boxes, first_sort_by)
+        boxes = grow_boxes_along_second_axis(boxes, second_sort_by)
+    profiler.count("boxes", len(boxes))
+    progress.step()
     # Transform boxes to xbs in world coordinates and correct for unit_settings
     xbs = list(_get_box_xbs(boxes, origin, voxel_size, scale_length))
     # Clean up
@@ -545,6 +556,7 @@ def get_pixels(context, ob, scale_length):
     me_eval = bpy.data.meshes.new_from_object(ob_eval)  # static
     # Create a new Object, in world coo
     ob_copy = bpy.data.objects.new(f"{ob.name}_voxels_tmp", me_eval)
+    ob_copy.bf_is_tmp = True  # ignored by cache invalidation
     ob_copy.data.transform(ob.matrix_world)
     context.collection.objects.link(ob_copy)
     # Set data for ob_copy
@@ -3,7 +3,9 @@ BlenderFDS, translate geometry from FDS notation to a Blender mesh.
 """
 
 import bpy, logging
+import numpy as np
 from time import time
+from ..core import terrain
 
 log = logging.getLogger(__name__)
 
@@ -22,44 +24,41 @@ def geom_to_mesh(fds_surfids, fds_verts, fds_faces, context, me, scale_length):
     @param me: the Blender Mesh.
     @param scale_length: the scale to use.
     """
-    # Append material slots
-    for i, surfid in enumerate(fds_surfids):
-        found = False
-        for ma in bpy.data.materials:
-            if surfid == ma.name:
-                me.materials.append(ma)
-                found = True
-                break
-        if not found:
+    # Append material slots, from the index of materials by name
+    mas = {ma.name: ma for ma in bpy.data.materials}
+    for surfid in fds_surfids:
+        ma = mas.get(surfid)
+        if ma is None:
             raise Exception(f"Unknown SURF_ID <{surfid}>")
+        me.materials.append(ma)
     # Treat fds_verts and fds_faces
     nverts, nfaces = len(fds_verts) // 3, len(fds_faces) // 4
     if nverts * 3 != len(fds_verts):
         raise Exception(f"Wrong VERTS len in <{fds_verts}>")
     if nfaces * 4 != len(fds_faces):
         raise Exception(f"Wrong FACES len in <{fds_faces}>")
-    verts = [
-        (
-            fds_verts[i * 3] / scale_length,
-            fds_verts[i * 3 + 1] / scale_length,
-            fds_verts[i * 3 + 2] / scale_length,
-        )
-        for i in range(nverts)
-    ]
-    edges = list()
-    faces = [
-        (fds_faces[i * 4] - 1, fds_faces[i * 4 + 1] - 1, fds_faces[i * 4 + 2] - 1)
-        for i in range(nfaces)
-    ]
-    imats = [fds_faces[i * 4 + 3] - 1 for i in range(nfaces)]
-    # Check imats
-    if max(imats) > len(me.materials) - 1:
+    if not nfaces:
+        raise Exception(f"No FACES in <{fds_faces}>")
+    cos = np.array(fds_verts, dtype=np.float64) / scale_length
+    faces = np.array(fds_faces, dtype=np.int64).reshape((nfaces, 4)) - 1
+    vertex_indices = faces[:, :3].ravel()
+    imats = faces[:, 3]
+    # Check indexes
+    if vertex_indices.min() < 0 or vertex_indices.max() > nverts - 1:
+        raise Exception(f"Wrong vertex index in FACES <{fds_faces}>")
+    if imats.min() < 0 or imats.max() > len(me.materials) - 1:
         raise Exception(f"Wrong SURF_ID len in <{me.materials}>")
-    # Create mesh
-    me.from_pydata(verts, edges, faces)
+    # Create mesh, triangles only
+    me.vertices.add(nverts)
+    me.vertices.foreach_set("co", cos.astype(np.float32))
+    me.loops.add(nfaces * 3)
+    me.loops.foreach_set("vertex_index", vertex_indices.astype(np.int32))
+    me.polygons.add(nfaces)
+    me.polygons.foreach_set("loop_start", np.arange(0, nfaces * 3, 3, dtype=np.int32))
+    me.polygons.foreach_set("loop_total", np.full(nfaces, 3, dtype=np.int32))
     # Assign materials to faces
-    for iface, face in enumerate(me.polygons):
-        face.material_index = imats[iface]
+    me.polygons.foreach_set("material_index", imats.astype(np.int32))
+    me.update(calc_edges=True)
 
 
 def geom_to_ob(fds_surfids, fds_verts, fds_faces, context, ob, scale_length):
@@ -76,6 +75,48 @@ def geom_to_ob(fds_surfids, fds_verts, fds_faces, context, ob, scale_length):
     geom_to_mesh(fds_surfids, fds_verts, fds_faces, context, ob.data, scale_length)
 
 
+# From terrain grid
+
+
+def terrain_to_mesh(grid, context, me, scale_length, origin=(0.0, 0.0, 0.0)):
+    """!
+    Import a terrain grid into existing empty Blender Mesh, by blocks of rows.
+    Face properties, from 1, are set as material indexes, from 0.
+    @param grid: the (n_rows, n_cols, 4) grid of face centers, eg. memory-mapped.
+    @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+    @param me: the Blender Mesh.
+    @param scale_length: the scale to use.
+    @param origin: the origin subtracted from node coordinates.
+    """
+    n_rows, n_cols = grid.shape[:2]
+    nverts, nfaces = (n_rows + 1) * (n_cols + 1), 2 * n_rows * n_cols
+    # Fill the Blender arrays block by block, the whole grid is never in memory
+    cos = np.empty((nverts, 3), dtype=np.float32)
+    vertex_indices = np.empty((nfaces, 3), dtype=np.int32)
+    imats = np.empty(nfaces, dtype=np.int32)
+    origin = np.array(origin, dtype=np.float64)
+    iv = ifa = 0
+    for nodes, faces, props in terrain.iter_triangulation(grid):
+        cos[iv : iv + len(nodes)] = (nodes - origin) / scale_length
+        vertex_indices[ifa : ifa + len(faces)] = faces
+        imats[ifa : ifa + len(faces)] = props - 1
+        iv, ifa = iv + len(nodes), ifa + len(faces)
+    if imats.min() < 0 or imats.max() > len(me.materials) - 1:
+        raise Exception(f"Wrong property in terrain, or SURF_ID len in <{me.materials}>")
+    # Create mesh, triangles only
+    me.vertices.add(nverts)
+    me.vertices.foreach_set("co", cos.ravel())
+    del cos
+    me.loops.add(nfaces * 3)
+    me.loops.foreach_set("vertex_index", vertex_indices.ravel())
+    del vertex_indices
+    me.polygons.add(nfaces)
+    me.polygons.foreach_set("loop_start", np.arange(0, nfaces * 3, 3, dtype=np.int32))
+    me.polygons.foreach_set("loop_total", np.full(nfaces, 3, dtype=np.int32))
+    me.polygons.foreach_set("material_index", imats)
+    me.update(calc_edges=True)
+
+
 # from XB in Blender units
 
 
@@ -157,6 +198,47 @@ def xbs_bbox_to_mesh(xbs, context, me, scale_length):
     me.from_pydata(verts, edges, faces)
 
 
+## Name of the integer face layer, that maps each face to its merged namelist
+merged_layer_name = "bf_merged_index"
+
+
+def xbs_to_merged_mesh(xbs, context, me, scale_length):
+    """!
+    Import many xbs bboxes ((x0,x1,y0,y1,z0,z1,), ...) into an empty Blender Mesh in bulk.
+    Each face records the index of its xb in an integer face layer.
+    @param xbs: the xbs bboxes.
+    @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+    @param me: the empty Blender Mesh.
+    @param scale_length: the scale to use.
+    """
+    n = len(xbs)
+    # Vertices, 8 per bbox
+    cos = list()
+    for xb in xbs:
+        x0, x1, y0, y1, z0, z1 = (coo / scale_length for coo in xb)
+        cos.extend(
+            (x0, y0, z0, x1, y0, z0, x1, y1, z0, x0, y1, z0)
+            + (x0, y0, z1, x1, y0, z1, x1, y1, z1, x0, y1, z1)
+        )
+    # Faces, 6 quads per bbox, same winding as xbs_bbox_to_mesh
+    face_verts = (0, 3, 2, 1, 0, 1, 5, 4, 0, 4, 7, 3, 6, 5, 1, 2, 6, 2, 3, 7, 6, 7, 4, 5)
+    vertex_indices = list()
+    for i in range(n):
+        j = i * 8
+        vertex_indices.extend(j + v for v in face_verts)
+    # Fill mesh
+    me.vertices.add(n * 8)
+    me.vertices.foreach_set("co", cos)
+    me.loops.add(n * 24)
+    me.loops.foreach_set("vertex_index", vertex_indices)
+    me.polygons.add(n * 6)
+    me.polygons.foreach_set("loop_start", range(0, n * 24, 4))
+    me.polygons.foreach_set("loop_total", (4,) * (n * 6))
+    layer = me.polygon_layers_int.new(name=merged_layer_name)
+    layer.data.foreach_set("value", tuple(i for i in range(n) for _ in range(6)))
+    me.update(calc_edges=True)
+
+
 xbs_to_mesh = {
     "BBOX": xbs_bbox_to_mesh,
     "VOXELS": xbs_bbox_to_mesh,
@@ -4,10 +4,13 @@ BlenderFDS, translate Blender object geometry to FDS notation.
 
 import bpy, logging
 from time import time
+from mathutils import Vector
 from . import utils
 from . import calc_voxels
 from . import calc_trisurfaces
+from . import from_fds
 from ..types import BFException
+from ..bl import progress
 
 log = logging.getLogger(__name__)
 
@@ -26,16 +29,17 @@ def _ob_to_geom(context, ob, scale_length, check=True, world=True):
     @return FDS GEOM notation as lists and message.
     """
     t0 = time()
-    (
-        fds_surfids,
-        fds_verts,
-        fds_faces,
-        fds_surfs,
-        fds_volus,
-        fds_faces_surfs,
-    ) = calc_trisurfaces.get_fds_trisurface(
-        context=context, ob=ob, scale_length=scale_length, check=check, world=world
-    )
+    with progress.task(f"GEOM <{ob.name}>", 4):
+        (
+            fds_surfids,
+            fds_verts,
+            fds_faces,
+            fds_surfs,
+            fds_volus,
+            fds_faces_surfs,
+        ) = calc_trisurfaces.get_fds_trisurface(
+            context=context, ob=ob, scale_length=scale_length, check=check, world=world
+        )
     dt = time() - t0
     msg = f"GEOM: {len(fds_verts)} vertices, {len(fds_faces)} faces, in {dt:.3f} s"
     return fds_surfids, fds_verts, fds_faces, fds_surfs, fds_volus, fds_faces_surfs, msg
@@ -54,9 +58,18 @@ def ob_to_geom(context, ob, scale_length, check=True, world=True):
     log.debug(ob.name)
     if ob.get("ob_to_geom_cache") is None:  # recalc
         log.debug(f"Update <{ob.name}> geom cache")
-        ob["ob_to_geom_cache"] = _ob_to_geom(
-            context=context, ob=ob, scale_length=scale_length, check=check, world=world
-        )
+        with utils.geometric_transaction():
+            utils.set_geometric_cache(
+                ob,
+                "ob_to_geom_cache",
+                _ob_to_geom(
+                    context=context,
+                    ob=ob,
+                    scale_length=scale_length,
+                    check=check,
+                    world=world,
+                ),
+            )
     return ob["ob_to_geom_cache"]
 
 
@@ -74,7 +87,8 @@ def _ob_to_xbs_voxels(
     @return xbs notation and any error message.
     """
     t0 = time()
-    xbs, voxel_size = calc_voxels.get_voxels(context, ob, scale_length)
+    with progress.task(f"Voxels <{ob.name}>", 4):
+        xbs, voxel_size = calc_voxels.get_voxels(context, ob, scale_length)
     dt = time() - t0
     msg = f"XB: {len(xbs)} voxels, resolution {voxel_size:.3f} m, in {dt:.3f} s"
     return xbs, msg
@@ -91,7 +105,8 @@ def _ob_to_xbs_pixels(
     @return xbs notation (flat voxelization) and any error message.
     """
     t0 = time()
-    xbs, voxel_size = calc_voxels.get_pixels(context, ob, scale_length)
+    with progress.task(f"Pixels <{ob.name}>", 4):
+        xbs, voxel_size = calc_voxels.get_pixels(context, ob, scale_length)
     res = voxel_size * scale_length
     dt = time() - t0
     msg = f"XB: {len(xbs)} pixels, resolution {res:.3f} m, in {dt:.3f} s"
@@ -193,6 +208,46 @@ _choice_to_xbs = {
 }
 
 
+def ob_to_merged_xbs(context, ob, scale_length) -> "{index: (x0,x1,y0,y1,z0,z1,), ...}":
+    """!
+    Transform a merged Object geometry to xbs notation, one bbox per merged namelist.
+    Faces are grouped by the index recorded in their integer face layer,
+    merged namelists without faces are dropped.
+    @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+    @param ob: the merged Blender object.
+    @param scale_length: the scale to use.
+    @return the dict of xbs by merged namelist index.
+    """
+    me = ob.data
+    layer = me.polygon_layers_int.get(from_fds.merged_layer_name)
+    if layer is None:
+        raise BFException(ob, "Merged namelist index layer not found")
+    npolys, nverts = len(me.polygons), len(me.vertices)
+    indexes, loop_starts, loop_totals = [0] * npolys, [0] * npolys, [0] * npolys
+    layer.data.foreach_get("value", indexes)
+    me.polygons.foreach_get("loop_start", loop_starts)
+    me.polygons.foreach_get("loop_total", loop_totals)
+    vertex_indices = [0] * len(me.loops)
+    me.loops.foreach_get("vertex_index", vertex_indices)
+    cos = [0.0] * (nverts * 3)
+    me.vertices.foreach_get("co", cos)
+    # World coordinates
+    mw = ob.matrix_world
+    cos = tuple(
+        mw @ Vector(cos[i * 3 : i * 3 + 3]) * scale_length for i in range(nverts)
+    )
+    # Bboxes by index
+    bboxes = dict()
+    for index, loop_start, loop_total in zip(indexes, loop_starts, loop_totals):
+        bbox = bboxes.setdefault(index, [1e32, -1e32, 1e32, -1e32, 1e32, -1e32])
+        for iv in vertex_indices[loop_start : loop_start + loop_total]:
+            x, y, z = cos[iv]
+            bbox[0], bbox[1] = min(bbox[0], x), max(bbox[1], x)
+            bbox[2], bbox[3] = min(bbox[2], y), max(bbox[3], y)
+            bbox[4], bbox[5] = min(bbox[4], z), max(bbox[5], z)
+    return {index: tuple(bbox) for index, bbox in bboxes.items()}
+
+
 def ob_to_xbs(context, ob, scale_length) -> "((x0,x1,y0,y1,z0,z1,), ...), 'Msg'":
     """!
     Transform Object geometry according to ob.bf_xb (None, BBOX, VOXELS, FACES, PIXELS, EDGES) to FDS notation.
@@ -204,7 +259,12 @@ def ob_to_xbs(context, ob, scale_length) -> "((x0,x1,y0,y1,z0,z1,), ...), 'Msg'"
     log.debug(ob.name)
     if ob.get("ob_to_xbs_cache") is None:  # recalc
         log.debug(f"Update <{ob.name}> xbs cache")
-        ob["ob_to_xbs_cache"] = _choice_to_xbs[ob.bf_xb](context, ob, scale_length)
+        with utils.geometric_transaction():
+            utils.set_geometric_cache(
+                ob,
+                "ob_to_xbs_cache",
+                _choice_to_xbs[ob.bf_xb](context, ob, scale_length),
+            )
     return ob["ob_to_xbs_cache"]
 
 
@@ -267,7 +327,12 @@ def ob_to_xyzs(context, ob, scale_length) -> "((x0,y0,z0,), ...), 'Msg'":
     log.debug(ob.name)
     if ob.get("ob_to_xyzs_cache") is None:  # recalc
         log.debug(f"Update <{ob.name}> xyzs cache")
-        ob["ob_to_xyzs_cache"] = _choice_to_xyzs[ob.bf_xyz](context, ob, scale_length)
+        with utils.geometric_transaction():
+            utils.set_geometric_cache(
+                ob,
+                "ob_to_xyzs_cache",
+                _choice_to_xyzs[ob.bf_xyz](context, ob, scale_length),
+            )
     return ob["ob_to_xyzs_cache"]
 
 
@@ -317,5 +382,8 @@ def ob_to_pbs(context, ob, scale_length) -> "((0,x3,), (1,x7,), (1,y9,), ...), '
     log.debug(ob.name)
     if ob.get("ob_to_pbs_cache") is None:  # recalc
         log.debug(f"Update <{ob.name}> pbs cache")
-        ob["ob_to_pbs_cache"] = _ob_to_pbs_planes(context, ob, scale_length)
+        with utils.geometric_transaction():
+            utils.set_geometric_cache(
+                ob, "ob_to_pbs_cache", _ob_to_pbs_planes(context, ob, scale_length)
+            )
     return ob["ob_to_pbs_cache"]  # the cache sends floats instead of integers for axis
@@ -2,8 +2,10 @@
 BlenderFDS, export geometry to ge1 cad file format.
 """
 
-import bpy, bmesh
-from . import utils
+import io, bpy, logging
+import numpy as np
+
+log = logging.getLogger(__name__)
 
 # GE1 file format:
 
@@ -29,16 +31,51 @@ def _get_appearance(name, i, rgb):
     return f"{name}\n{i} {rgb[0]} {rgb[1]} {rgb[2]} 0. 0. {rgb[3]:.3f} 0. 0. 0.\n\n"
 
 
-def scene_to_ge1(context, scene):  # TODO use BMesh
+def _get_ob_triangles(context, ob, scale_length):
     """!
-    Export scene geometry in FDS GE1 notation.
+    Get the triangles of an Object in world coordinates, reusing the GEOM export cache.
+    @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+    @param ob: the Blender object.
+    @param scale_length: the scale to use.
+    @return triangle coordinates array (n, 3, 3), material indexes array (n,), and material names.
+    """
+    # Reuse the triangles extracted by the .fds export, if available
+    cache = ob.bf_namelist_cls == "ON_GEOM" and ob.get("ob_to_geom_cache")
+    if cache:
+        fds_surfids, fds_verts, fds_faces_surfs = cache[0], cache[1], cache[5]
+        verts = np.asarray(fds_verts, dtype=np.float64).reshape((-1, 3))
+        faces = np.asarray(fds_faces_surfs, dtype=np.int64).reshape((-1, 4)) - 1
+        return verts[faces[:, :3]], faces[:, 3], tuple(fds_surfids)
+    # Else get them from the evaluated mesh
+    ob_eval = ob.evaluated_get(context.evaluated_depsgraph_get())
+    me = ob_eval.to_mesh()
+    try:
+        me.calc_loop_triangles()
+        nverts, ntris = len(me.vertices), len(me.loop_triangles)
+        cos = np.empty(nverts * 3, dtype=np.float32)
+        me.vertices.foreach_get("co", cos)
+        tris = np.empty(ntris * 3, dtype=np.int32)
+        me.loop_triangles.foreach_get("vertices", tris)
+        imats = np.empty(ntris, dtype=np.int32)
+        me.loop_triangles.foreach_get("material_index", imats)
+    finally:
+        ob_eval.to_mesh_clear()
+    # In world coordinates
+    mw = np.array(ob.matrix_world, dtype=np.float64)
+    cos = (cos.reshape((-1, 3)) @ mw[:3, :3].T + mw[:3, 3]) * scale_length
+    names = tuple(s.material and s.material.name for s in ob.material_slots)
+    return cos[tris.reshape((-1, 3))], imats, names
+
+
+def get_ge1_data(context, scene):
+    """!
+    Get scene geometry for the GE1 file, as arrays.
+    Only this function accesses Blender data, so that the GE1 file
+    can be written by another thread.
     @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
     @param scene: the Blender scene.
-    @return FDS GE1 notation.
+    @return the list of appearances, and the list of (quads array (n, 12), appearance indexes array (n,)).
     """
-    # Cursor
-    w = context.window_manager.windows[0]
-    w.cursor_modal_set("WAIT")
     # Get GE1 appearances from materials
     appearances, ma_to_appearance = list(), dict()
     for i, ma in enumerate(bpy.data.materials):
@@ -56,30 +93,29 @@ def scene_to_ge1(context, scene):  # TODO use BMesh
         )
         ma_to_appearance[ma.name] = i
     # Append dummy material for HOLEs
-    i += 1
+    i = len(appearances)
     appearances.append(
         _get_appearance(name="Dummy Hole", i=i, rgb=(150, 150, 150, 0.5))
     )
-    ma_to_appearance[ma.name] = i
+    ma_to_appearance["Dummy Hole"] = i
     # Select GE1 objects
     allowed_nls = ("ON_OBST", "ON_GEOM", "ON_VENT", "ON_HOLE")
     obs = (
         ob
-        for ob in context.scene.objects
+        for ob in scene.objects
         if ob.type == "MESH"
         and not ob.hide_render  # show only exported obs
         and not ob.bf_is_tmp  # do not show tmp obs
         and ob.bf_namelist_cls in allowed_nls  # show only allowed namelists
         and (ob.active_material and ob.active_material.name != "OPEN")  # no OPEN
     )
-    # Get GE1 faces from selected objects  # TODO use dummy color for HOLE
-    gefaces = list()
+    # Get GE1 faces from selected objects
+    scale_length = scene.unit_settings.scale_length
+    faces = list()
     for ob in obs:
-        # Get the bmesh from the Object and triangulate
-        bm = utils.get_object_bmesh(context=context, ob=ob, world=True)
-        bmesh.ops.triangulate(bm, faces=bm.faces)
-        # Get ob material_slots
-        material_slots = ob.material_slots
+        tris, imats, names = _get_ob_triangles(context, ob, scale_length)
+        if not len(tris):
+            continue
         # Get default_material_name
         if ob.bf_namelist_cls == "ON_HOLE":
             default_material_name = "Dummy Hole"
@@ -89,25 +125,54 @@ def scene_to_ge1(context, scene):  # TODO use BMesh
             default_material_name = ob.active_material.name
         else:
             default_material_name = "INERT"
-        scale_length = context.scene.unit_settings.scale_length
-        for f in bm.faces:
-            # Grab ordered vertices coordinates
-            coos = [co for v in f.verts for co in v.co]
-            coos.extend((coos[-3], coos[-2], coos[-1]))  # tri to quad
-            items = [f"{coo * scale_length:.6f}" for coo in coos]
-            # Get appearance_index
-            if default_material_name:
-                material_name = default_material_name
-            else:
-                material_name = material_slots[f.material_index].material.name
-            appearance_index = str(ma_to_appearance.get(material_name, 0)) + "\n"
-            items.append(appearance_index)
-            # Append GE1 face
-            gefaces.append(" ".join(items))
-
-    # Prepare GE1 file and return
-    ge1_file_a = f"[APPEARANCE]\n{len(appearances)}\n{''.join(appearances)}"
-    ge1_file_f = f"[FACES]\n{len(gefaces)}\n{''.join(gefaces)}"
-    # Close
-    w.cursor_modal_restore()
-    return "".join((ge1_file_a, ge1_file_f))
+        # Get appearance indexes
+        if default_material_name:
+            names = (default_material_name,)
+        lut = np.array(
+            tuple(ma_to_appearance.get(name, 0) for name in names) or (0,),
+            dtype=np.int32,
+        )
+        app_indexes = lut[np.clip(imats, 0, len(lut) - 1)]
+        # Triangles to quads, by repeating the last vertex
+        n = len(tris)
+        quads = np.concatenate((tris.reshape((n, 9)), tris[:, 2, :]), axis=1)
+        faces.append((quads, app_indexes))
+    return appearances, faces
+
+
+def write_ge1(f, appearances, faces):
+    """!
+    Stream the GE1 file, formatting faces in bulk.
+    Blender data is not accessed, so it can run in another thread.
+    @param f: the open text file.
+    @param appearances: the list of appearances, from get_ge1_data().
+    @param faces: the list of (quads, appearance indexes), from get_ge1_data().
+    """
+    f.write(f"[APPEARANCE]\n{len(appearances)}\n{''.join(appearances)}")
+    f.write(f"[FACES]\n{sum(len(q) for q, _ in faces)}\n")
+    fmt = " ".join(("%.6f",) * 12 + ("%d",))
+    for quads, app_indexes in faces:
+        np.savetxt(f, np.column_stack((quads, app_indexes)), fmt=fmt)
+
+
+def write_ge1_file(filepath, appearances, faces):
+    """!
+    Write the GE1 file to filepath.
+    @param filepath: the .ge1 file path.
+    @param appearances: the list of appearances, from get_ge1_data().
+    @param faces: the list of (quads, appearance indexes), from get_ge1_data().
+    """
+    with open(filepath, "w", encoding="utf8", errors="ignore") as f:
+        write_ge1(f, appearances, faces)
+
+
+def scene_to_ge1(context, scene):
+    """!
+    Export scene geometry in FDS GE1 notation.
+    @param context: the <a href="https://docs.blender.org/api/current/bpy.context.html">blender context</a>.
+    @param scene: the Blender scene.
+    @return FDS GE1 notation.
+    """
+    f = io.StringIO()
+    write_ge1(f, *get_ge1_data(context, scene))
+    return f.getvalue()
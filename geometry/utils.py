@@ -2,9 +2,13 @@
 BlenderFDS, geometric utilities.
 """
 
-import bpy, bmesh
+import bpy, bmesh, logging
+from contextlib import contextmanager
 
 from ..types import BFException
+from ..bl import profiler
+
+log = logging.getLogger(__name__)
 
 
 # Working on Blender objects
@@ -29,9 +33,12 @@ def get_object_bmesh(
     # if context.object:
     #    bpy.ops.object.mode_set(mode="OBJECT")  # actualize TODO not allowed in panel calls
     # Get evaluated bmesh from ob
-    bm = bmesh.new()
-    depsgraph = context.evaluated_depsgraph_get()
-    bm.from_object(ob, depsgraph=depsgraph, deform=True, cage=False, face_normals=True)
+    with profiler.stage("mesh"):
+        bm = bmesh.new()
+        depsgraph = context.evaluated_depsgraph_get()
+        bm.from_object(
+            ob, depsgraph=depsgraph, deform=True, cage=False, face_normals=True
+        )
     if matrix is not None:
         bm.transform(matrix)  # transform
     if world:
@@ -103,6 +110,95 @@ def rm_geometric_caches():
         ob["ob_to_pbs_cache"] = None
 
 
+# Geometric transactions, coalesce cache invalidation during export and compute
+#
+# Invalidation requests recorded during a transaction are older than
+# the caches computed in the same transaction, eg. the requests caused
+# by the computation itself. So these fresh caches are kept at the end.
+
+_transaction_depth = 0  # nesting level of open transactions
+_transaction_pending = set()  # names of objects to be invalidated at the end
+_transaction_computed = set()  # (name, key) of caches computed in the transaction
+_geometric_cache_keys = (
+    "ob_to_geom_cache",
+    "ob_to_xbs_cache",
+    "ob_to_xyzs_cache",
+    "ob_to_pbs_cache",
+)
+
+
+def is_geometric_transaction():
+    """!
+    Check if a geometric transaction is open.
+    @return True if a geometric transaction is open, False otherwise.
+    """
+    return _transaction_depth > 0
+
+
+@contextmanager
+def geometric_transaction():
+    """!
+    Context manager for export and compute transactions.
+    While open, cache invalidation requests are only recorded,
+    then they are coalesced in a single pass when the outermost transaction closes.
+    Transactions can be nested.
+    """
+    global _transaction_depth
+    _transaction_depth += 1
+    try:
+        yield
+    finally:
+        _transaction_depth -= 1
+        if not _transaction_depth:
+            _flush_geometric_transaction()
+
+
+def _flush_geometric_transaction():
+    """!
+    Remove geometric caches of objects recorded during the transaction,
+    except the ones computed during the transaction.
+    """
+    if _transaction_pending:
+        log.debug(f"Remove <{len(_transaction_pending)}> deferred caches")
+        obs = bpy.data.objects
+        for name in _transaction_pending:
+            ob = obs.get(name)
+            if ob is None or ob.bf_is_tmp:  # removed or tmp
+                continue
+            for key in _geometric_cache_keys:
+                if (name, key) not in _transaction_computed:
+                    ob[key] = None
+        _transaction_pending.clear()
+    _transaction_computed.clear()
+
+
+def set_geometric_cache(ob, key, value):
+    """!
+    Set a geometric cache of object, kept at the end of the open transaction.
+    @param ob: Blender Object.
+    @param key: the cache key, eg. "ob_to_xbs_cache".
+    @param value: the cached value.
+    """
+    ob[key] = value
+    if _transaction_depth:
+        _transaction_computed.add((ob.name, key))
+
+
+def invalidate_geometric_cache(ob):
+    """!
+    Remove geometric caches from object, or defer it if a transaction is open.
+    Tmp objects are ignored.
+    @param ob: Blender Object.
+    """
+    if ob.bf_is_tmp:
+        return
+    if _transaction_depth:
+        _transaction_pending.add(ob.name)
+    else:
+        log.debug(f"Remove <{ob.name}> caches")
+        rm_geometric_cache(ob)
+
+
 # Working on Blender materials
 
 
@@ -1 +1 @@
-from .utm import LonLat, UTM
+from ..core.utm import LonLat, UTM
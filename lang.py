@@ -56,8 +56,9 @@ from .types import (
     FDSNamelist,
     FDSCase,
 )
-from .config import default_mas
+from .config import default_mas, merged_fds_labels, proxy_fds_labels
 from . import gis, utils, fds
+from .bl import progress, profiler, draw_cache
 
 log = logging.getLogger(__name__)
 
@@ -184,6 +185,23 @@ class SP_config_text(BFParam):
         layout.operator("scene.bf_show_text", text="", icon="GREASEPENCIL")
 
 
+@subscribe
+class SP_config_profile(BFParam):
+    """!
+    Blender representation to profile the export of the case.
+    """
+
+    label = "Profile Export"
+    description = (
+        "Profile the export, geometric caches are reset.\n"
+        "The profiling report is saved next to the exported case"
+    )
+    bpy_type = Scene
+    bpy_idname = "bf_config_profile"
+    bpy_prop = BoolProperty
+    bpy_default = False
+
+
 @subscribe
 class SN_config(BFNamelistSc):
     """!
@@ -191,7 +209,7 @@ class SN_config(BFNamelistSc):
     """
 
     label = "FDS Case Config"
-    bf_params = (SP_config_directory, SP_config_text)
+    bf_params = (SP_config_directory, SP_config_text, SP_config_profile)
 
 
 # Config origin geolocation
@@ -2459,9 +2477,9 @@ class ON_GEOM(BFNamelistOb):
                 )
             else:
                 # Already treated so remove them
-                fds_namelist.fds_params.remove(p_surfids)
-                fds_namelist.fds_params.remove(p_verts)
-                fds_namelist.fds_params.remove(p_faces)
+                fds_namelist.remove_fds_param(p_surfids)
+                fds_namelist.remove_fds_param(p_verts)
+                fds_namelist.remove_fds_param(p_faces)
         # Import remaining params
         super().from_fds(context, fds_namelist)
 
@@ -2760,19 +2778,28 @@ class OP_MESH_IJK(BFParam):
     bpy_export = "bf_mesh_ijk_export"
     bpy_export_default = True
 
+    def _get_cell_infos(self, context, ob, scale_length):
+        xbs = geometry.utils.get_bbox_xbs(
+            context=context, ob=ob, scale_length=scale_length, world=True
+        )
+        return fds.mesh_tools.calc_cell_infos(ijk=ob.bf_mesh_ijk, xbs=xbs)
+
     def draw(self, context, layout):
         ob = context.object
         col = layout.column()
         scale_length = context.scene.unit_settings.scale_length
-        xbs = geometry.utils.get_bbox_xbs(
-            context=context, ob=ob, scale_length=scale_length, world=True
-        )
         (
             has_good_ijk,
             cs,
             cell_count,
             cell_aspect_ratio,
-        ) = fds.mesh_tools.calc_cell_infos(ijk=ob.bf_mesh_ijk, xbs=xbs)
+        ) = draw_cache.get(
+            (ob.as_pointer(), "cell_infos", tuple(ob.bf_mesh_ijk), scale_length),
+            self._get_cell_infos,
+            context,
+            ob,
+            scale_length,
+        )
         col.label(text=f"Cell Size: {cs[0]:.3f}m x {cs[1]:.3f}m x {cs[2]:.3f}m")
         col.label(
             text=f"Cell Qty: {cell_count} | Aspect: {cell_aspect_ratio:.1f} | Poisson: {has_good_ijk and 'Yes' or 'No'}"
@@ -2834,6 +2861,10 @@ class ON_MESH(BFNamelistOb):
         ob = context.object
         col = layout.column()
         col.operator("object.bf_set_mesh_cell_size")
+        col.operator("object.bf_split_mesh")
+        col.operator("object.bf_refine_mesh")
+        col.operator("scene.bf_balance_mpi_processes")
+        col.operator("scene.bf_check_meshes")
         col.operator("object.bf_align_selected_meshes")
 
 
@@ -2925,11 +2956,11 @@ class BFObject:
         Related bf_namelist, instance of BFNamelist.
         """
         try:
-            return bf_namelists_by_cls[self.bf_namelist_cls](self)
-        except IndexError:
+            return bf_namelists_by_cls[self.bf_namelist_cls].get_instance(self)
+        except KeyError:
             raise BFException(
                 self,
-                "FDS namelist <{self.bf_namelist_cls}> not supported by Blender Object <{self.name}>",
+                f"FDS namelist <{self.bf_namelist_cls}> not supported by Blender Object <{self.name}>",
             )
 
     def to_fds(self, context):
@@ -2940,8 +2971,50 @@ class BFObject:
         """
         if self.bf_is_tmp or not self.type == "MESH":
             return
+        if "bf_proxy_text" in self:
+            return self._proxy_to_fds(context)
+        if "bf_merged_params" in self:
+            return self._merged_to_fds(context)
         return self.bf_namelist.to_fds(context)
 
+    def _proxy_to_fds(self, context):
+        """!
+        Return the FDS formatted string of a proxy Object, its original namelists verbatim.
+        @param context: the Blender context.
+        @return None or FDS formatted string.
+        """
+        if not self.bf_namelist.exported:
+            return
+        te = self.bf_proxy_text
+        if te is None:
+            raise BFException(self, "Proxy text not found")
+        return te.as_string()
+
+    def _merged_to_fds(self, context):
+        """!
+        Return the FDS formatted string of a merged Object, one namelist per merged bbox.
+        @param context: the Blender context.
+        @return None or FDS formatted string, eg. "&OBST ID='Test' XB=... /".
+        """
+        bf_namelist = self.bf_namelist
+        if not bf_namelist.exported:
+            return
+        xbs = geometry.to_fds.ob_to_merged_xbs(
+            context, self, scale_length=context.scene.unit_settings.scale_length
+        )
+        lines = list()
+        for i, f90_params in enumerate(self["bf_merged_params"]):
+            xb = xbs.get(i)
+            if xb is None:  # its faces were deleted
+                continue
+            fds_namelist = FDSNamelist(fds_label=bf_namelist.fds_label)
+            fds_namelist.from_fds(f90_params=f"{f90_params} /")
+            fds_namelist.append_fds_param(
+                FDSParam(fds_label="XB", values=xb, precision=6)
+            )
+            lines.append(fds_namelist.to_fds())
+        return "\n".join(lines)
+
     def from_fds(self, context, fds_namelist):
         """!
         Set self.bf_namelist from FDSNamelist, on error raise BFException.
@@ -3027,11 +3100,11 @@ class BFMaterial:
         Return related bf_namelist, instance of BFNamelist.
         """
         try:
-            return bf_namelists_by_cls[self.bf_namelist_cls](self)
-        except IndexError:
+            return bf_namelists_by_cls[self.bf_namelist_cls].get_instance(self)
+        except KeyError:
             raise BFException(
                 self,
-                "FDS namelist <{self.bf_namelist_cls}> not supported by Blender Material <{self.name}>",
+                f"FDS namelist <{self.bf_namelist_cls}> not supported by Blender Material <{self.name}>",
             )
 
     def to_fds(self, context):
@@ -3095,7 +3168,11 @@ class BFScene:
         """!
         Return related bf_namelist, instance of BFNamelist.
         """
-        return (n(self) for _, n in bf_namelists_by_cls.items() if n.bpy_type == Scene)
+        return (
+            n.get_instance(self)
+            for _, n in bf_namelists_by_cls.items()
+            if n.bpy_type == Scene
+        )
 
     def to_fds(self, context, full=False):
         """!
@@ -3104,6 +3181,18 @@ class BFScene:
         @param full: if True, return full FDS case.
         @return None or FDS formatted string, eg. "&OBST ID='Test' /".
         """
+        return "\n".join(
+            line for line in self.iter_to_fds(context, full) if line
+        )  # remove empties
+
+    def iter_to_fds(self, context, full=False):
+        """!
+        Generate the FDS formatted strings, one Object at a time.
+        Used by modal operators to report progress and to allow cancellation.
+        @param context: the Blender context.
+        @param full: if True, generate full FDS case.
+        @return generator of None or FDS formatted string.
+        """
         # Header
         v = sys.modules[__package__].bl_info["version"]
         blv = bpy.app.version_string
@@ -3111,65 +3200,98 @@ class BFScene:
         filepath = bpy.data.filepath or "not saved"
         if len(filepath) > 60:
             filepath = "..." + filepath[-57:]
-        lines = list(
-            (
-                f"! Generated by BlenderFDS {v[0]}.{v[1]}.{v[2]} on Blender {blv}",
-                f"! File: <{filepath}>",
-                f"! Blender Scene: <{self.name}>",
-                f"! Date: <{now}>",
-            )
-        )
-        # My namelists
-        lines.extend(
-            n.to_fds(context) for n in self.bf_namelists if n is not None
-        )  # protect from None
-        # Free Text
-        if self.bf_config_text:
-            lines.append(f"\n! --- From <{self.bf_config_text.name}> free text")
-            lines.append(self.bf_config_text.as_string())
-        # Extend with Materials and Collections
-        if full:
-            # Materials
-            mas = list(bpy.data.materials)
-            if mas:
-                mas.sort(key=lambda k: k.name)  # alphabetic order by name
-                lines.append("\n! --- Boundary conditions from Blender Materials")
-                for ma in mas:
-                    lines.append(ma.to_fds(context))
-            # Objects
-            lines.append(self.collection.to_fds(context))
-            # Tail
-            if self.bf_head_export:
-                lines.append("\n&TAIL /")
-        return "\n".join(line for line in lines if line)  # remove empties
-
-    def from_fds(self, context, fds_case):
+        yield f"! Generated by BlenderFDS {v[0]}.{v[1]}.{v[2]} on Blender {blv}"
+        yield f"! File: <{filepath}>"
+        yield f"! Blender Scene: <{self.name}>"
+        yield f"! Date: <{now}>"
+        # Coalesce cache invalidation from tmp geometry
+        with geometry.utils.geometric_transaction(), progress.task(
+            f"Export <{self.name}>", full and 3 or 1
+        ):
+            # My namelists
+            for n in self.bf_namelists:
+                if n is not None:  # protect from None
+                    yield n.to_fds(context)
+            # Free Text
+            if self.bf_config_text:
+                yield f"\n! --- From <{self.bf_config_text.name}> free text"
+                yield self.bf_config_text.as_string()
+            progress.step()
+            # Extend with Materials and Collections
+            if full:
+                # Materials
+                mas = list(bpy.data.materials)
+                if mas:
+                    mas.sort(key=lambda k: k.name)  # alphabetic order by name
+                    yield "\n! --- Boundary conditions from Blender Materials"
+                    for ma in mas:
+                        yield ma.to_fds(context)
+                progress.step()
+                # Objects
+                yield from self.collection.iter_to_fds(context)
+                progress.step()
+                # Tail
+                if self.bf_head_export:
+                    yield "\n&TAIL /"
+
+    def from_fds(self, context, fds_case, merge=False, proxy=False):
         """!
         Set self.bf_namelists from FDSCase, on error raise BFException.
         @param context: the Blender context.
         @param fds_case: FDSCase.
+        @param merge: if True, import OBST, HOLE, and VENT namelists in bulk into merged Objects.
+        @param proxy: if True, import heavy geometric namelists as proxy Objects.
         """
         self.set_default_appearance(context)  # current scene
         fds_case_un = FDSCase()  # unmanaged namelists
+        with progress.task(f"Import <{self.name}>", len(fds_case.fds_namelists)):
+            self._from_fds_namelists(context, fds_case, fds_case_un, merge, proxy)
+        # Set imported Scene visible
+        context.window.scene = self
+        # Record unmanaged namelists in free text
+        te = bpy.data.texts.new(f"Imported")
+        te.from_string(str(fds_case_un))
+        te.current_line_index = 0
+        self.bf_config_text = te
+        # Set imported free text visible
+        bpy.ops.scene.bf_show_text()
+
+    def _from_fds_namelists(
+        self, context, fds_case, fds_case_un, merge=False, proxy=False
+    ):
+        """!
+        Import FDSCase namelists, reporting progress.
+        @param context: the Blender context.
+        @param fds_case: FDSCase.
+        @param fds_case_un: FDSCase, filled with unmanaged namelists.
+        @param merge: if True, import OBST, HOLE, and VENT namelists in bulk into merged Objects.
+        @param proxy: if True, import heavy geometric namelists as proxy Objects.
+        """
         # Import SURFs first TODO improve, repetition!
         # TODO if a material is not available, throw an Exception!
-        for fds_namelist in fds_case.fds_namelists:
-            if fds_namelist.fds_label != "SURF":
-                continue
+        for fds_namelist in fds_case.get_fds_namelists_by_label("SURF"):
             hid = f"New {fds_namelist.fds_label}"
             ma = bpy.data.materials.new(hid)
             ma.from_fds(context, fds_namelist=fds_namelist)
             ma.use_fake_user = True  # prevent del (eg. used by PART)
             ma.set_default_appearance(context)
+            progress.step()
+        # Then the proxies and the merged ones, if requested
+        fds_namelists = fds_case.fds_namelists
+        if proxy:
+            fds_namelists = self._from_fds_proxies(context, fds_namelists)
+        if merge:
+            fds_namelists = self._from_fds_merged(context, fds_namelists)
         # Then the rest TODO improve
-        for fds_namelist in fds_case.fds_namelists:
+        for fds_namelist in fds_namelists:
             if fds_namelist.fds_label == "SURF":
                 continue
+            progress.step()
             # Get namelist class
             bf_namelist = bf_namelists_by_fds_label.get(fds_namelist.fds_label, None)
             if not bf_namelist:
                 # Put unmanaged namelists in fds_case_un
-                fds_case_un.fds_namelists.append(fds_namelist)
+                fds_case_un.append_fds_namelist(fds_namelist)
                 continue
             # Prepare default name
             hid = f"New {fds_namelist.fds_label}"
@@ -3188,15 +3310,102 @@ class BFScene:
                 ma.set_default_appearance(context)
             elif bf_namelist.bpy_type == Scene:  # current Scene
                 bf_namelist(self).from_fds(context, fds_namelist=fds_namelist)
-        # Set imported Scene visible
-        context.window.scene = self
-        # Record unmanaged namelists in free text
-        te = bpy.data.texts.new(f"Imported")
-        te.from_string(str(fds_case_un))
-        te.current_line_index = 0
-        self.bf_config_text = te
-        # Set imported free text visible
-        bpy.ops.scene.bf_show_text()
+
+    def _from_fds_proxies(self, context, fds_namelists):
+        """!
+        Import heavy geometric namelists (eg. OBST, GEOM) as lightweight proxies,
+        one proxy Object for each namelist label.
+        The proxy mesh has a box for each namelist, its XB or the bounding box
+        of its VERTS, built in bulk. The original text of the namelists is kept
+        verbatim in a Text, pointed by the proxy and re-emitted at export.
+        @param context: the Blender context.
+        @param fds_namelists: list of FDSNamelist.
+        @return the list of FDSNamelist that are not proxied.
+        """
+        groups, others = dict(), list()  # {label: (xbs, f90s)}
+        for fds_namelist in fds_namelists:
+            if fds_namelist.fds_label not in proxy_fds_labels:
+                others.append(fds_namelist)
+                continue
+            xbs, f90s = groups.setdefault(fds_namelist.fds_label, (list(), list()))
+            f90s.append(fds_namelist.f90 or fds_namelist.to_fds())
+            # Get its box from XB or VERTS
+            p = fds_namelist.get_fds_param_by_label("XB")
+            if p and len(p.values) == 6:
+                xbs.append(p.values)
+                continue
+            p = fds_namelist.get_fds_param_by_label("VERTS")
+            if p and len(p.values) >= 3:
+                vs = p.values
+                xbs.append(
+                    (min(vs[0::3]), max(vs[0::3]))
+                    + (min(vs[1::3]), max(vs[1::3]))
+                    + (min(vs[2::3]), max(vs[2::3]))
+                )
+        scale_length = context.scene.unit_settings.scale_length
+        for label, (xbs, f90s) in groups.items():
+            hid = f"Proxy {label}"
+            te = bpy.data.texts.new(hid)
+            te.from_string("\n".join(f90s))
+            me = bpy.data.meshes.new(hid)
+            if xbs:
+                geometry.from_fds.xbs_to_merged_mesh(xbs, context, me, scale_length)
+            ob = bpy.data.objects.new(hid, object_data=me)
+            self.collection.objects.link(ob)
+            ob.bf_namelist_cls = bf_namelists_by_fds_label[label].__name__
+            ob.bf_xb_export, ob.bf_xyz_export, ob.bf_pb_export = (False, False, False)
+            ob.bf_fyi = f"Proxy of {len(f90s)} {label} namelists in Text <{te.name}>"
+            ob.bf_proxy_text = te
+            ob.set_default_appearance(context)
+            ob.display_type = "WIRE"
+            progress.step(len(f90s))
+        return others
+
+    def _from_fds_merged(self, context, fds_namelists):
+        """!
+        Import OBST, HOLE, and VENT namelists with a single XB in bulk,
+        one merged Object for each namelist label and SURF_ID.
+        The other params of each namelist are kept in the merged Object,
+        and each face records the index of its namelist.
+        @param context: the Blender context.
+        @param fds_namelists: list of FDSNamelist.
+        @return the list of FDSNamelist that cannot be merged.
+        """
+        groups, others = dict(), list()  # {(label, surf_id): (xbs, f90_params)}
+        for fds_namelist in fds_namelists:
+            if fds_namelist.fds_label in merged_fds_labels:
+                p_xb = fds_namelist.get_fds_param_by_label("XB")
+                if p_xb and len(p_xb.values) == 6:
+                    p_surfid = fds_namelist.get_fds_param_by_label("SURF_ID")
+                    surf_id = p_surfid and p_surfid.values and p_surfid.values[0]
+                    xbs, f90s = groups.setdefault(
+                        (fds_namelist.fds_label, surf_id or None), (list(), list())
+                    )
+                    xbs.append(p_xb.values)
+                    f90s.append(
+                        " ".join(
+                            p.to_fds() for p in fds_namelist.fds_params if p is not p_xb
+                        )
+                    )
+                    continue
+            others.append(fds_namelist)
+        scale_length = context.scene.unit_settings.scale_length
+        for (label, surf_id), (xbs, f90s) in groups.items():
+            hid = f"Merged {label}" + (surf_id and f" {surf_id}" or "")
+            me = bpy.data.meshes.new(hid)
+            geometry.from_fds.xbs_to_merged_mesh(xbs, context, me, scale_length)
+            ob = bpy.data.objects.new(hid, object_data=me)
+            self.collection.objects.link(ob)
+            ob.bf_namelist_cls = bf_namelists_by_fds_label[label].__name__
+            ob.bf_xb_export, ob.bf_xyz_export, ob.bf_pb_export = (False, False, False)
+            ob.bf_fyi = f"{len(xbs)} merged {label} namelists"
+            ob["bf_merged_params"] = f90s
+            ob.set_default_appearance(context)
+            ma = surf_id and bpy.data.materials.get(surf_id)
+            if ma:
+                ob.active_material = ma
+            progress.step(len(xbs))
+        return others
 
     def to_ge1(self, context):
         """!
@@ -3206,6 +3415,58 @@ class BFScene:
         """
         return geometry.to_ge1.scene_to_ge1(context, self)
 
+    def get_case_estimate(self, context):
+        """!
+        Return the estimate of size, memory and wall clock time of the FDS case.
+        Geometric caches are used when available, otherwise cheap approximations:
+        one box per OBST, HOLE or VENT, and the loop triangles of GEOMs.
+        @param context: the Blender context.
+        @return the estimate dict.
+        """
+        scale_length = self.unit_settings.scale_length
+        ijks, xbss, mpi_processes = list(), list(), list()
+        counts = {"devcs": 0, "slcfs": 0, "obst_boxes": 0, "geom_faces": 0}
+        for ob in self.objects:
+            if ob.type != "MESH" or ob.bf_is_tmp or ob.hide_render:
+                continue
+            cls = ob.bf_namelist_cls
+            if cls == "ON_MESH":
+                ijks.append(tuple(ob.bf_mesh_ijk))
+                xbss.append(
+                    geometry.utils.get_bbox_xbs(
+                        context=context, ob=ob, scale_length=scale_length, world=True
+                    )
+                )
+                mpi_processes.append(
+                    ob.bf_mesh_mpi_process if ob.bf_mesh_mpi_process_export else None
+                )
+            elif cls in ("ON_OBST", "ON_HOLE", "ON_VENT"):
+                if "bf_merged_params" in ob:
+                    n = len(ob["bf_merged_params"])
+                else:
+                    cache = ob.get("ob_to_xbs_cache")
+                    n = cache and len(cache[0]) or 1
+                counts["obst_boxes"] += n
+            elif cls == "ON_GEOM":
+                cache = ob.get("ob_to_geom_cache")
+                if cache:
+                    counts["geom_faces"] += len(cache[2]) // 3
+                else:
+                    ob.data.calc_loop_triangles()
+                    counts["geom_faces"] += len(ob.data.loop_triangles)
+            elif cls == "ON_DEVC":
+                cache = ob.get("ob_to_xyzs_cache")
+                counts["devcs"] += cache and len(cache[0]) or 1
+            elif cls == "ON_SLCF":
+                counts["slcfs"] += 1
+        return fds.mesh_tools.estimate_case(
+            ijks=ijks,
+            xbss=xbss,
+            mpi_processes=mpi_processes,
+            t_end=self.bf_time_t_end - self.bf_time_t_begin,
+            counts=counts,
+        )
+
     def set_default_appearance(self, context):
         """!
         Set my default appearance in Blender.
@@ -3228,6 +3489,7 @@ class BFScene:
         """
         Scene.bf_namelists = cls.bf_namelists
         Scene.to_fds = cls.to_fds
+        Scene.iter_to_fds = cls.iter_to_fds
         Scene.to_ge1 = cls.to_ge1
         Scene.from_fds = cls.from_fds
         Scene.set_default_appearance = cls.set_default_appearance
@@ -3241,6 +3503,7 @@ class BFScene:
         del Scene.set_default_appearance
         del Scene.from_fds
         del Scene.to_ge1
+        del Scene.iter_to_fds
         del Scene.to_fds
         del Scene.bf_namelists
 
@@ -3254,18 +3517,30 @@ class BFCollection:
         """!
         Return the FDS formatted string.
         @param context: the Blender context.
-        @param full: if True, return full FDS case.
         @return FDS formatted string, eg. "&OBST ID='Test' /".
         """
-        obs, lines = list(self.objects), list()
+        return "\n".join(b for b in self.iter_to_fds(context) if b)  # remove empties
+
+    def iter_to_fds(self, context):
+        """!
+        Generate the FDS formatted strings, one Object at a time, reporting progress.
+        @param context: the Blender context.
+        @return generator of None or FDS formatted string.
+        """
+        obs, children = list(self.objects), list(self.children)
         obs.sort(key=lambda k: k.name)  # alphabetic by name
-        if obs:
-            lines.append(
-                f"\n! --- Geometric namelists from Blender Collection <{self.name}>"
-            )
-            lines.extend(ob.to_fds(context) for ob in obs)
-        lines.extend(child.to_fds(context) for child in self.children)
-        return "\n".join(b for b in lines if b)  # remove empties
+        with progress.task(f"Collection <{self.name}>", len(obs) + len(children)):
+            if obs:
+                yield f"\n! --- Geometric namelists from Blender Collection <{self.name}>"
+            for ob in obs:
+                progress.step(0, label=f"Object <{ob.name}>")
+                with profiler.for_object(ob):
+                    text = ob.to_fds(context)
+                yield text
+                progress.step()
+            for child in children:
+                yield from child.iter_to_fds(context)
+                progress.step()
 
     @classmethod
     def register(cls):
@@ -3274,6 +3549,7 @@ class BFCollection:
         @param cls: class to be registered.
         """
         Collection.to_fds = cls.to_fds
+        Collection.iter_to_fds = cls.iter_to_fds
 
     @classmethod
     def unregister(cls):
@@ -3282,6 +3558,7 @@ class BFCollection:
         @param cls: class to be unregistered.
         """
         del Collection.to_fds
+        del Collection.iter_to_fds
 
 
 # Register
@@ -3293,8 +3570,10 @@ def register():
     """
     from bpy.utils import register_class
 
-    # Blender classes
+    # Blender classes, UILists only draw, not needed in background mode
     for cls in bl_classes:
+        if bpy.app.background and issubclass(cls, UIList):
+            continue
         log.debug(f"Registering Blender class <{cls.__name__}>")
         register_class(cls)
     # System parameters for tmp obs and file version
@@ -3308,6 +3587,11 @@ def register():
         default=False,
     )
     Scene.bf_file_version = IntVectorProperty(name="BlenderFDS File Version", size=3)
+    Object.bf_proxy_text = PointerProperty(
+        type=bpy.types.Text,
+        name="Proxy Text",
+        description="Text of the original namelists of this proxy Object",
+    )
     # params and namelists
     for cls in bf_params:
         cls.register()
@@ -3333,6 +3617,7 @@ def unregister():
     BFScene.unregister()
     BFCollection.unregister()
     # params and namelists
+    BFNamelist.clear_pool()
     for cls in bf_namelists:
         cls.unregister()
     for cls in bf_params:
@@ -3341,7 +3626,10 @@ def unregister():
     del Object.bf_is_tmp
     del Object.bf_has_tmp
     del Scene.bf_file_version
+    del Object.bf_proxy_text
     # Blender classes
     for cls in bl_classes:
+        if bpy.app.background and issubclass(cls, UIList):
+            continue
         log.debug(f"Unregistering Blender class <{cls.__name__}>")
         unregister_class(cls)
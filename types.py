@@ -14,7 +14,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
-import re, os.path, logging
+import os.path, logging
 
 import bpy
 from bpy.types import PropertyGroup, UIList, Object, Scene, Material
@@ -29,50 +29,34 @@ from bpy.props import (
 )
 
 if __name__ != "__main__":
-    from .bl import custom_uilist
+    from .bl import custom_uilist, profiler, draw_cache
     from .utils import is_iterable
+    from .core.exceptions import BFException
+    from .core.fds_case import FDSParam, FDSNamelist, FDSCase
 
 log = logging.getLogger(__name__)
 
-# BF specific exception
+# Blender representations of FDS entities
 
 
-class BFException(Exception):
+class _BFParamMeta(type):
     """!
-    Exception raised by BlenderFDS methods in case of an error.
+    Metaclass of BFParam, that adds empty __slots__ to each subclass.
+    Subclasses only set class attributes, so instances stay light.
     """
 
-    def __init__(self, sender, msg):
-        """!
-        Class constructor.
-        @param sender: the object that generates the exception
-        @param msg: exception message
-        """
-        ## The object that generates the exception
-        self.sender = sender
-        ## Exception message
-        self.msg = msg
-
-    def __str__(self):
-        sender = self.sender
-        try:
-            element = sender.element
-            name = "{} > {}".format(
-                element.name, sender.fds_name or sender.__class__.__name__
-            )
-        except:
-            name = getattr(sender, "name", None) or sender.__class__.__name__
-        return "{}: {}".format(name, self.msg)
+    def __new__(mcs, name, bases, namespace):
+        namespace.setdefault("__slots__", tuple())
+        return super().__new__(mcs, name, bases, namespace)
 
 
-# Blender representations of FDS entities
-
-
-class BFParam:
+class BFParam(metaclass=_BFParamMeta):
     """!
     Blender representation of an FDS parameter.
     """
 
+    __slots__ = ("element",)
+
     ## Object label
     label = "No Label"
     ## Object description
@@ -243,6 +227,30 @@ class BFParam:
         """
         pass
 
+    def _has_check_error(self, context):
+        """!
+        Check self validity for FDS.
+        @param context: the Blender context.
+        @return True in case of error, False otherwise.
+        """
+        try:
+            self.check(context)
+        except BFException:
+            return True
+        return False
+
+    def get_draw_check_error(self, context):
+        """!
+        Check self validity for drawing, cached until the next change.
+        @param context: the Blender context.
+        @return True in case of error, False otherwise.
+        """
+        return draw_cache.get(
+            (self.element.as_pointer(), type(self), "check"),
+            self._has_check_error,
+            context,
+        )
+
     def draw_operators(self, context, layout):
         """!
         Draw my operators on layout.
@@ -264,11 +272,8 @@ class BFParam:
         col = layout.column()
         active = bool(self.exported)
         col.active = active
-        if active:
-            try:
-                self.check(context)
-            except BFException:
-                col.alert = True
+        if active and self.get_draw_check_error(context):
+            col.alert = True
         row = col.row(align=True)
         row.prop(self.element, self.bpy_idname, text=self.label)
         self.draw_operators(context, row)
@@ -378,9 +383,7 @@ class BFParamFYI(BFParamStr):
 
     def draw(self, context, layout):
         col = layout.column()
-        try:
-            self.check(context)
-        except BFException:
+        if self.get_draw_check_error(context):
             col.alert = True
         if self.bpy_idname:
             col.prop(self.element, self.bpy_idname, text="", icon="INFO")
@@ -457,6 +460,13 @@ class BFNamelist(BFParam):
     Blender representation of an FDS namelist group.
     """
 
+    # Namelist instances are pooled, and the instance bf_params
+    # shadows the class one, so a __dict__ is needed
+    __slots__ = ("__dict__",)
+
+    ## Pool of namelist instances, by element pointer and namelist class
+    _pool = dict()
+
     def __init__(self, element):
         ## FDS element represented by this class instance
         self.element = element
@@ -465,6 +475,31 @@ class BFNamelist(BFParam):
 
     # inherits __str__
 
+    @classmethod
+    def get_instance(cls, element):
+        """!
+        Return the pooled namelist instance related to element.
+        When the element namelist class changes, another instance is used.
+        @param element: FDS element represented by the instance.
+        @return instance of cls.
+        """
+        key = element.as_pointer(), cls
+        bf_namelist = BFNamelist._pool.get(key)
+        if bf_namelist is None:
+            bf_namelist = BFNamelist._pool[key] = cls(element)
+        else:  # rebind to the current Python wrapper of the element
+            bf_namelist.element = element
+            for p in bf_namelist.bf_params:
+                p.element = element
+        return bf_namelist
+
+    @classmethod
+    def clear_pool(cls):
+        """!
+        Clear the pool of namelist instances, eg. after loading a file.
+        """
+        BFNamelist._pool.clear()
+
     @classmethod
     def register(cls):
         super().register()
@@ -551,9 +586,7 @@ class BFNamelist(BFParam):
         @return used layout.
         """
         # Check and active
-        try:
-            self.check(context)
-        except BFException:
+        if self.get_draw_check_error(context):
             layout.alert = True
         layout.active = self.exported
         # Parameters
@@ -589,10 +622,11 @@ class BFNamelist(BFParam):
         result = self.to_fds_namelist(context)
         if result is None:  # protect from None
             return
-        if is_iterable(result):  # many (FDSNamelist, ...), multi not allowed!
-            return "\n".join((r.to_fds() for r in result if r is not None))
-        else:  # single FDSNameslist
-            return result.to_fds()
+        with profiler.stage("format"):
+            if is_iterable(result):  # many (FDSNamelist, ...), multi not allowed!
+                return "\n".join((r.to_fds() for r in result if r is not None))
+            else:  # single FDSNameslist
+                return result.to_fds()
 
     def from_fds(self, context, fds_namelist):
         """!
@@ -646,338 +680,3 @@ class BFNamelistMa(BFNamelist):
     """
 
     bpy_type = Material
-
-
-# Python representations of FDS entities
-
-
-class FDSParam:
-    """!
-    Python datastructure representing an FDS namelist parameter.
-    """
-
-    def __init__(
-        self, fds_label, values=None, precision=3, exponential=False, msg=None
-    ):
-        """!
-        Class constructor.
-        @param label: namelist parameter label.
-        @param values: list of parameter values of type float, int, str, bool.
-        @param precision: float precision, number of decimal digits.
-        @param exponential: if True sets exponential representation of floats.
-        @param msg: comment message.
-        """
-        ## namelist parameter label
-        self.fds_label = fds_label
-        ## list of parameter values of type float, int, str, bool.
-        self.values = values or list()
-        ## float precision, number of decimal digits.
-        self.precision = precision
-        ## if True sets exponential representation of floats.
-        self.exponential = exponential
-        ## comment message.
-        self.msg = msg
-
-    def __str__(self):
-        result = self.to_fds()
-        if len(result) > 80:
-            return result[:37] + " ... " + result[-37:]
-        return result
-
-    @property
-    def formatted_values(self):
-        """!
-        Return the list of FDS formatted values, eg. "'Test1'","'Test2'"
-        """
-        try:
-            v0 = self.values[0]
-        except IndexError:
-            return list()
-        strings = list()
-        if isinstance(v0, float):
-            p = self.precision
-            if self.exponential:
-                strings.extend(f"{round(v,p):.{p}E}" for v in self.values)
-            else:
-                strings.extend(f"{round(v,p):.{p}f}" for v in self.values)
-        elif isinstance(v0, str):
-            strings.extend("'" in v and f'"{v}"' or f"'{v}'" for v in self.values)
-        elif isinstance(v0, bool):  # always before int
-            strings.extend(v and "T" or "F" for v in self.values)
-        elif isinstance(v0, int):
-            strings.extend(str(v) for v in self.values)
-        else:
-            raise ValueError(f"Unknown value type for parameter <{self.fds_label}>")
-        return strings
-
-    _re_decimal = r"\.([0-9]+)"  # decimal positions
-
-    _scan_decimal = re.compile(_re_decimal, re.VERBOSE | re.DOTALL | re.IGNORECASE)
-
-    _re_integer = r"([0-9]*)\.?[0-9]*[eE]"  # integer postions of exp notation
-
-    _scan_integer = re.compile(_re_integer, re.VERBOSE | re.DOTALL | re.IGNORECASE)
-
-    def to_fds(self):
-        """!
-        Return the FDS formatted string.
-        @return FDS formatted string, eg. "ID='Test'"
-        """
-        v = ",".join(self.formatted_values)
-        if not v:
-            return self.fds_label
-        return self.fds_label + "=" + v
-
-    def from_fds(self, f90_values):
-        """!
-        Import from FDS formatted string of values, on error raise BFException.
-        @param f90_values: FDS formatted string of values, eg. "2.34, 1.23, 3.44" or ".TRUE.,.FALSE.".
-        """
-        f90_values += ","  # always return a tuple, eg. "34" -> "34,"
-        # Translate F90 booleans
-        if f90_values[0] == ".":
-            f90_values = (
-                f90_values.upper().replace(".TRUE.", "True").replace(".FALSE.", "False")
-            )
-        elif f90_values[0] in ("T", "F"):
-            f90_values = f90_values.upper().replace("T", "True").replace("F", "False")
-        # Python evaluation of F90 value, after cleaning from \n \r
-        f90_values = " ".join(f90_values.split())
-        try:
-            self.values = eval(f90_values)
-        except Exception as err:
-            raise BFException(
-                self,
-                f"Parsing error in parameter <{self.fds_label}={f90_values} ... />\n{err}",
-            )
-        # Get precision from the first f90 float value
-        if isinstance(self.values[0], float):
-            match = re.findall(self._re_decimal, f90_values)
-            if match:
-                self.precision = max(len(m) for m in match)
-            else:
-                self.precision = 1
-            # Exp notation?
-            match = re.findall(self._re_integer, f90_values)
-            if match:
-                self.exponential = True
-                self.precision += max(len(m) for m in match) - 1
-
-
-class FDSNamelist:
-    """!
-    Python datastructure representing an FDS namelist.
-    """
-
-    ## max number of columns of formatted output
-    maxlen = 80  # TODO to config
-
-    def __init__(self, fds_label, fds_params=None, msg=None):
-        """!
-        Class constructor.
-        @param fds_label: namelist group label.
-        @param fds_params: list of FDSParam instances.
-                Can contain one and only one list of lists of FDSParam instances
-                to represent multiple params: (("ID=X1", "PBX=1"), ("ID=X2", "PBX=2"), ...).
-        @param msg: comment message.
-        """
-        ## namelist group label
-        self.fds_label = fds_label
-        ## list of FDSParam instances
-        self.fds_params = fds_params or list()
-        ## comment message
-        self.msg = msg
-
-    def __str__(self):
-        return self.to_fds()
-
-    def get_fds_param_by_label(self, fds_label) -> "FDSParam or None":
-        """!
-        Return the fds_param by its label.
-        @param fds_label: namelist parameter label.
-        @return None or FDSParam.
-        """
-        for p in self.fds_params:
-            if p.fds_label == fds_label:
-                return p
-
-    def to_fds(self):
-        """!
-        Return the FDS formatted string.
-        @return FDS formatted string, eg. "&OBST ID='Test' /".
-        """
-        # Mix parameters
-        invps = list()  # invariant parameters
-        multips = list()  # multi parameters
-        msgs = list((self.msg,))  # messages
-        for p in self.fds_params:
-            # Empty
-            if p is None:  # Protect from None
-                continue
-            # Invariant
-            elif isinstance(p, FDSParam):  # single
-                invps.append(p)
-                msgs.append(p.msg)
-            elif isinstance(p, tuple):  # many or multi
-                if isinstance(p[0], FDSParam):  # many
-                    invps.extend(p)
-                    msgs.extend(pi.msg for pi in p)
-                elif isinstance(p[0], tuple):  # multi
-                    multips = p
-                    msgs.extend(
-                        p0.msg for p0 in multips[0]
-                    )  # msg only from first many of multi
-            else:
-                raise ValueError(f"Unrecognized type of <{p}>")
-        # Treat invariant, many and multi parameters
-        # nl = FDSParam, FDSParam, ...
-        nls = list()  # list of nl
-        if multips:
-            # Remove ID parameter, as multi embeds a new indexed ID.
-            for i, p in enumerate(invps):
-                if p.fds_label == "ID":
-                    invps.pop(i)
-                    break
-            # Add nl with one of multips + invps
-            for multip in multips:
-                nl = list(multip)
-                nl.extend(invps)
-                nls.append(nl)
-        else:
-            nls.append(invps)
-        # Prepare strings
-        lines = list(f"! {m}" for m in msgs if m)  # all messages
-        for nl in nls:
-            newline = False
-            line = "&" + self.fds_label
-            for p in nl:
-                label = p.fds_label
-                vs = p.formatted_values  # list of str
-                if not vs:  # no values
-                    if not newline and len(line) + 1 + len(label) <= self.maxlen:
-                        # Parameter to the same line
-                        newline = False
-                        line += " " + label
-                    else:
-                        # Parameter to new line
-                        lines.append(line)
-                        line = "      " + label  # new line
-                else:  # values
-                    v = ",".join(vs)  # values str
-                    if (
-                        not newline
-                        and len(line) + 1 + len(label) + 1 + len(v) <= self.maxlen
-                    ):
-                        # Parameter to the same line
-                        newline = False
-                        line += " " + label + "=" + v
-                    else:
-                        # Parameter to new line
-                        lines.append(line)
-                        line = "      " + label + "="  # new line
-                        if len(line) + len(v) <= self.maxlen:
-                            # Values do not need splitting
-                            line += v
-                        else:
-                            # Values need splitting
-                            newline = True  # the following needs a new line
-                            for v in vs:
-                                if len(line) + len(v) + 1 <= self.maxlen:
-                                    line += v + ","
-                                else:
-                                    lines.append(line)
-                                    line = "        " + v + ","  # new line
-                            line = line[:-1]  # remove last ","
-            line += " /"
-            lines.append(line)
-        return "\n".join(lines)
-
-    _re_label = r"([A-Z][A-Z0-9_\(\):,]*?)"  # param label w indexes
-    _re_space = r"[\s\t]*"  # zero or more spaces
-    _re_sep = r"[,\s\t]+"  # one or more separators
-    _re_end = r"[,\s\t]*/"  # zero or more separators + "/"
-    _re_values = (
-        r"(.+?)"  # one or more of any char, not greedy
-        + r"(?="  # end previous match when
-        + _re_sep
-        + _re_label  # either a new label
-        + _re_space
-        + "="  # followed by an equal sign
-        + "|"  # or
-        + _re_end  # the end of the namelist
-        + ")"
-    )
-    _re_param = (
-        _re_label + _re_space + "=" + _re_space + _re_values
-    )  # groups: label, vals
-
-    _scan = re.compile(
-        _re_param, re.VERBOSE | re.DOTALL | re.IGNORECASE
-    )  # no MULTILINE, so that $ is the end of the file
-
-    def from_fds(self, f90_params):  # TODO change signature: f90_namelist
-        """!
-        Import from FDS formatted string of parameters, on error raise BFException.
-        @param f90_params: FDS formatted string of parameters, eg. "ID='Test' PROP=2.34, 1.23, 3.44".
-        """
-        for match in re.finditer(self._scan, f90_params):
-            label, f90_values, following_label = match.groups()
-            p = FDSParam(fds_label=label)
-            p.from_fds(f90_values=f90_values)
-            self.fds_params.append(p)
-            if following_label is None:
-                break
-
-
-class FDSCase:
-    """!
-    Python datastructure representing an FDS case.
-    """
-
-    def __init__(self, fds_namelists=None):
-        """!
-        Class constructor.
-        @param fds_namelists: list of FDSNamelist instances.
-        """
-        self.fds_namelists = fds_namelists or list()
-
-    def __str__(self):
-        return self.to_fds()
-
-    def get_fds_namelists_by_label(self, label):
-        """!
-        Return the tuple of fds_namelists by their label.
-        @param label: namelist parameter label.
-        @return tuple of fds namelists.
-        """
-        return tuple(n for n in self.fds_namelists if n.fds_label == label)
-
-    def to_fds(self):
-        """!
-        Return the FDS formatted string.
-        @return FDS formatted string, eg. "&OBST ID='Test' /\n&TAIL /".
-        """
-        return "\n".join(
-            n.to_fds() for n in self.fds_namelists if n is not None
-        )  # Protect None
-
-    _scan = re.compile(
-        r"""
-        (?:^&)             # & at the beginning
-        ([A-Z]+[A-Z0-9]*)  # namelist label
-        """,
-        re.VERBOSE | re.DOTALL | re.IGNORECASE | re.MULTILINE,
-    )  # MULTILINE, so that ^ is the beginning of each line
-
-    def from_fds(self, f90_namelists, reset=True):
-        """!
-        Import from FDS formatted string of namelists, on error raise BFException.
-        @param f90_namelists: FDS formatted string of namelists, eg. "&OBST ID='Test' /\n&TAIL /".
-        @param reset: if True, reset self.fds_namelists to empty list before importing.
-        """
-        if reset:
-            self.fds_namelists = list()
-        for match in re.finditer(self._scan, f90_namelists):
-            nl = FDSNamelist(fds_label=match.groups()[0])
-            nl.from_fds(f90_params=f90_namelists[match.end() :])
-            self.fds_namelists.append(nl)